@@ -0,0 +1,51 @@
+from datetime import UTC, datetime
+from enum import StrEnum
+from uuid import UUID, uuid4
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.jobs import job_runner
+from app.core.logger import request_id_var
+from app.database.core import async_session_maker
+from app.entities import AuditEvent
+
+
+class AuditEventType(StrEnum):
+	registered = "registered"
+	login = "login"
+	logout = "logout"
+	password_changed = "password_changed"
+	refresh_token_reused = "refresh_token_reused"
+
+
+async def _write_event(
+	event_id: UUID,
+	user_id: UUID,
+	event: AuditEventType,
+	occurred_at: datetime,
+) -> None:
+	"""Insert an audit event in its own transaction; retries insert it once."""
+	async with async_session_maker() as db:
+		await db.execute(
+			insert(AuditEvent)
+			.values(
+				id=event_id,
+				user_id=user_id,
+				event=event,
+				# The ID of the request that recorded the event, which the job
+				# runner sets for the job.
+				request_id=request_id_var.get(),
+				occurred_at=occurred_at,
+			)
+			.on_conflict_do_nothing(),
+		)
+		await db.commit()
+
+
+def record_event(user_id: UUID, event: AuditEventType) -> None:
+	"""Add `event` of a user to the audit log once the response has been sent.
+
+	The write runs on the background job runner, so it never delays the
+	response. Call it after the change being audited has been committed.
+	"""
+	job_runner.enqueue(_write_event, uuid4(), user_id, event, datetime.now(UTC))
@@ -1,12 +1,13 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.auth import models
-from app.auth.dependencies import get_auth_service
+from app.auth.dependencies import get_auth_service, login_account_key
 from app.auth.service import AuthService
-from app.core.rate_limiting import rate_limit
+from app.core.config import settings
+from app.core.rate_limiting import RateLimit
 
 router = APIRouter(
 	prefix="/auth",
@@ -14,10 +15,12 @@ router = APIRouter(
 )
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
-@rate_limit("5/hour")
+@router.post(
+	"/",
+	status_code=status.HTTP_201_CREATED,
+	dependencies=[Depends(RateLimit("5/hour"))],
+)
 async def register_user(
-	request: Request,
 	register_user_request: models.RegisterUserRequest,
 	auth_service: AuthService = Depends(get_auth_service),
 ):
@@ -28,7 +31,16 @@ async def register_user(
 	return {"message": "User registered successfully."}
 
 
-@router.post("/token", response_model=models.Token)
+@router.post(
+	"/token",
+	response_model=models.Token,
+	dependencies=[
+		Depends(RateLimit(settings.AUTH_LOGIN_RATE_LIMIT)),
+		Depends(
+			RateLimit(settings.AUTH_LOGIN_ACCOUNT_RATE_LIMIT, login_account_key),
+		),
+	],
+)
 async def login_for_access_token(
 	form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 	auth_service: AuthService = Depends(get_auth_service),
@@ -37,3 +49,33 @@ async def login_for_access_token(
 	Authenticate user and provide an access token.
 	"""
 	return await auth_service.login_for_access_token(form_data)
+
+
+@router.post(
+	"/refresh",
+	response_model=models.Token,
+	dependencies=[Depends(RateLimit(settings.AUTH_REFRESH_RATE_LIMIT))],
+)
+async def refresh_access_token(
+	refresh_request: models.RefreshTokenRequest,
+	auth_service: AuthService = Depends(get_auth_service),
+):
+	"""
+	Exchange a refresh token for a new access token and refresh token.
+	"""
+	return await auth_service.refresh_access_token(refresh_request.refresh_token)
+
+
+@router.post(
+	"/revoke",
+	status_code=status.HTTP_204_NO_CONTENT,
+	dependencies=[Depends(RateLimit(settings.AUTH_REFRESH_RATE_LIMIT))],
+)
+async def revoke_refresh_token(
+	refresh_request: models.RefreshTokenRequest,
+	auth_service: AuthService = Depends(get_auth_service),
+):
+	"""
+	Log out: revoke the session of a refresh token and its access tokens.
+	"""
+	await auth_service.revoke_refresh_token(refresh_request.refresh_token)
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+
+from app.database.core import async_session_maker
+from app.entities import RevokedToken
+
+
+@dataclass(frozen=True)
+class TokenDenylistStats:
+	"""Point-in-time metrics of the revoked token denylist."""
+
+	size: int
+	syncs: int
+	sync_errors: int
+
+
+class TokenDenylist:
+	"""In-memory set of revoked access tokens, synced from the database.
+
+	Every authenticated request is checked against it, so the check is a dict
+	lookup by `jti` rather than a database round trip. Entries are dropped
+	once the token they revoke has expired, which bounds the set by the
+	revocations of one access token lifetime. Revocations made by this worker
+	apply at once; those of other workers once `sync` has run. Syncing only
+	reads: the expired rows are deleted by `app.auth.prune`.
+	"""
+
+	def __init__(self):
+		self._entries: dict[str, float] = {}
+		self._syncs = 0
+		self._sync_errors = 0
+
+	def add(self, jti: str, expires_at: float) -> None:
+		"""Deny the access token `jti` until its expiry timestamp."""
+		self._entries[jti] = expires_at
+
+	def is_revoked(self, jti: str | None) -> bool:
+		"""Whether the access token `jti` has been revoked."""
+		return jti is not None and jti in self._entries
+
+	async def sync(self) -> None:
+		"""Load the unexpired revocations of all workers."""
+		async with async_session_maker() as db:
+			rows = (
+				await db.execute(
+					select(RevokedToken.jti, RevokedToken.expires_at).where(
+						RevokedToken.expires_at > func.now(),
+					),
+				)
+			).all()
+
+		for jti, expires_at in rows:
+			self._entries[str(jti)] = expires_at.timestamp()
+		now = time.time()
+		self._entries = {
+			jti: expires_at
+			for jti, expires_at in self._entries.items()
+			if expires_at > now
+		}
+		self._syncs += 1
+
+	async def run(self, interval: float) -> None:
+		"""Sync every `interval` seconds until cancelled."""
+		while True:
+			try:
+				await self.sync()
+			except Exception as e:
+				self._sync_errors += 1
+				logging.warning("Cannot sync the token denylist: %s", e)
+			await asyncio.sleep(interval)
+
+	def stats(self) -> TokenDenylistStats:
+		"""Return the current size and sync counters."""
+		return TokenDenylistStats(
+			size=len(self._entries),
+			syncs=self._syncs,
+			sync_errors=self._sync_errors,
+		)
+
+
+token_denylist = TokenDenylist()
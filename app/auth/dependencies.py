@@ -1,6 +1,32 @@
+from fastapi import Request
+from fastapi.security.utils import get_authorization_scheme_param
+
 from app.auth.service import AuthService
+from app.core.exceptions import AuthenticationError
 from app.database.core import DBSession
 
 
 def get_auth_service(db: DBSession) -> AuthService:
 	return AuthService(db)
+
+
+async def current_user_key(request: Request) -> str | None:
+	"""Rate limit key of the user authenticated by the request's bearer token."""
+	scheme, token = get_authorization_scheme_param(
+		request.headers.get("Authorization"),
+	)
+	if scheme.lower() != "bearer" or not token:
+		return None
+
+	try:
+		return f"user:{AuthService.verify_token(token).user_id}"
+	except AuthenticationError:
+		return None
+
+
+async def login_account_key(request: Request) -> str | None:
+	"""Rate limit key of the account a login attempt targets."""
+	username = (await request.form()).get("username")
+	if not isinstance(username, str) or not username:
+		return None
+	return f"login:{username.strip().lower()}"
@@ -0,0 +1,186 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeVar
+
+from app.core.config import settings
+from app.core.exceptions import PasswordHashingUnavailableError
+from app.core.metrics import metrics
+
+if TYPE_CHECKING:
+	from passlib.context import CryptContext
+
+T = TypeVar("T")
+
+
+def create_bcrypt_context(
+	rounds: int = settings.PASSWORD_HASH_ROUNDS,
+) -> "CryptContext":
+	"""Create the passlib context, importing passlib on first use.
+
+	Hashes of any other cost than `rounds` need an update, so that raising or
+	lowering the cost rehashes passwords as their users log in.
+
+	Args:
+		rounds (int): The bcrypt cost, i.e. the log2 of its iterations.
+	"""
+	from passlib.context import CryptContext
+
+	return CryptContext(
+		schemes=["bcrypt"],
+		deprecated="auto",
+		bcrypt__rounds=rounds,
+		bcrypt__min_rounds=rounds,
+		bcrypt__max_rounds=rounds,
+	)
+
+
+@dataclass(frozen=True)
+class PasswordHasherStats:
+	"""Point-in-time metrics of the password hashing pool."""
+
+	workers: int
+	in_flight: int
+	queue_depth: int
+	completed: int
+	rejected: int
+	average_latency_seconds: float
+	max_latency_seconds: float
+
+
+class PasswordHasher:
+	"""Runs password hashing and verification on a bounded worker pool.
+
+	bcrypt is deliberately slow and would otherwise block the event loop for
+	the whole duration of every hash. Work is handed to a dedicated thread
+	pool (bcrypt releases the GIL while hashing) and at most `queue_size`
+	calls may wait for a free worker; beyond that callers are rejected with a
+	503 straight away instead of piling up behind each other.
+	"""
+
+	def __init__(
+		self,
+		context_factory: Callable[[], "CryptContext"],
+		workers: int,
+		queue_size: int,
+	):
+		"""Initialize the hasher.
+
+		Args:
+			context_factory (Callable[[], CryptContext]): Creates the passlib
+				context doing the actual work, on first use.
+			workers (int): The number of hashing threads.
+			queue_size (int): The number of calls allowed to wait for a worker.
+		"""
+		self.context_factory = context_factory
+		self._context: CryptContext | None = None
+		self.workers = workers
+		self.capacity = workers + queue_size
+		self._executor: ThreadPoolExecutor | None = None
+		self._in_flight = 0
+		self._completed = 0
+		self._rejected = 0
+		self._latency_total = 0.0
+		self._latency_max = 0.0
+
+	@property
+	def context(self) -> "CryptContext":
+		"""The passlib context, created on first access."""
+		if self._context is None:
+			self._context = self.context_factory()
+		return self._context
+
+	async def hash(self, password: str) -> str:
+		"""Hash a plain password."""
+		return await self._run(self.context.hash, password)
+
+	async def verify(self, plain_password: str, hashed_password: str) -> bool:
+		"""Verify a plain password against its hashed version."""
+		return await self._run(self.context.verify, plain_password, hashed_password)
+
+	async def verify_and_update(
+		self,
+		plain_password: str,
+		hashed_password: str,
+	) -> tuple[bool, str | None]:
+		"""Verify a password and rehash it if its hash is out of policy.
+
+		Returns:
+			tuple[bool, str | None]: Whether the password matches, and the hash
+				to store instead when the stored one uses another scheme or cost.
+		"""
+		return await self._run(
+			self.context.verify_and_update,
+			plain_password,
+			hashed_password,
+		)
+
+	def stats(self) -> PasswordHasherStats:
+		"""Return the current queue and latency metrics."""
+		return PasswordHasherStats(
+			workers=self.workers,
+			in_flight=self._in_flight,
+			queue_depth=max(0, self._in_flight - self.workers),
+			completed=self._completed,
+			rejected=self._rejected,
+			average_latency_seconds=(
+				self._latency_total / self._completed if self._completed else 0.0
+			),
+			max_latency_seconds=self._latency_max,
+		)
+
+	def load(self) -> None:
+		"""Create the passlib context now rather than on the first hash."""
+		_ = self.context
+
+	def shutdown(self) -> None:
+		"""Stop the worker threads once the queued calls have finished."""
+		if self._executor is not None:
+			self._executor.shutdown(wait=True)
+			self._executor = None
+
+	async def _run(self, func: Callable[..., T], *args: str) -> T:
+		if self._in_flight >= self.capacity:
+			self._rejected += 1
+			raise PasswordHashingUnavailableError()
+
+		if self._executor is None:
+			self._executor = ThreadPoolExecutor(
+				max_workers=self.workers,
+				thread_name_prefix="password-hasher",
+			)
+
+		self._in_flight += 1
+		try:
+			result, elapsed = await asyncio.get_running_loop().run_in_executor(
+				self._executor,
+				_timed,
+				func,
+				*args,
+			)
+		finally:
+			self._in_flight -= 1
+
+		self._completed += 1
+		metrics.observe("password_hash_duration_seconds", elapsed)
+		self._latency_total += elapsed
+		self._latency_max = max(self._latency_max, elapsed)
+		return result
+
+
+def _timed(func: Callable[..., T], *args: str) -> tuple[T, float]:
+	"""Call `func` in a worker thread and measure how long it took."""
+	start = time.perf_counter()
+	result = func(*args)
+	return result, time.perf_counter() - start
+
+
+password_hasher = PasswordHasher(
+	create_bcrypt_context,
+	workers=settings.PASSWORD_HASH_WORKERS,
+	queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+if not settings.FAST_START:
+	password_hasher.load()
@@ -1,6 +1,7 @@
+from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, PrivateAttr
 
 
 class RegisterUserRequest(BaseModel):
@@ -13,12 +14,23 @@ class RegisterUserRequest(BaseModel):
 class Token(BaseModel):
 	access_token: str
 	token_type: str
+	refresh_token: str | None = None
+
+
+class RefreshTokenRequest(BaseModel):
+	refresh_token: str
 
 
 class TokenData(BaseModel):
 	user_id: str | None = None
+	# The token's `jti` claim; None for tokens issued before it existed.
+	jti: str | None = None
+
+	# Parsed once so that cached token data never re-parses the ID.
+	_uuid: UUID | None = PrivateAttr(default=None)
+
+	def model_post_init(self, context: Any, /) -> None:
+		self._uuid = UUID(self.user_id) if self.user_id else None
 
 	def get_uuid(self) -> UUID | None:
-		if self.user_id:
-			return UUID(self.user_id)
-		return None
+		return self._uuid
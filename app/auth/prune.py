@@ -0,0 +1,141 @@
+"""Deletion of expired tokens and revocations and of old audit events.
+
+Usage:
+	python -m app.auth.prune --batch-size 1000
+
+Run it periodically, e.g. hourly from cron, from a single host. Every
+refresh inserts a refresh token, every logout inserts revocations and every
+login an audit event, so without it these tables grow without bound.
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Any, cast
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, CursorResult, delete, func, select
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.config import settings
+from app.database.core import Base, async_session_maker
+from app.entities import AuditEvent, RefreshToken, RevokedToken
+
+
+async def _prune(
+	model: type[Base],
+	key: InstrumentedAttribute[UUID],
+	expired: ColumnElement[bool],
+	batch_size: int,
+) -> int:
+	"""Delete the `expired` rows of `model` in batches.
+
+	Each batch is its own transaction and skips the rows locked by another
+	run, so neither a concurrent run nor a long delete blocks the writes.
+
+	Args:
+		model (type[Base]): The entity to delete.
+		key (InstrumentedAttribute[UUID]): The primary key of `model`.
+		expired (ColumnElement[bool]): Selects the rows to delete.
+		batch_size (int): The number of rows deleted per transaction.
+
+	Returns:
+		int: The number of rows deleted.
+	"""
+	pruned = 0
+	while True:
+		async with async_session_maker() as db:
+			batch = (
+				select(key)
+				.where(expired)
+				.limit(batch_size)
+				.with_for_update(skip_locked=True)
+			)
+			result = cast(
+				"CursorResult[Any]",
+				await db.execute(delete(model).where(key.in_(batch))),
+			)
+			await db.commit()
+
+		pruned += result.rowcount
+		if result.rowcount < batch_size:
+			return pruned
+
+
+async def prune_expired_tokens(batch_size: int) -> tuple[int, int]:
+	"""Delete the refresh tokens and revocations that have expired.
+
+	Neither can be presented any more: an expired refresh token is rejected
+	by its `exp` claim, and a revoked access token by its own once the
+	revocation has expired.
+
+	Args:
+		batch_size (int): The number of rows deleted per transaction.
+
+	Returns:
+		tuple[int, int]: The number of refresh tokens and of revocations
+			deleted.
+	"""
+	refresh_tokens = await _prune(
+		RefreshToken,
+		RefreshToken.jti,
+		RefreshToken.expires_at <= func.now(),
+		batch_size,
+	)
+	revocations = await _prune(
+		RevokedToken,
+		RevokedToken.jti,
+		RevokedToken.expires_at <= func.now(),
+		batch_size,
+	)
+	logging.info(
+		"Pruned %s expired refresh tokens and %s expired revocations",
+		refresh_tokens,
+		revocations,
+	)
+	return refresh_tokens, revocations
+
+
+async def prune_audit_events(batch_size: int, retention_days: int) -> int:
+	"""Delete the audit events older than `retention_days`.
+
+	Args:
+		batch_size (int): The number of rows deleted per transaction.
+		retention_days (int): The days audit events are kept for.
+
+	Returns:
+		int: The number of audit events deleted.
+	"""
+	cutoff = datetime.now(UTC) - timedelta(days=retention_days)
+	pruned = await _prune(
+		AuditEvent,
+		AuditEvent.id,
+		AuditEvent.occurred_at < cutoff,
+		batch_size,
+	)
+	logging.info("Pruned %s audit events older than %s days", pruned, retention_days)
+	return pruned
+
+
+def main(argv: list[str] | None = None) -> None:
+	parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+	parser.add_argument(
+		"--batch-size",
+		type=int,
+		default=settings.AUTH_REFRESH_TOKEN_PRUNE_BATCH_SIZE,
+	)
+	parser.add_argument(
+		"--audit-retention-days",
+		type=int,
+		default=settings.AUTH_AUDIT_RETENTION_DAYS,
+	)
+	args = parser.parse_args(argv)
+
+	logging.basicConfig(level=logging.INFO)
+	asyncio.run(prune_expired_tokens(args.batch_size))
+	asyncio.run(prune_audit_events(args.batch_size, args.audit_retention_days))
+
+
+if __name__ == "__main__":
+	main()
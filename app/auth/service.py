@@ -1,6 +1,6 @@
 import logging
 from datetime import UTC, datetime, timedelta
-from typing import Annotated, cast
+from typing import Annotated, Any, cast
 from uuid import UUID, uuid4
 
 from fastapi import Depends
@@ -8,17 +8,24 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jwt import PyJWTError
 from jwt import decode as jwt_decode
 from jwt import encode as jwt_encode
-from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import models
+from app.auth.audit import AuditEventType, record_event
+from app.auth.denylist import token_denylist
+from app.auth.hashing import password_hasher
+from app.auth.token_cache import token_cache
 from app.core.config import settings
 from app.core.exceptions import AuthenticationError
-from app.entities import User
+from app.entities import RefreshToken, RevokedToken, User
 
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# The `typ` claim of each kind of token.
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
 
 
 class AuthService:
@@ -32,57 +39,121 @@ class AuthService:
 		self.db = db
 
 	@staticmethod
-	def verify_password(plain_password: str, hashed_password: str) -> bool:
+	async def verify_password(plain_password: str, hashed_password: str) -> bool:
 		"""Verify a plain password against its hashed version."""
-		return bcrypt_context.verify(plain_password, hashed_password)
+		return await password_hasher.verify(plain_password, hashed_password)
 
 	@staticmethod
-	def get_password_hash(password: str) -> str:
+	async def get_password_hash(password: str) -> str:
 		"""Hash a plain password."""
-		return bcrypt_context.hash(password)
+		return await password_hasher.hash(password)
 
 	@staticmethod
-	def verify_token(token: str) -> models.TokenData:
-		"""Verify and decode a JWT token to extract user information."""
+	def _decode_token(token: str, token_type: str) -> dict[str, Any]:
+		"""Verify the signature, expiry and type of a JWT and return its claims.
+
+		Tokens issued before the `typ` claim existed are access tokens.
+		"""
 		try:
 			payload = jwt_decode(
 				token,
 				settings.AUTH_SECRET_KEY,
 				algorithms=[settings.AUTH_ALGORITHM],
 			)
-
-			user_id: str = str(payload.get("id"))
-			return models.TokenData(user_id=user_id)
 		except PyJWTError as e:
-			logging.error(f"Token verification failed: {str(e)}")
+			logging.error("Token verification failed: %s", e)
+			raise AuthenticationError("Could not validate credentials")
+
+		if payload.get("typ", ACCESS_TOKEN) != token_type:
+			logging.error("Token verification failed: expected %s token", token_type)
 			raise AuthenticationError("Could not validate credentials")
+		return payload
+
+	@staticmethod
+	def _decode_refresh_token(refresh_token: str) -> tuple[dict[str, Any], UUID]:
+		"""Verify a refresh token and return its claims and its `jti`."""
+		payload = AuthService._decode_token(refresh_token, REFRESH_TOKEN)
+		try:
+			return payload, UUID(payload["jti"])
+		except (KeyError, ValueError) as e:
+			logging.error("Token verification failed: %s", e)
+			raise AuthenticationError("Could not validate credentials")
+
+	@staticmethod
+	def verify_token(token: str) -> models.TokenData:
+		"""Verify and decode a JWT token to extract user information.
+
+		Verified tokens are cached until they expire, so repeated requests with
+		the same token skip the signature check. Revocation is checked against
+		the in-memory denylist on every call, cached or not, so it never costs
+		a database round trip.
+		"""
+		token_data = token_cache.get(token)
+		if token_data is None:
+			payload = AuthService._decode_token(token, ACCESS_TOKEN)
+			try:
+				token_data = models.TokenData(
+					user_id=str(payload.get("id")),
+					jti=payload.get("jti"),
+				)
+			except ValueError as e:
+				logging.error("Token verification failed: %s", e)
+				raise AuthenticationError("Could not validate credentials")
+
+			if "exp" in payload:
+				token_cache.put(token, token_data, payload["exp"])
+
+		if token_denylist.is_revoked(token_data.jti):
+			raise AuthenticationError("Token has been revoked")
+
+		return token_data
 
 	async def _authenticate_user(
 		self,
 		email: str,
 		password: str,
 	) -> User | None:
-		"""Authenticate a user by their email and password."""
+		"""Authenticate a user by their email and password.
+
+		Passwords hashed under another hashing policy, e.g. an older bcrypt
+		cost, are rehashed under the current one.
+		"""
 		user = (
 			await self.db.execute(select(User).where(User.email == email))
 		).scalar_one_or_none()
 
-		if not user or not self.verify_password(password, user.password_hash):
+		if not user:
 			return None
 
+		verified, new_hash = await password_hasher.verify_and_update(
+			password,
+			user.password_hash,
+		)
+		if not verified:
+			return None
+
+		if new_hash is not None:
+			# Hashed under another cost; stored when the login commits.
+			user.password_hash = new_hash
+			logging.info("Rehashed the password of user %s.", user.id)
+
 		return user
 
-	def _create_access_token(
+	def _create_token(
 		self,
 		email: str,
 		user_id: UUID,
-		expires_delta: timedelta,
+		token_type: str,
+		jti: UUID,
+		expires_at: datetime,
 	) -> str:
-		"""Create a JWT access token for a user."""
+		"""Create a JWT access or refresh token for a user."""
 		encode: dict[str, str | datetime] = {
 			"sub": email,
 			"id": str(user_id),
-			"exp": datetime.now(UTC) + expires_delta,
+			"typ": token_type,
+			"jti": str(jti),
+			"exp": expires_at,
 		}
 
 		token = jwt_encode(
@@ -93,28 +164,136 @@ class AuthService:
 
 		return cast("str", token)
 
+	def _issue_tokens(
+		self,
+		email: str,
+		user_id: UUID,
+		family_id: UUID,
+	) -> models.Token:
+		"""Issue an access token and a refresh token within a session.
+
+		The refresh token is recorded with the access token issued along with
+		it, so that revoking the session also revokes that access token. The
+		caller commits.
+
+		Args:
+			email (str): The email of the user.
+			user_id (UUID): The ID of the user.
+			family_id (UUID): The session, shared by all tokens rotated from the
+				same login.
+		"""
+		now = datetime.now(UTC)
+		access_jti = uuid4()
+		access_expires_at = now + timedelta(
+			minutes=settings.AUTH_ACCESS_TOKEN_EXPIRE_MINUTES,
+		)
+		refresh_token = RefreshToken(
+			jti=uuid4(),
+			user_id=user_id,
+			family_id=family_id,
+			expires_at=now + timedelta(days=settings.AUTH_REFRESH_TOKEN_EXPIRE_DAYS),
+			access_jti=access_jti,
+			access_expires_at=access_expires_at,
+		)
+		self.db.add(refresh_token)
+
+		return models.Token(
+			access_token=self._create_token(
+				email,
+				user_id,
+				ACCESS_TOKEN,
+				access_jti,
+				access_expires_at,
+			),
+			token_type="bearer",
+			refresh_token=self._create_token(
+				email,
+				user_id,
+				REFRESH_TOKEN,
+				refresh_token.jti,
+				refresh_token.expires_at,
+			),
+		)
+
+	async def _revoke_sessions(self, *criteria: ColumnElement[bool]) -> None:
+		"""Revoke the refresh tokens matching `criteria` and their access tokens.
+
+		The access tokens that have not expired yet are denylisted in the
+		database for the other workers and in memory for this one. Only the
+		tokens that still grant access are updated: a used refresh token is
+		already rejected, and once its access token has expired too there is
+		nothing left to revoke. Runs within the current transaction; the
+		caller commits.
+		"""
+		now = datetime.now(UTC)
+		revoked = (
+			await self.db.execute(
+				update(RefreshToken)
+				.where(
+					*criteria,
+					RefreshToken.revoked_at.is_(None),
+					RefreshToken.expires_at > now,
+					or_(
+						RefreshToken.used_at.is_(None),
+						RefreshToken.access_expires_at > now,
+					),
+				)
+				.values(revoked_at=now)
+				.returning(RefreshToken.access_jti, RefreshToken.access_expires_at),
+			)
+		).all()
+		live = [
+			row
+			for row in revoked
+			if row.access_expires_at.timestamp() > now.timestamp()
+		]
+		if not live:
+			return
+
+		await self.db.execute(
+			insert(RevokedToken)
+			.values(
+				[
+					{"jti": row.access_jti, "expires_at": row.access_expires_at}
+					for row in live
+				],
+			)
+			.on_conflict_do_nothing(),
+		)
+		for row in live:
+			token_denylist.add(str(row.access_jti), row.access_expires_at.timestamp())
+
+	async def revoke_user_sessions(self, user_id: UUID) -> None:
+		"""Revoke every session of a user within the current transaction."""
+		await self._revoke_sessions(RefreshToken.user_id == user_id)
+
 	async def register_user(
 		self,
 		register_user_request: models.RegisterUserRequest,
 	) -> None:
 		"""Register a new user in the system."""
+		password_hash = await self.get_password_hash(register_user_request.password)
 		try:
 			create_user_model = User(
 				id=uuid4(),
 				email=register_user_request.email,
 				first_name=register_user_request.first_name,
 				last_name=register_user_request.last_name,
-				password_hash=self.get_password_hash(register_user_request.password),
+				password_hash=password_hash,
 			)
 
 			self.db.add(create_user_model)
 			await self.db.commit()
 		except Exception as e:
 			logging.error(
-				f"Registration failed: {register_user_request.email}. Error: {str(e)}",
+				"Registration failed: %s. Error: %s",
+				register_user_request.email,
+				e,
 			)
 			raise AuthenticationError("Error registering user")
 
+		record_event(create_user_model.id, AuditEventType.registered)
+
 	async def login_for_access_token(
 		self,
 		form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
@@ -128,13 +307,63 @@ class AuthService:
 		if user is None:
 			raise AuthenticationError()
 
-		token = self._create_access_token(
-			user.email,
-			user.id,
-			timedelta(minutes=settings.AUTH_ACCESS_TOKEN_EXPIRE_MINUTES),
-		)
+		token = self._issue_tokens(user.email, user.id, family_id=uuid4())
+		await self.db.commit()
+		record_event(user.id, AuditEventType.login)
+		return token
+
+	async def refresh_access_token(self, refresh_token: str) -> models.Token:
+		"""Exchange a refresh token for a new access token and refresh token.
+
+		Refresh tokens are rotated: each one can be exchanged once. Presenting
+		a used or revoked token again means it has leaked, so its whole session
+		is revoked.
+		"""
+		payload, jti = self._decode_refresh_token(refresh_token)
+
+		now = datetime.now(UTC)
+		session = (
+			await self.db.execute(
+				update(RefreshToken)
+				.where(
+					RefreshToken.jti == jti,
+					RefreshToken.used_at.is_(None),
+					RefreshToken.revoked_at.is_(None),
+					RefreshToken.expires_at > now,
+				)
+				.values(used_at=now)
+				.returning(RefreshToken.user_id, RefreshToken.family_id),
+			)
+		).one_or_none()
+		if session is None:
+			logging.warning("Refresh token %s reused, revoking its session.", jti)
+			await self._revoke_sessions(RefreshToken.family_id == _family_of(jti))
+			await self.db.commit()
+			record_event(_user_of(payload), AuditEventType.refresh_token_reused)
+			raise AuthenticationError("Refresh token has been revoked")
+
+		token = self._issue_tokens(payload["sub"], session.user_id, session.family_id)
+		await self.db.commit()
+		return token
+
+	async def revoke_refresh_token(self, refresh_token: str) -> None:
+		"""Log out: revoke the session of a refresh token and its access tokens."""
+		payload, jti = self._decode_refresh_token(refresh_token)
+		await self._revoke_sessions(RefreshToken.family_id == _family_of(jti))
+		await self.db.commit()
+		record_event(_user_of(payload), AuditEventType.logout)
+
+
+def _user_of(payload: dict[str, Any]) -> UUID:
+	"""Return the ID of the user a verified token was issued to."""
+	return UUID(payload["id"])
+
 
-		return models.Token(access_token=token, token_type="bearer")
+def _family_of(jti: UUID):
+	"""Select the session of the refresh token `jti`."""
+	return (
+		select(RefreshToken.family_id).where(RefreshToken.jti == jti).scalar_subquery()
+	)
 
 
 def get_current_user(
@@ -0,0 +1,86 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.auth.models import TokenData
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class TokenCacheStats:
+	"""Point-in-time metrics of the verified token cache."""
+
+	size: int
+	max_size: int
+	hits: int
+	misses: int
+
+
+class TokenCache:
+	"""Bounded LRU cache of already verified access tokens.
+
+	Entries are keyed by a SHA-256 digest of the token, so raw tokens are
+	never kept in memory, and each entry expires together with the token's
+	`exp` claim. A hit skips the signature check and the `TokenData` parsing.
+	"""
+
+	def __init__(self, max_size: int):
+		"""Initialize the cache.
+
+		Args:
+			max_size (int): The maximum number of tokens to keep.
+		"""
+		self.max_size = max_size
+		self._entries: OrderedDict[bytes, tuple[float, TokenData]] = OrderedDict()
+		self._hits = 0
+		self._misses = 0
+
+	@staticmethod
+	def _key(token: str) -> bytes:
+		return hashlib.sha256(token.encode()).digest()
+
+	def get(self, token: str) -> TokenData | None:
+		"""Return the cached token data, or None if absent or expired."""
+		key = self._key(token)
+		entry = self._entries.get(key)
+		if entry is None:
+			self._misses += 1
+			return None
+
+		expires_at, token_data = entry
+		if expires_at <= time.time():
+			del self._entries[key]
+			self._misses += 1
+			return None
+
+		self._entries.move_to_end(key)
+		self._hits += 1
+		return token_data
+
+	def put(self, token: str, token_data: TokenData, expires_at: float) -> None:
+		"""Cache verified token data until the token's expiry timestamp."""
+		if self.max_size <= 0:
+			return
+
+		key = self._key(token)
+		self._entries[key] = (expires_at, token_data)
+		self._entries.move_to_end(key)
+		while len(self._entries) > self.max_size:
+			self._entries.popitem(last=False)
+
+	def clear(self) -> None:
+		"""Drop every cached token."""
+		self._entries.clear()
+
+	def stats(self) -> TokenCacheStats:
+		"""Return the current size and hit/miss counters."""
+		return TokenCacheStats(
+			size=len(self._entries),
+			max_size=self.max_size,
+			hits=self._hits,
+			misses=self._misses,
+		)
+
+
+token_cache = TokenCache(max_size=settings.AUTH_TOKEN_CACHE_SIZE)
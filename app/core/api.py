@@ -1,11 +1,17 @@
 from fastapi import FastAPI
 
 from app.auth.controller import router as auth_router
+from app.core.config import settings
+from app.health.controller import router as health_router
+from app.metrics.controller import router as metrics_router
 from app.todos.controller import router as todos_router
 from app.users.controller import router as users_router
 
 
 def register_routes(app: FastAPI):
+	app.include_router(health_router)
 	app.include_router(todos_router)
 	app.include_router(auth_router)
 	app.include_router(users_router)
+	if settings.METRICS_ENABLED:
+		app.include_router(metrics_router)
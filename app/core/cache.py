@@ -0,0 +1,169 @@
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class CacheStats:
+	"""Point-in-time metrics of a cache backend."""
+
+	size: int
+	max_size: int
+	hits: int
+	misses: int
+	evictions: int
+
+
+class CacheBackend(ABC):
+	"""Storage behind `Cache`.
+
+	Implementations backed by a shared store (e.g. Redis or memcached) must
+	serialize values themselves; the services cache Pydantic models and
+	encoded JSON bodies.
+	"""
+
+	@abstractmethod
+	async def get(self, key: str) -> Any | None:
+		"""Return the value stored under `key`, or None if absent or expired."""
+
+	@abstractmethod
+	async def set(self, key: str, value: Any, ttl: float) -> None:
+		"""Store `value` under `key` for `ttl` seconds."""
+
+	@abstractmethod
+	async def delete(self, key: str) -> None:
+		"""Remove `key` if present."""
+
+	@abstractmethod
+	def stats(self) -> CacheStats:
+		"""Return the current size and hit/miss counters."""
+
+
+class MemoryCacheBackend(CacheBackend):
+	"""In-process TTL cache with LRU eviction once `max_size` is reached.
+
+	Each worker process holds its own copy, so with several workers a write
+	only invalidates the worker that served it and the others may serve stale
+	entries for up to the TTL. Use a shared backend where that matters.
+	"""
+
+	def __init__(self, max_size: int):
+		"""Initialize the backend.
+
+		Args:
+			max_size (int): The maximum number of entries to keep.
+		"""
+		self.max_size = max_size
+		self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+		self._hits = 0
+		self._misses = 0
+		self._evictions = 0
+
+	async def get(self, key: str) -> Any | None:
+		entry = self._entries.get(key)
+		if entry is None:
+			self._misses += 1
+			return None
+
+		expires_at, value = entry
+		if expires_at <= time.monotonic():
+			del self._entries[key]
+			self._misses += 1
+			return None
+
+		self._entries.move_to_end(key)
+		self._hits += 1
+		return value
+
+	async def set(self, key: str, value: Any, ttl: float) -> None:
+		self._entries[key] = (time.monotonic() + ttl, value)
+		self._entries.move_to_end(key)
+		while len(self._entries) > self.max_size:
+			self._entries.popitem(last=False)
+			self._evictions += 1
+
+	async def delete(self, key: str) -> None:
+		self._entries.pop(key, None)
+
+	def stats(self) -> CacheStats:
+		return CacheStats(
+			size=len(self._entries),
+			max_size=self.max_size,
+			hits=self._hits,
+			misses=self._misses,
+			evictions=self._evictions,
+		)
+
+
+class Cache:
+	"""Read-through cache with namespace invalidation.
+
+	Every namespace (e.g. the todos of one user) has a version token that is
+	part of the keys of its entries. Invalidating the namespace replaces the
+	token, which makes all of its entries unreachable at once; they then age
+	out of the backend. A namespace whose token was evicted gets a fresh
+	random one, so stale entries can never become reachable again.
+	"""
+
+	def __init__(self, backend: CacheBackend, ttl: float, *, enabled: bool = True):
+		"""Initialize the cache.
+
+		Args:
+			backend (CacheBackend): The storage for entries and version tokens.
+			ttl (float): How long entries stay valid, in seconds.
+			enabled (bool): Whether reads are cached at all.
+		"""
+		self.backend = backend
+		self.ttl = ttl
+		self.enabled = enabled
+
+	@staticmethod
+	def _version_key(namespace: str) -> str:
+		return f"version:{namespace}"
+
+	async def get_version(self, namespace: str) -> str:
+		"""Return the current version token of `namespace`."""
+		version = await self.backend.get(self._version_key(namespace))
+		if version is None:
+			version = await self.invalidate(namespace)
+		return version
+
+	async def invalidate(self, namespace: str) -> str:
+		"""Invalidate every entry of `namespace` and return its new version."""
+		version = uuid.uuid4().hex
+		# Version tokens must outlive the entries keyed by them.
+		await self.backend.set(
+			self._version_key(namespace),
+			version,
+			max(self.ttl * 10, 3600),
+		)
+		return version
+
+	async def key(self, namespace: str, *parts: object) -> str:
+		"""Build the key of an entry in the current version of `namespace`."""
+		version = await self.get_version(namespace)
+		return ":".join([namespace, version, *map(str, parts)])
+
+	async def get(self, key: str) -> Any | None:
+		if not self.enabled:
+			return None
+		return await self.backend.get(key)
+
+	async def set(self, key: str, value: Any) -> None:
+		if self.enabled:
+			await self.backend.set(key, value, self.ttl)
+
+	def stats(self) -> CacheStats:
+		return self.backend.stats()
+
+
+cache = Cache(
+	MemoryCacheBackend(max_size=settings.CACHE_MAX_ENTRIES),
+	ttl=settings.CACHE_TTL_SECONDS,
+	enabled=settings.CACHE_ENABLED,
+)
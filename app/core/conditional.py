@@ -0,0 +1,41 @@
+import hashlib
+
+from fastapi import Response, status
+
+
+def make_etag(version: int, *parts: object) -> str:
+	"""Build a strong ETag for a representation at `version`.
+
+	The version stays readable in the tag so that an `If-Match` header can be
+	turned back into the version it refers to; the digest binds the tag to
+	`parts`, e.g. the user and the query that produced the representation.
+	"""
+	digest = hashlib.blake2b(
+		":".join(map(str, parts)).encode(),
+		digest_size=8,
+	).hexdigest()
+	return f'"{version}-{digest}"'
+
+
+def parse_etags(header: str) -> list[str]:
+	"""Split an `If-Match`/`If-None-Match` header into its entity tags."""
+	return [tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()]
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+	"""Whether an `If-None-Match` header matches `etag` (weak comparison)."""
+	if not header:
+		return False
+	tags = parse_etags(header)
+	return "*" in tags or etag in tags
+
+
+def etag_version(etag: str) -> int | None:
+	"""Return the version encoded in an ETag built by `make_etag`."""
+	version, _, _ = etag.strip('"').partition("-")
+	return int(version) if version.isdigit() else None
+
+
+def not_modified(etag: str) -> Response:
+	"""Build the `304 Not Modified` response for a matching `If-None-Match`."""
+	return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
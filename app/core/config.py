@@ -1,4 +1,3 @@
-from dotenv import load_dotenv
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
@@ -12,14 +11,83 @@ class Settings(BaseSettings):
 
 	API_PREFIX: str = "/api"
 	DEBUG: bool = False
+	FAST_START: bool = False
 	DATABASE_URL: str = ""
 	ALEMBIC_DATABASE_URL: str = ""
 	SQLALCHEMY_ECHO: bool = False
+	DATABASE_POOL_SIZE: int = 5
+	DATABASE_MAX_OVERFLOW: int = 10
+	DATABASE_POOL_TIMEOUT: float = 30.0
+	DATABASE_POOL_RECYCLE: int = 1800
+	DATABASE_POOL_PRE_PING: bool = True
+	DATABASE_STATEMENT_CACHE_SIZE: int = 100
+	DATABASE_POOL_WARMUP_CONNECTIONS: int = 5
+	DATABASE_REPLICA_URL: str = ""
+	DATABASE_REPLICA_STICKY_SECONDS: float = 5.0
+	DATABASE_REPLICA_RETRY_SECONDS: float = 30.0
+	DATABASE_REPLICA_STICKY_PATH: str = ""
+	DATABASE_REPLICA_STICKY_MAX_USERS: int = 65536
 	ALLOWED_ORIGINS: str = ""
 	OPENAI_API_KEY: str = ""
+	SERVER_HOST: str = "0.0.0.0"
+	SERVER_PORT: int = 8000
+	SERVER_WORKERS: int = 0
+	SERVER_WORKERS_PER_CPU: float = 1.0
+	SERVER_BACKLOG: int = 2048
+	SERVER_KEEPALIVE_SECONDS: int = 5
+	SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 10
+	SERVER_LIMIT_CONCURRENCY: int = 0
+	SERVER_LIMIT_MAX_REQUESTS: int = 0
+	SERVER_PROXY_HEADERS: bool = True
+	SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+	SERVER_ACCESS_LOG: bool = True
+	SHUTDOWN_GRACE_PERIOD_SECONDS: float = 30.0
+	SHUTDOWN_READINESS_DELAY_SECONDS: float = 5.0
+	SHUTDOWN_DRAIN_SECONDS: float = 5.0
+	JOBS_WORKERS: int = 4
+	JOBS_QUEUE_SIZE: int = 1000
+	JOBS_MAX_ATTEMPTS: int = 3
+	JOBS_RETRY_BACKOFF_SECONDS: float = 0.5
+	JOBS_DRAIN_SECONDS: float = 5.0
+	LOG_FORMAT: str = "text"
+	LOG_BACKGROUND: bool = True
+	LOG_QUEUE_SIZE: int = 10000
+	LOG_RATE_LIMIT: int = 100
+	LOG_RATE_LIMIT_WINDOW_SECONDS: float = 60.0
+	METRICS_ENABLED: bool = True
+	METRICS_MULTIPROCESS: bool = True
+	METRICS_DIR: str = ""
+	METRICS_FLUSH_SECONDS: float = 1.0
+	SQL_PROFILER_ENABLED: bool = False
+	SQL_PROFILER_TOKEN: str = ""
+	SQL_PROFILER_QUERY_BUDGET: int = 5
 	AUTH_SECRET_KEY: str = ""
 	AUTH_ALGORITHM: str = "HS256"
 	AUTH_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+	AUTH_REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+	AUTH_REFRESH_TOKEN_PRUNE_BATCH_SIZE: int = 1000
+	AUTH_AUDIT_RETENTION_DAYS: int = 365
+	AUTH_REFRESH_RATE_LIMIT: str = "30/minute"
+	AUTH_DENYLIST_SYNC_SECONDS: float = 5.0
+	AUTH_TOKEN_CACHE_SIZE: int = 10000
+	AUTH_LOGIN_RATE_LIMIT: str = "20/minute"
+	AUTH_LOGIN_ACCOUNT_RATE_LIMIT: str = "5/minute"
+	PASSWORD_HASH_ROUNDS: int = 12
+	PASSWORD_HASH_BUDGET_MS: float = 250.0
+	PASSWORD_HASH_WORKERS: int = 2
+	PASSWORD_HASH_QUEUE_SIZE: int = 32
+	CACHE_ENABLED: bool = True
+	CACHE_TTL_SECONDS: float = 5.0
+	CACHE_MAX_ENTRIES: int = 10000
+	RATE_LIMIT_ENABLED: bool = True
+	RATE_LIMIT_BACKEND: str = "shared"
+	RATE_LIMIT_SHARED_PATH: str = ""
+	RATE_LIMIT_MAX_KEYS: int = 65536
+	TODOS_DEFAULT_PAGE_SIZE: int = 50
+	TODOS_RATE_LIMIT: str = "600/minute"
+	TODOS_MAX_PAGE_SIZE: int = 200
+	TODOS_EXPORT_CHUNK_SIZE: int = 1000
+	TODOS_MAX_BULK_SIZE: int = 500
 
 	@classmethod
 	@field_validator("ALLOWED_ORIGINS")
@@ -32,6 +100,5 @@ class Settings(BaseSettings):
 		case_sensitive = True
 
 
-# Load environment variables from .env file.
-load_dotenv()
+# Settings reads the .env file itself.
 settings = Settings()
@@ -1,3 +1,4 @@
+import math
 from uuid import UUID
 
 from fastapi import HTTPException, status
@@ -35,3 +36,37 @@ class TodoCreationError(HTTPException):
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail=f"Failed to create todo: {error}",
 		)
+
+
+class InvalidCursorError(HTTPException):
+	def __init__(self):
+		super().__init__(
+			status_code=status.HTTP_400_BAD_REQUEST,
+			detail="Invalid pagination cursor",
+		)
+
+
+class PasswordHashingUnavailableError(HTTPException):
+	def __init__(self):
+		super().__init__(
+			status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+			detail="Too many authentication requests, please retry shortly",
+			headers={"Retry-After": "1"},
+		)
+
+
+class PreconditionFailedError(HTTPException):
+	def __init__(self):
+		super().__init__(
+			status_code=status.HTTP_412_PRECONDITION_FAILED,
+			detail="Todo has been modified since it was last fetched",
+		)
+
+
+class RateLimitExceededError(HTTPException):
+	def __init__(self, retry_after: float):
+		super().__init__(
+			status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+			detail="Rate limit exceeded",
+			headers={"Retry-After": str(math.ceil(retry_after))},
+		)
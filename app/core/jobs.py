@@ -0,0 +1,244 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logger import request_id_var
+
+JobFunc = Callable[..., Awaitable[Any]]
+
+
+class Job(NamedTuple):
+	"""A queued call of a coroutine function."""
+
+	func: JobFunc
+	args: tuple[Any, ...]
+	request_id: str | None
+
+	@property
+	def name(self) -> str:
+		return getattr(self.func, "__qualname__", repr(self.func))
+
+
+# The jobs enqueued by the current request, held until its response is sent.
+pending_jobs: ContextVar[list[Job] | None] = ContextVar("pending_jobs", default=None)
+
+
+@dataclass(frozen=True)
+class JobRunnerStats:
+	"""Point-in-time metrics of the background job runner."""
+
+	workers: int
+	queue_size: int
+	queue_depth: int
+	in_flight: int
+	completed: int
+	failed: int
+	retried: int
+	rejected: int
+
+
+class JobRunner:
+	"""Runs work that does not need to hold up the response on asyncio workers.
+
+	Jobs are coroutine functions called with the arguments they were enqueued
+	with. Jobs enqueued while handling a request only enter the queue once
+	the response has been sent, see `JobMiddleware`. The queue is bounded:
+	when `queue_size` jobs are already waiting, further jobs are rejected and
+	logged rather than piling up in memory. A failing job is retried with
+	exponential backoff, holding its worker while it waits, until it has run
+	`max_attempts` times.
+	"""
+
+	def __init__(
+		self,
+		workers: int,
+		queue_size: int,
+		max_attempts: int,
+		retry_backoff: float,
+	):
+		"""Initialize the runner.
+
+		Args:
+			workers (int): The number of jobs run concurrently.
+			queue_size (int): The number of jobs allowed to wait for a worker.
+			max_attempts (int): The number of times a failing job is run.
+			retry_backoff (float): The seconds before the first retry, doubled
+				on every further retry.
+		"""
+		self.workers = workers
+		self.queue_size = queue_size
+		self.max_attempts = max_attempts
+		self.retry_backoff = retry_backoff
+		self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=queue_size)
+		self._tasks: list[asyncio.Task[None]] = []
+		self._closed = False
+		self._in_flight = 0
+		self._completed = 0
+		self._failed = 0
+		self._retried = 0
+		self._rejected = 0
+
+	def start(self) -> None:
+		"""Start the workers, unless they are running already."""
+		if self._tasks:
+			return
+		self._closed = False
+		self._tasks = [
+			asyncio.create_task(self._work(), name=f"job-worker-{i}")
+			for i in range(self.workers)
+		]
+
+	def enqueue(self, func: JobFunc, *args: Any) -> None:
+		"""Run `func(*args)` in the background.
+
+		Within a request the job is held until the response has been sent,
+		and dropped if the request fails with an unhandled error.
+		"""
+		job = Job(func, args, request_id_var.get())
+		pending = pending_jobs.get()
+		if pending is not None:
+			pending.append(job)
+		else:
+			self.submit(job)
+
+	def submit(self, job: Job) -> bool:
+		"""Queue a job for the workers right away.
+
+		The workers are started on first use when the application lifespan
+		did not start them, e.g. under a bare ASGI transport.
+
+		Returns:
+			bool: Whether the job was queued, rather than rejected because the
+				queue is full or the runner is shutting down.
+		"""
+		if self._closed:
+			self._rejected += 1
+			logging.warning("Rejected job %s: shutting down", job.name)
+			return False
+		self.start()
+		try:
+			self._queue.put_nowait(job)
+		except asyncio.QueueFull:
+			self._rejected += 1
+			logging.warning("Rejected job %s: the job queue is full", job.name)
+			return False
+		return True
+
+	async def drain(self, timeout: float) -> bool:
+		"""Stop accepting jobs, wait for the queued ones and stop the workers.
+
+		Args:
+			timeout (float): The maximum seconds to wait.
+
+		Returns:
+			bool: Whether every queued job finished within `timeout`. Jobs still
+				running afterwards are cancelled.
+		"""
+		self._closed = True
+		if not self._tasks:
+			return self._queue.empty()
+
+		try:
+			await asyncio.wait_for(self._queue.join(), timeout)
+			finished = True
+		except TimeoutError:
+			finished = False
+
+		for task in self._tasks:
+			task.cancel()
+		await asyncio.gather(*self._tasks, return_exceptions=True)
+		self._tasks = []
+		return finished
+
+	def stats(self) -> JobRunnerStats:
+		"""Return the current queue and outcome metrics."""
+		return JobRunnerStats(
+			workers=len(self._tasks),
+			queue_size=self.queue_size,
+			queue_depth=self._queue.qsize(),
+			in_flight=self._in_flight,
+			completed=self._completed,
+			failed=self._failed,
+			retried=self._retried,
+			rejected=self._rejected,
+		)
+
+	async def _work(self) -> None:
+		while True:
+			job = await self._queue.get()
+			self._in_flight += 1
+			# Logs of the job carry the ID of the request that enqueued it.
+			token = request_id_var.set(job.request_id)
+			try:
+				await self._run(job)
+			finally:
+				request_id_var.reset(token)
+				self._in_flight -= 1
+				self._queue.task_done()
+
+	async def _run(self, job: Job) -> None:
+		delay = self.retry_backoff
+		for attempt in range(1, self.max_attempts + 1):
+			try:
+				await job.func(*job.args)
+			except Exception as e:
+				if attempt == self.max_attempts:
+					self._failed += 1
+					logging.exception(
+						"Job %s failed after %s attempts",
+						job.name,
+						attempt,
+					)
+					return
+				self._retried += 1
+				logging.warning(
+					"Job %s failed, retrying in %ss: %s",
+					job.name,
+					delay,
+					e,
+				)
+				await asyncio.sleep(delay)
+				delay *= 2
+			else:
+				self._completed += 1
+				return
+
+
+class JobMiddleware:
+	"""Hand the jobs enqueued by a request to the runner once it has responded.
+
+	The jobs therefore never delay the response, and the jobs of a request
+	that fails with an unhandled error are dropped along with it.
+	"""
+
+	def __init__(self, app: ASGIApp):
+		self.app = app
+
+	async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+		if scope["type"] != "http":
+			await self.app(scope, receive, send)
+			return
+
+		pending: list[Job] = []
+		token = pending_jobs.set(pending)
+		try:
+			await self.app(scope, receive, send)
+		finally:
+			pending_jobs.reset(token)
+
+		for job in pending:
+			job_runner.submit(job)
+
+
+job_runner = JobRunner(
+	workers=settings.JOBS_WORKERS,
+	queue_size=settings.JOBS_QUEUE_SIZE,
+	max_attempts=settings.JOBS_MAX_ATTEMPTS,
+	retry_backoff=settings.JOBS_RETRY_BACKOFF_SECONDS,
+)
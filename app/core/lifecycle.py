@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import signal
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from types import FrameType
+
+
+class Lifecycle:
+	"""Readiness and in-flight work of this worker process.
+
+	The worker is ready once start-up warm-up has finished and stops being
+	ready as soon as it is asked to shut down, see `delay_shutdown`. Database
+	sessions register themselves through `track` so that shutdown can wait
+	for them to finish.
+	"""
+
+	def __init__(self):
+		self.ready = False
+		self.draining = False
+		self.in_flight = 0
+		self._idle = asyncio.Event()
+		self._idle.set()
+
+	@property
+	def accepting(self) -> bool:
+		"""Whether the worker should receive traffic."""
+		return self.ready and not self.draining
+
+	@asynccontextmanager
+	async def track(self) -> AsyncIterator[None]:
+		"""Count the enclosed work as in flight."""
+		self.in_flight += 1
+		self._idle.clear()
+		try:
+			yield
+		finally:
+			self.in_flight -= 1
+			if self.in_flight == 0:
+				self._idle.set()
+
+	def delay_shutdown(self, delay: float) -> None:
+		"""Stop being ready on SIGTERM, `delay` seconds before the server stops.
+
+		The server closes its listener as soon as it handles SIGTERM, before
+		the lifespan shutdown runs, so load balancers would never see the
+		worker turn unready. This wraps the server's SIGTERM handler instead:
+		the worker reports itself as draining right away, keeps serving for
+		`delay` seconds while the load balancers stop routing to it, and only
+		then hands the signal to the server. A second SIGTERM is handed over
+		at once. Does nothing outside the main thread, where signal handlers
+		cannot be installed, e.g. under a test client.
+
+		Args:
+			delay (float): The seconds between the signal and the server
+				shutting down.
+		"""
+		if threading.current_thread() is not threading.main_thread():
+			return
+		handler = signal.getsignal(signal.SIGTERM)
+		if not callable(handler) or delay <= 0:
+			return
+
+		loop = asyncio.get_running_loop()
+
+		def handle_sigterm(sig: int, frame: FrameType | None) -> None:
+			def stop() -> None:
+				handler(sig, frame)
+
+			if self.draining:
+				loop.call_soon_threadsafe(stop)
+				return
+			self.draining = True
+			logging.info("Received SIGTERM, shutting down in %ss", delay)
+			loop.call_soon_threadsafe(loop.call_later, delay, stop)
+
+		signal.signal(signal.SIGTERM, handle_sigterm)
+
+	async def drain(self, timeout: float) -> bool:
+		"""Stop being ready and wait for the in-flight work to finish.
+
+		Args:
+			timeout (float): The maximum seconds to wait.
+
+		Returns:
+			bool: Whether all in-flight work finished within `timeout`.
+		"""
+		self.draining = True
+		deadline = time.monotonic() + timeout
+		while self.in_flight:
+			remaining = deadline - time.monotonic()
+			if remaining <= 0:
+				return False
+			try:
+				await asyncio.wait_for(self._idle.wait(), remaining)
+			except TimeoutError:
+				return False
+		return True
+
+
+lifecycle = Lifecycle()
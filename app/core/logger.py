@@ -1,8 +1,21 @@
+import atexit
+import json
 import logging
+import queue
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import UTC, datetime
 from enum import StrEnum
+from logging.handlers import QueueHandler, QueueListener
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 LOG_FORMAT_DEBUG = "%(levelname)s:%(message)s:%(pathname)s:%(funcName)s:%(lineno)d"
 
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
 
 class LogLevels(StrEnum):
 	info = "INFO"
@@ -11,16 +24,190 @@ class LogLevels(StrEnum):
 	debug = "DEBUG"
 
 
-def configure_logging(log_level: str = LogLevels.error):
+class RequestIdFilter(logging.Filter):
+	"""Stamp records with the ID of the request they were logged in."""
+
+	def filter(self, record: logging.LogRecord) -> bool:
+		record.request_id = request_id_var.get()
+		return True
+
+
+class RateLimitFilter(logging.Filter):
+	"""Let through at most `limit` records per logger and message per window.
+
+	Records are grouped by their unformatted message, so this only works for
+	lazily formatted calls such as `logger.warning("Bad token: %s", error)`.
+	The first record of the next window carries the number of records that
+	were dropped in between as `suppressed`.
+	"""
+
+	def __init__(self, limit: int, window: float, max_keys: int = 1024):
+		super().__init__()
+		self.limit = limit
+		self.window = window
+		self.max_keys = max_keys
+		self._windows: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+
+	def filter(self, record: logging.LogRecord) -> bool:
+		key = (record.name, str(record.msg))
+		now = time.monotonic()
+		# Window start, records let through and records suppressed.
+		state = self._windows.get(key)
+		if state is None or now - state[0] >= self.window:
+			suppressed = int(state[2]) if state else 0
+			self._windows[key] = [now, 1, 0]
+			self._windows.move_to_end(key)
+			while len(self._windows) > self.max_keys:
+				self._windows.popitem(last=False)
+			if suppressed:
+				record.suppressed = suppressed
+			return True
+
+		if state[1] < self.limit:
+			state[1] += 1
+			return True
+
+		state[2] += 1
+		return False
+
+
+class JSONFormatter(logging.Formatter):
+	"""Format records as single-line JSON objects."""
+
+	def format(self, record: logging.LogRecord) -> str:
+		entry = {
+			"time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+			"level": record.levelname,
+			"logger": record.name,
+			"message": record.getMessage(),
+			"request_id": getattr(record, "request_id", None),
+			"location": f"{record.module}:{record.funcName}:{record.lineno}",
+		}
+		if suppressed := getattr(record, "suppressed", None):
+			entry["suppressed"] = suppressed
+		if record.exc_info:
+			entry["exception"] = self.formatException(record.exc_info)
+		return json.dumps(entry, default=str)
+
+
+class BackgroundQueueHandler(QueueHandler):
+	"""Hand records to a `QueueListener` without formatting them first.
+
+	`QueueHandler` formats every record before enqueueing it, on the thread
+	that logged it. Records only ever cross threads here, so they are passed
+	as they are and the listener thread does all formatting and I/O. When the
+	queue is full, records are dropped and counted rather than blocking.
+	"""
+
+	def __init__(self, log_queue: queue.Queue[logging.LogRecord]):
+		super().__init__(log_queue)
+		self.dropped = 0
+
+	def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+		return record
+
+	def enqueue(self, record: logging.LogRecord) -> None:
+		try:
+			self.queue.put_nowait(record)
+		except queue.Full:
+			self.dropped += 1
+
+
+def configure_logging(
+	log_level: str = LogLevels.error,
+	*,
+	json_format: bool = False,
+	background: bool = False,
+	queue_size: int = 10000,
+	rate_limit: int = 0,
+	rate_limit_window: float = 60.0,
+):
+	"""Configure the root logger.
+
+	Args:
+		log_level (str): The minimum level to log.
+		json_format (bool): Write JSON lines with the request ID of each record.
+		background (bool): Format and write records on a background thread.
+		queue_size (int): The number of records buffered for the background
+			thread before new ones are dropped.
+		rate_limit (int): The maximum records per logger and message in each
+			`rate_limit_window` seconds; 0 disables rate limiting.
+		rate_limit_window (float): The rate limiting window in seconds.
+	"""
 	log_level = str(log_level).upper()
 	log_levels = [level.value for level in LogLevels]
 
 	if log_level not in log_levels:
-		logging.basicConfig(level=LogLevels.error)
-		return
+		log_level = LogLevels.error
 
-	if log_level == LogLevels.debug:
-		logging.basicConfig(level=log_level, format=LOG_FORMAT_DEBUG)
+	if not (json_format or background or rate_limit):
+		if log_level == LogLevels.debug:
+			logging.basicConfig(level=log_level, format=LOG_FORMAT_DEBUG)
+			return
+
+		logging.basicConfig(level=log_level)
 		return
 
-	logging.basicConfig(level=log_level)
+	handler = logging.StreamHandler()
+	if json_format:
+		handler.setFormatter(JSONFormatter())
+	elif log_level == LogLevels.debug:
+		handler.setFormatter(logging.Formatter(LOG_FORMAT_DEBUG))
+	else:
+		handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+
+	front: logging.Handler = handler
+	if background:
+		log_queue: queue.Queue[logging.LogRecord] = queue.Queue(queue_size)
+		front = BackgroundQueueHandler(log_queue)
+		listener = QueueListener(log_queue, handler, respect_handler_level=True)
+		listener.start()
+		atexit.register(listener.stop)
+
+	front.addFilter(RequestIdFilter())
+	if rate_limit:
+		front.addFilter(RateLimitFilter(rate_limit, rate_limit_window))
+
+	logging.basicConfig(level=log_level, handlers=[front])
+
+
+class RequestIdMiddleware:
+	"""Assign every request an ID for log correlation.
+
+	The ID is taken from the `X-Request-ID` header when the client sends one,
+	exposed to log records through `request_id_var` and echoed back in the
+	response headers.
+	"""
+
+	def __init__(self, app: ASGIApp):
+		self.app = app
+
+	async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+		if scope["type"] != "http":
+			await self.app(scope, receive, send)
+			return
+
+		request_id = (
+			next(
+				(
+					value.decode("latin-1")
+					for name, value in scope["headers"]
+					if name == b"x-request-id"
+				),
+				None,
+			)
+			or uuid.uuid4().hex
+		)
+
+		async def send_with_request_id(message: Message) -> None:
+			if message["type"] == "http.response.start":
+				headers = list(message.get("headers", []))
+				headers.append((b"x-request-id", request_id.encode("latin-1")))
+				message["headers"] = headers
+			await send(message)
+
+		token = request_id_var.set(request_id)
+		try:
+			await self.app(scope, receive, send_with_request_id)
+		finally:
+			request_id_var.reset(token)
@@ -0,0 +1,444 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from pathlib import Path
+from typing import NamedTuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+PASSWORD_HASH_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# The histograms without labels observed through `Metrics.observe`, by name.
+HISTOGRAMS = {
+	"db_pool_wait_seconds": (
+		"Time spent waiting for a database connection from the pool.",
+		POOL_WAIT_BUCKETS,
+	),
+	"password_hash_duration_seconds": (
+		"Time spent hashing or verifying a password, excluding the queue wait.",
+		PASSWORD_HASH_BUCKETS,
+	),
+}
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Sample(NamedTuple):
+	"""A gauge or counter reported by a collector at scrape time."""
+
+	name: str
+	help: str
+	value: float
+	# "gauge", or "counter" for a total that only goes up in a worker.
+	kind: str = "gauge"
+
+
+Collector = Callable[[], Iterable[Sample]]
+
+
+class Histogram:
+	"""Cumulative-at-export histogram over fixed bucket upper bounds."""
+
+	__slots__ = ("buckets", "counts", "sum")
+
+	def __init__(self, buckets: tuple[float, ...]):
+		self.buckets = buckets
+		# One count per bucket plus the +Inf bucket.
+		self.counts = [0] * (len(buckets) + 1)
+		self.sum = 0.0
+
+	def observe(self, value: float) -> None:
+		self.counts[bisect_left(self.buckets, value)] += 1
+		self.sum += value
+
+	def merge(self, counts: list[int], total: float) -> None:
+		for index, count in enumerate(counts):
+			self.counts[index] += count
+		self.sum += total
+
+
+class RequestMetrics:
+	"""The database work done while serving one request."""
+
+	__slots__ = ("query_durations",)
+
+	def __init__(self):
+		self.query_durations: list[float] = []
+
+
+current_request: ContextVar[RequestMetrics | None] = ContextVar(
+	"current_request",
+	default=None,
+)
+
+
+class Metrics:
+	"""Request and query metrics of this worker process.
+
+	Observations only update in-memory counters. So that a scrape of any one
+	worker covers all of them, each worker writes a snapshot of its counters
+	to `directory` within `flush_interval` seconds of an observation, but not
+	more often, and `render` merges the snapshots of every worker. Counters
+	of exited workers, including those reported by collectors, are kept, as
+	Prometheus expects counters to only go up: the next worker to render
+	adds them to its own and deletes the snapshot, dropping its gauges.
+	"""
+
+	def __init__(self, directory: Path | None, flush_interval: float):
+		"""Initialize the metrics.
+
+		Args:
+			directory (Path | None): Where the workers of a server share their
+				snapshots, or None to only report this process.
+			flush_interval (float): The minimum seconds between snapshots.
+		"""
+		self.directory = directory
+		self.flush_interval = flush_interval
+		self.requests: dict[tuple[str, str, str], int] = {}
+		self.request_durations: dict[tuple[str, str], Histogram] = {}
+		self.request_queries: dict[tuple[str, str], Histogram] = {}
+		self.query_durations: dict[tuple[str, str], Histogram] = {}
+		self.histograms = {
+			name: Histogram(buckets) for name, (_, buckets) in HISTOGRAMS.items()
+		}
+		self.collectors: list[Collector] = []
+		# The collector counters of the exited workers this one adopted.
+		self.counters: dict[str, list] = {}
+		# Unique to this process, as a PID may be reused by a later worker.
+		self._path = (directory or Path()) / f"{os.getpid()}-{uuid.uuid4().hex}.json"
+		self._last_flush = 0.0
+		self._flush_scheduled = False
+
+	def add_collector(self, collector: Collector) -> None:
+		"""Report the gauges returned by `collector` on every scrape."""
+		self.collectors.append(collector)
+
+	def observe(self, name: str, value: float) -> None:
+		"""Record `value` in the histogram `name` of `HISTOGRAMS`."""
+		self.histograms[name].observe(value)
+
+	def observe_request(
+		self,
+		method: str,
+		route: str,
+		status: int,
+		duration: float,
+		request: RequestMetrics,
+	) -> None:
+		key = (method, route)
+		status_key = (method, route, str(status))
+		self.requests[status_key] = self.requests.get(status_key, 0) + 1
+
+		if (histogram := self.request_durations.get(key)) is None:
+			histogram = self.request_durations[key] = Histogram(LATENCY_BUCKETS)
+		histogram.observe(duration)
+
+		if (histogram := self.request_queries.get(key)) is None:
+			histogram = self.request_queries[key] = Histogram(QUERY_COUNT_BUCKETS)
+		histogram.observe(len(request.query_durations))
+
+		if request.query_durations:
+			if (histogram := self.query_durations.get(key)) is None:
+				histogram = self.query_durations[key] = Histogram(
+					QUERY_DURATION_BUCKETS,
+				)
+			for query_duration in request.query_durations:
+				histogram.observe(query_duration)
+
+	def snapshot(self) -> dict:
+		"""Return the counters and current gauges as JSON-serializable data."""
+
+		def histograms(data: dict[tuple[str, str], Histogram]) -> list:
+			return [[list(key), h.counts, h.sum] for key, h in data.items()]
+
+		gauges: dict[str, list] = {}
+		counters = {name: list(counter) for name, counter in self.counters.items()}
+		for collector in self.collectors:
+			for sample in collector():
+				if sample.kind == "counter":
+					counters.setdefault(sample.name, [sample.help, 0])[1] += (
+						sample.value
+					)
+				else:
+					gauges[sample.name] = [sample.help, sample.value]
+
+		return {
+			"requests": [[list(key), count] for key, count in self.requests.items()],
+			"request_durations": histograms(self.request_durations),
+			"request_queries": histograms(self.request_queries),
+			"query_durations": histograms(self.query_durations),
+			"histograms": {
+				name: [h.counts, h.sum] for name, h in self.histograms.items()
+			},
+			"counters": counters,
+			"gauges": gauges,
+		}
+
+	def merge(self, snapshot: dict) -> None:
+		"""Add the counters of a `snapshot` to the counters of this process."""
+		for key, count in snapshot["requests"]:
+			key = tuple(key)
+			self.requests[key] = self.requests.get(key, 0) + count
+		for name, buckets in (
+			("request_durations", LATENCY_BUCKETS),
+			("request_queries", QUERY_COUNT_BUCKETS),
+			("query_durations", QUERY_DURATION_BUCKETS),
+		):
+			histograms = getattr(self, name)
+			for key, counts, total in snapshot[name]:
+				if (histogram := histograms.get(tuple(key))) is None:
+					histogram = histograms[tuple(key)] = Histogram(buckets)
+				histogram.merge(counts, total)
+		for name, (counts, total) in snapshot.get("histograms", {}).items():
+			if name in self.histograms:
+				self.histograms[name].merge(counts, total)
+		for name, (help_text, value) in snapshot.get("counters", {}).items():
+			self.counters.setdefault(name, [help_text, 0])[1] += value
+
+	def flush(self) -> None:
+		"""Write the snapshot of this worker for the others to read."""
+		self._last_flush = time.monotonic()
+		self._flush_scheduled = False
+		if self.directory is None:
+			return
+
+		temporary = self._path.with_suffix(".tmp")
+		try:
+			self.directory.mkdir(parents=True, exist_ok=True)
+			temporary.write_text(json.dumps(self.snapshot()))
+			temporary.replace(self._path)
+		except OSError as e:
+			logging.warning("Cannot write metrics snapshot %s: %s", self._path, e)
+
+	def schedule_flush(self) -> None:
+		"""Flush on the event loop once `flush_interval` has passed."""
+		if self.directory is None or self._flush_scheduled:
+			return
+		self._flush_scheduled = True
+		elapsed = time.monotonic() - self._last_flush
+		asyncio.get_running_loop().call_later(
+			max(0.0, self.flush_interval - elapsed),
+			self.flush,
+		)
+
+	def _adopt_exited(self) -> None:
+		"""Take over the counters of exited workers and delete their snapshots.
+
+		A snapshot is claimed by renaming it before it is read, so that of
+		several workers rendering at once exactly one adopts it.
+		"""
+		if self.directory is None:
+			return
+		for path in self.directory.glob("*.json"):
+			if path == self._path or _is_alive(_pid_of(path)):
+				continue
+			claimed = path.with_suffix(".exited")
+			try:
+				path.rename(claimed)
+				snapshot = json.loads(claimed.read_text())
+			except (OSError, ValueError):
+				continue
+			self.merge(snapshot)
+			claimed.unlink(missing_ok=True)
+
+	def _snapshots(self) -> Iterable[dict]:
+		"""Yield the snapshot of every live worker, this one included."""
+		if self.directory is None:
+			yield self.snapshot()
+			return
+
+		self._adopt_exited()
+		self.flush()
+		for path in self.directory.glob("*.json"):
+			try:
+				yield json.loads(path.read_text())
+			except (OSError, ValueError):
+				continue
+
+	def render(self) -> str:
+		"""Render the metrics of all workers in the Prometheus text format."""
+		total = Metrics(None, self.flush_interval)
+		gauges: dict[str, list] = {}
+		for snapshot in self._snapshots():
+			total.merge(snapshot)
+			for name, (help_text, value) in snapshot["gauges"].items():
+				gauges.setdefault(name, [help_text, 0])[1] += value
+
+		lines = [
+			"# HELP http_requests_total Requests by method, route and status.",
+			"# TYPE http_requests_total counter",
+		]
+		for (method, route, status), count in sorted(total.requests.items()):
+			labels = _labels(method=method, route=route, status=status)
+			lines.append(f"http_requests_total{{{labels}}} {count}")
+
+		lines += _render_histogram(
+			"http_request_duration_seconds",
+			"Request latency by method and route.",
+			total.request_durations,
+		)
+		lines += _render_histogram(
+			"http_request_db_queries",
+			"Database queries per request by method and route.",
+			total.request_queries,
+		)
+		lines += _render_histogram(
+			"db_query_duration_seconds",
+			"Database query latency by the method and route issuing it.",
+			total.query_durations,
+		)
+		for name, histogram in total.histograms.items():
+			lines += _render_histogram(
+				name,
+				HISTOGRAMS[name][0],
+				{(): histogram},
+				label_names=(),
+			)
+
+		for name, (help_text, value) in sorted(total.counters.items()):
+			lines += [
+				f"# HELP {name} {help_text}",
+				f"# TYPE {name} counter",
+				f"{name} {value}",
+			]
+		for name, (help_text, value) in sorted(gauges.items()):
+			lines += [
+				f"# HELP {name} {help_text}",
+				f"# TYPE {name} gauge",
+				f"{name} {value}",
+			]
+		return "\n".join(lines) + "\n"
+
+
+def _pid_of(path: Path) -> int:
+	"""Return the process ID a snapshot file is named after."""
+	try:
+		return int(path.stem.split("-", 1)[0])
+	except ValueError:
+		return 0
+
+
+def _is_alive(pid: int) -> bool:
+	if pid <= 0:
+		return False
+	try:
+		os.kill(pid, 0)
+	except ProcessLookupError:
+		return False
+	except PermissionError:
+		return True
+	return True
+
+
+def _escape(value: str) -> str:
+	return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+	return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _render_histogram(
+	name: str,
+	help_text: str,
+	histograms: dict[tuple[str, ...], Histogram],
+	label_names: tuple[str, ...] = ("method", "route"),
+) -> list[str]:
+	lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+	for key, histogram in sorted(histograms.items()):
+		labels = _labels(**dict(zip(label_names, key, strict=True)))
+		series = f"{{{labels}}}" if labels else ""
+		bucket_labels = f"{labels}," if labels else ""
+		cumulative = 0
+		for bound, count in zip(
+			(*histogram.buckets, "+Inf"),
+			histogram.counts,
+			strict=True,
+		):
+			cumulative += count
+			lines.append(f'{name}_bucket{{{bucket_labels}le="{bound}"}} {cumulative}')
+		lines.append(f"{name}_sum{series} {histogram.sum}")
+		lines.append(f"{name}_count{series} {cumulative}")
+	return lines
+
+
+def observe_query(duration: float) -> None:
+	"""Attribute a database query to the request being served, if any."""
+	request = current_request.get()
+	if request is not None:
+		request.query_durations.append(duration)
+
+
+class MetricsMiddleware:
+	"""Record the count, status, latency and queries of every HTTP request.
+
+	Requests are labelled with the template of the route that served them
+	(e.g. `/todos/{todo_id}`), so that label cardinality stays bounded.
+	"""
+
+	def __init__(self, app: ASGIApp):
+		self.app = app
+
+	async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+		if scope["type"] != "http":
+			await self.app(scope, receive, send)
+			return
+
+		start = time.perf_counter()
+		status = 500
+		request = RequestMetrics()
+
+		async def send_with_status(message: Message) -> None:
+			nonlocal status
+			if message["type"] == "http.response.start":
+				status = message["status"]
+			await send(message)
+
+		token = current_request.set(request)
+		try:
+			await self.app(scope, receive, send_with_status)
+		finally:
+			current_request.reset(token)
+			route = scope.get("route")
+			metrics.observe_request(
+				scope["method"],
+				getattr(route, "path", UNMATCHED_ROUTE),
+				status,
+				time.perf_counter() - start,
+				request,
+			)
+			metrics.schedule_flush()
+
+
+def metrics_directory(server_pid: int) -> Path | None:
+	"""Return where the workers of the server `server_pid` share snapshots."""
+	if not settings.METRICS_MULTIPROCESS:
+		return None
+	if settings.METRICS_DIR:
+		return Path(settings.METRICS_DIR)
+	return Path(tempfile.gettempdir()) / f"fast-api-template-metrics-{server_pid}"
+
+
+# Only workers given a `METRICS_DIR`, which `app.server` sets for the
+# workers it starts, share snapshots; any other server reports its own
+# process. The snapshot of this worker is written from the application
+# lifespan on shutdown.
+metrics = Metrics(
+	Path(settings.METRICS_DIR)
+	if settings.METRICS_MULTIPROCESS and settings.METRICS_DIR
+	else None,
+	flush_interval=settings.METRICS_FLUSH_SECONDS,
+)
@@ -0,0 +1,164 @@
+import hmac
+import json
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+PROFILE_HEADER = b"x-profile-sql"
+
+
+@dataclass
+class ProfiledQuery:
+	"""One statement executed while profiling a request."""
+
+	statement: str
+	parameters: str
+	duration_ms: float
+
+
+@dataclass
+class SQLProfile:
+	"""Every statement executed while serving one profiled request."""
+
+	method: str
+	path: str
+	budget: int
+	queries: list[ProfiledQuery] = field(default_factory=list)
+
+	@property
+	def duration_ms(self) -> float:
+		return sum(query.duration_ms for query in self.queries)
+
+	@property
+	def over_budget(self) -> bool:
+		return len(self.queries) > self.budget
+
+	def repeated(self) -> dict[str, int]:
+		"""Statements executed more than once, a sign of N+1 queries."""
+		counts = Counter(query.statement for query in self.queries)
+		return {statement: count for statement, count in counts.items() if count > 1}
+
+	def server_timing(self, total_ms: float) -> str:
+		"""Summarize the profile as a `Server-Timing` header value."""
+		metrics = [
+			f'db;dur={self.duration_ms:.2f};desc="{len(self.queries)} queries"',
+			f"total;dur={total_ms:.2f}",
+		]
+		if repeated := self.repeated():
+			metrics.append(f'db-repeated;desc="{len(repeated)} repeated statements"')
+		if self.over_budget:
+			metrics.append(
+				f'db-budget;desc="{len(self.queries)} round trips, '
+				f'budget {self.budget}"',
+			)
+		return ", ".join(metrics)
+
+	def to_dict(self) -> dict[str, Any]:
+		return {
+			"method": self.method,
+			"path": self.path,
+			"query_count": len(self.queries),
+			"duration_ms": round(self.duration_ms, 3),
+			"budget": self.budget,
+			"over_budget": self.over_budget,
+			"repeated": self.repeated(),
+			"queries": [asdict(query) for query in self.queries],
+		}
+
+
+current_profile: ContextVar[SQLProfile | None] = ContextVar(
+	"current_profile",
+	default=None,
+)
+
+
+def _shape(value: Any) -> str:
+	"""Describe parameters by their names and types, never their values."""
+	if isinstance(value, dict):
+		return "{" + ", ".join(f"{k}: {_shape(v)}" for k, v in value.items()) + "}"
+	if isinstance(value, list):
+		return f"{len(value)} x {_shape(value[0])}" if value else "[]"
+	if isinstance(value, tuple):
+		return "(" + ", ".join(_shape(v) for v in value) + ")"
+	return type(value).__name__
+
+
+def profile_query(statement: str, parameters: Any, duration: float) -> None:
+	"""Record a statement if the request being served is profiled."""
+	profile = current_profile.get()
+	if profile is not None:
+		profile.queries.append(
+			ProfiledQuery(
+				statement=statement,
+				parameters=_shape(parameters),
+				duration_ms=round(duration * 1000, 3),
+			),
+		)
+
+
+def _is_profiled(scope: Scope) -> bool:
+	if not settings.SQL_PROFILER_ENABLED or not settings.SQL_PROFILER_TOKEN:
+		return False
+	token = next(
+		(value for name, value in scope["headers"] if name == PROFILE_HEADER),
+		None,
+	)
+	return token is not None and hmac.compare_digest(
+		token,
+		settings.SQL_PROFILER_TOKEN.encode(),
+	)
+
+
+class SQLProfilerMiddleware:
+	"""Profile the SQL of requests carrying the profiler token.
+
+	Requests with an `X-Profile-SQL` header matching `SQL_PROFILER_TOKEN` get
+	a `Server-Timing` header summarizing their queries, including flags for
+	repeated statements and for exceeding `SQL_PROFILER_QUERY_BUDGET` round
+	trips. The full profile, with every statement, its timing and the shape
+	of its parameters, is logged as JSON once the response is sent.
+	"""
+
+	def __init__(self, app: ASGIApp):
+		self.app = app
+
+	async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+		if scope["type"] != "http" or not _is_profiled(scope):
+			await self.app(scope, receive, send)
+			return
+
+		start = time.perf_counter()
+		profile = SQLProfile(
+			method=scope["method"],
+			path=scope["path"],
+			budget=settings.SQL_PROFILER_QUERY_BUDGET,
+		)
+
+		async def send_with_timing(message: Message) -> None:
+			if message["type"] == "http.response.start":
+				total_ms = (time.perf_counter() - start) * 1000
+				headers = list(message.get("headers", []))
+				headers.append(
+					(b"server-timing", profile.server_timing(total_ms).encode()),
+				)
+				message["headers"] = headers
+			await send(message)
+
+		token = current_profile.set(profile)
+		try:
+			await self.app(scope, receive, send_with_timing)
+		finally:
+			current_profile.reset(token)
+			level = (
+				logging.WARNING
+				if profile.over_budget or profile.repeated()
+				else logging.INFO
+			)
+			logging.log(level, "SQL profile: %s", json.dumps(profile.to_dict()))
@@ -1,18 +1,253 @@
-from collections.abc import Callable
-from typing import Any, TypeVar
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Self
 
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi import Request
 
-limiter = Limiter(key_func=get_remote_address)
+from app.core.config import settings
+from app.core.exceptions import RateLimitExceededError
 
-T = TypeVar("T", bound=Callable[..., Any])
+KeyFunc = Callable[[Request], Awaitable[str | None]]
 
+_RATE_PATTERN = re.compile(
+	r"^\s*(\d+)\s*(?:/|per)\s*(second|minute|hour|day)s?\s*$",
+	re.IGNORECASE,
+)
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
 
-def rate_limit(limit_value: str) -> Callable[[T], T]:
-	"""Type-safe decorator to apply rate limiting to FastAPI route handlers."""
 
-	def decorator(func: T) -> T:
-		return limiter.limit(limit_value)(func)  # type: ignore[reportUnknownVariableType]
+@dataclass(frozen=True)
+class Rate:
+	"""A token bucket holding `capacity` tokens that refills in `period` s."""
 
-	return decorator
+	capacity: int
+	period: float
+
+	@classmethod
+	def parse(cls, value: str) -> Self:
+		"""Parse a rate such as `5/hour` or `100 per minute`."""
+		match = _RATE_PATTERN.match(value)
+		if not match:
+			raise ValueError(f"Invalid rate limit: {value!r}")
+		return cls(int(match.group(1)), _PERIODS[match.group(2).lower()])
+
+	@property
+	def refill_per_second(self) -> float:
+		return self.capacity / self.period
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+	allowed: bool
+	retry_after: float = 0.0
+
+
+def _take_token(
+	tokens: float,
+	updated: float,
+	now: float,
+	rate: Rate,
+) -> tuple[float, RateLimitResult]:
+	"""Refill a bucket for the time elapsed since `updated` and take a token.
+
+	Returns:
+		tuple[float, RateLimitResult]: The remaining tokens and the outcome.
+	"""
+	tokens = min(rate.capacity, tokens + (now - updated) * rate.refill_per_second)
+	if tokens >= 1:
+		return tokens - 1, RateLimitResult(allowed=True)
+	return tokens, RateLimitResult(
+		allowed=False,
+		retry_after=(1 - tokens) / rate.refill_per_second,
+	)
+
+
+class RateLimitBackend(ABC):
+	"""Storage of the token buckets.
+
+	A backend for a networked store (e.g. Redis) must apply `_take_token`
+	atomically on the store, for instance in a server-side script.
+	"""
+
+	@abstractmethod
+	async def hit(self, key: str, rate: Rate) -> RateLimitResult:
+		"""Take a token from the bucket of `key`, creating it full if needed."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+	"""Token buckets in process memory, evicting the least recently used.
+
+	Every worker process enforces its own limits with this backend.
+	"""
+
+	def __init__(self, max_keys: int):
+		self.max_keys = max_keys
+		self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+	async def hit(self, key: str, rate: Rate) -> RateLimitResult:
+		now = time.time()
+		tokens, updated = self._buckets.get(key, (rate.capacity, now))
+		tokens, result = _take_token(tokens, updated, now, rate)
+
+		self._buckets[key] = (tokens, now)
+		self._buckets.move_to_end(key)
+		while len(self._buckets) > self.max_keys:
+			self._buckets.popitem(last=False)
+		return result
+
+
+class SharedMemoryRateLimitBackend(RateLimitBackend):
+	"""Token buckets in a memory-mapped file shared by all workers of a host.
+
+	The file is a fixed-size open addressing hash table of `max_keys` slots,
+	so memory is bounded regardless of how many keys are seen. A key probes
+	`PROBES` consecutive slots; when all of them belong to other keys, the
+	least recently updated one is evicted. Every update holds an exclusive
+	`flock` on the file, which takes microseconds, so all processes see a
+	consistent bucket.
+	"""
+
+	# Key hash, tokens and last update time of a bucket.
+	SLOT = struct.Struct("<Qdd")
+	PROBES = 8
+
+	def __init__(self, path: Path, max_keys: int):
+		"""Open or create the shared table.
+
+		Args:
+			path (Path): The file backing the table, ideally on a tmpfs such
+				as `/dev/shm`. Every worker must use the same path.
+			max_keys (int): The number of slots of the table.
+		"""
+		self.path = path
+		self.max_keys = max_keys
+		size = max_keys * self.SLOT.size
+
+		self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+		fcntl.flock(self._fd, fcntl.LOCK_EX)
+		try:
+			if os.fstat(self._fd).st_size != size:
+				os.ftruncate(self._fd, 0)
+				os.ftruncate(self._fd, size)
+		finally:
+			fcntl.flock(self._fd, fcntl.LOCK_UN)
+		self._map = mmap.mmap(self._fd, size)
+
+	@staticmethod
+	def _hash(key: str) -> int:
+		digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+		# Zero marks an empty slot.
+		return int.from_bytes(digest, "little") | 1
+
+	async def hit(self, key: str, rate: Rate) -> RateLimitResult:
+		key_hash = self._hash(key)
+		now = time.time()
+
+		fcntl.flock(self._fd, fcntl.LOCK_EX)
+		try:
+			offset, tokens, updated = self._find_slot(key_hash, rate, now)
+			tokens, result = _take_token(tokens, updated, now, rate)
+			self.SLOT.pack_into(self._map, offset, key_hash, tokens, now)
+		finally:
+			fcntl.flock(self._fd, fcntl.LOCK_UN)
+		return result
+
+	def _find_slot(
+		self,
+		key_hash: int,
+		rate: Rate,
+		now: float,
+	) -> tuple[int, float, float]:
+		"""Return the slot offset and bucket state of `key_hash`."""
+		start = key_hash % self.max_keys
+		victim, victim_updated = -1, float("inf")
+		for probe in range(min(self.PROBES, self.max_keys)):
+			offset = ((start + probe) % self.max_keys) * self.SLOT.size
+			slot_hash, tokens, updated = self.SLOT.unpack_from(self._map, offset)
+			if slot_hash == key_hash:
+				return offset, tokens, updated
+			if slot_hash == 0:
+				return offset, rate.capacity, now
+			if updated < victim_updated:
+				victim, victim_updated = offset, updated
+		return victim, rate.capacity, now
+
+
+@cache
+def get_rate_limit_backend() -> RateLimitBackend:
+	"""Return the backend of every `RateLimit`, creating it on first use."""
+	if settings.RATE_LIMIT_BACKEND == "memory":
+		return MemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+	path = Path(
+		settings.RATE_LIMIT_SHARED_PATH
+		or Path(tempfile.gettempdir()) / "fast-api-template-rate-limit",
+	)
+	try:
+		return SharedMemoryRateLimitBackend(path, max_keys=settings.RATE_LIMIT_MAX_KEYS)
+	except OSError as e:
+		logging.warning(
+			"Cannot open shared rate limit table %s, using memory: %s",
+			path,
+			e,
+		)
+		return MemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+if not settings.FAST_START:
+	get_rate_limit_backend()
+
+
+async def client_ip(request: Request) -> str | None:
+	"""Key requests by the address of the client."""
+	return f"ip:{request.client.host}" if request.client else None
+
+
+class RateLimit:
+	"""FastAPI dependency enforcing a token bucket rate limit.
+
+	Usage:
+		@router.post("/", dependencies=[Depends(RateLimit("5/hour"))])
+
+	Each route and limit has its own buckets. Requests for which `key_func`
+	returns None are keyed by client address instead.
+	"""
+
+	def __init__(self, limit: str, key_func: KeyFunc = client_ip):
+		"""Initialize the rate limit.
+
+		Args:
+			limit (str): The rate, e.g. `5/hour` or `100 per minute`.
+			key_func (KeyFunc): Derives the bucket key from the request.
+		"""
+		self.limit = limit
+		self.rate = Rate.parse(limit)
+		self.key_func = key_func
+
+	async def __call__(self, request: Request) -> None:
+		if not settings.RATE_LIMIT_ENABLED:
+			return
+
+		key = await self.key_func(request) or await client_ip(request)
+		route = request.scope.get("route")
+		scope = getattr(route, "path", request.url.path)
+
+		result = await get_rate_limit_backend().hit(
+			f"{request.method}:{scope}:{self.limit}:{key}",
+			self.rate,
+		)
+		if not result.allowed:
+			raise RateLimitExceededError(result.retry_after)
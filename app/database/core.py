@@ -1,18 +1,30 @@
 import datetime
+import time
 from collections.abc import AsyncGenerator
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Depends
-from sqlalchemy import DateTime, MetaData
+from sqlalchemy import DateTime, MetaData, event, make_url
 from sqlalchemy.ext.asyncio import (
 	AsyncAttrs,
+	AsyncEngine,
 	AsyncSession,
 	async_sessionmaker,
 	create_async_engine,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 
 from app.core.config import settings
+from app.core.lifecycle import lifecycle
+from app.core.metrics import observe_query
+from app.core.profiler import profile_query
+from app.database.pool import (
+	InstrumentedAsyncPool,
+	PoolStats,
+	instrument_pool,
+	pool_metrics,
+)
+from app.database.replica import replica_router
 
 
 class Base(AsyncAttrs, DeclarativeBase):
@@ -31,21 +43,100 @@ class Base(AsyncAttrs, DeclarativeBase):
 	type_annotation_map = {datetime.datetime: DateTime(timezone=True)}
 
 
-engine = create_async_engine(
-	settings.DATABASE_URL,
-	echo=settings.SQLALCHEMY_ECHO,
-)
+def _connect_args(database_url: str) -> dict[str, Any]:
+	"""Driver specific connection arguments for `database_url`."""
+	if make_url(database_url).get_driver_name() == "asyncpg":
+		return {"prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE}
+	return {}
+
+
+def _create_engine(database_url: str) -> AsyncEngine:
+	return create_async_engine(
+		database_url,
+		echo=settings.SQLALCHEMY_ECHO,
+		poolclass=InstrumentedAsyncPool,
+		pool_size=settings.DATABASE_POOL_SIZE,
+		max_overflow=settings.DATABASE_MAX_OVERFLOW,
+		pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+		pool_recycle=settings.DATABASE_POOL_RECYCLE,
+		pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+		connect_args=_connect_args(database_url),
+	)
+
+
+def _instrument_queries(engine: AsyncEngine) -> None:
+	"""Attribute the duration of every query of `engine` to its request.
+
+	Feeds the metrics of every request and the SQL profile of profiled ones.
+	"""
+
+	@event.listens_for(engine.sync_engine, "before_cursor_execute")
+	def _before_execute(conn: Any, *_: Any) -> None:
+		conn.info["query_start"] = time.perf_counter()
+
+	@event.listens_for(engine.sync_engine, "after_cursor_execute")
+	def _after_execute(
+		conn: Any,
+		cursor: Any,
+		statement: str,
+		parameters: Any,
+		*_: Any,
+	) -> None:
+		duration = time.perf_counter() - conn.info.pop("query_start")
+		observe_query(duration)
+		profile_query(statement, parameters, duration)
+
+
+engine = _create_engine(settings.DATABASE_URL)
+instrument_pool(engine)
+_instrument_queries(engine)
 
 async_session_maker = async_sessionmaker(
 	autoflush=False,
 	autocommit=False,
+	# Rows returned by a write stay usable after commit without a reload.
+	expire_on_commit=False,
 	bind=engine,
 )
 
+# Optional read replica for read-only queries, see
+# `app.database.dependencies.get_async_read_db_session`.
+replica_engine = (
+	_create_engine(settings.DATABASE_REPLICA_URL)
+	if settings.DATABASE_REPLICA_URL
+	else None
+)
+if replica_engine is not None:
+	_instrument_queries(replica_engine)
+
+replica_session_maker = (
+	async_sessionmaker(
+		autoflush=False,
+		autocommit=False,
+		expire_on_commit=False,
+		bind=replica_engine,
+	)
+	if replica_engine
+	else None
+)
+
 
 async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
-	async with async_session_maker() as db:
+	async with lifecycle.track(), async_session_maker() as db:
+		db.info["sticky_primary"] = True
 		yield db
 
 
 DBSession = Annotated[AsyncSession, Depends(get_async_db_session)]
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_client_to_primary(session: Session) -> None:
+	"""Keep a client on the primary after it commits, so it reads its writes."""
+	if session.info.get("sticky_primary"):
+		replica_router.record_write(session.info.get("sticky_user"))
+
+
+def get_pool_stats() -> PoolStats:
+	"""Return the current metrics of the engine's connection pool."""
+	return pool_metrics.stats(engine.pool)
@@ -0,0 +1,50 @@
+from collections.abc import AsyncGenerator
+from typing import Annotated
+
+from fastapi import Depends, Request
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.service import CurrentUser
+from app.database.core import DBSession, replica_session_maker
+from app.database.replica import PRIMARY_COOKIE, replica_router
+
+
+async def get_async_read_db_session(
+	request: Request,
+	db: DBSession,
+	current_user: CurrentUser,
+) -> AsyncGenerator[AsyncSession, None]:
+	"""Yield a session for read-only queries.
+
+	Reads are served by the replica when one is configured, unless the user
+	(or, failing that, the client's cookie) committed a write within the
+	sticky window or the replica is unreachable, in which case the request's
+	primary session is reused.
+	"""
+	if replica_session_maker is None:
+		yield db
+		return
+
+	# Commits of the request's primary session pin the user, see
+	# `_pin_client_to_primary`.
+	db.info["sticky_user"] = current_user.user_id
+	if not replica_router.should_use_replica(
+		current_user.user_id,
+		request.cookies.get(PRIMARY_COOKIE),
+	):
+		yield db
+		return
+
+	async with replica_session_maker() as replica_db:
+		try:
+			await replica_db.connection()
+		except (OSError, DBAPIError) as e:
+			replica_router.mark_unavailable(e)
+			yield db
+			return
+
+		yield replica_db
+
+
+ReadDBSession = Annotated[AsyncSession, Depends(get_async_read_db_session)]
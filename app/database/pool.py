@@ -0,0 +1,102 @@
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from app.core.metrics import metrics
+
+
+@dataclass(frozen=True)
+class PoolStats:
+	"""Point-in-time metrics of the database connection pool."""
+
+	size: int
+	checked_out: int
+	idle: int
+	overflow: int
+	connects: int
+	checkouts: int
+	invalidations: int
+	timeouts: int
+	average_wait_seconds: float
+	max_wait_seconds: float
+
+
+class PoolMetrics:
+	"""Counters fed by the engine's pool events and `InstrumentedAsyncPool`.
+
+	The counters live outside the pool itself so that they survive the pool
+	being recreated, e.g. by `engine.dispose()`.
+	"""
+
+	def __init__(self):
+		self.connects = 0
+		self.checkouts = 0
+		self.invalidations = 0
+		self.timeouts = 0
+		self.wait_total = 0.0
+		self.wait_max = 0.0
+
+	def record_wait(self, elapsed: float) -> None:
+		metrics.observe("db_pool_wait_seconds", elapsed)
+		self.wait_total += elapsed
+		self.wait_max = max(self.wait_max, elapsed)
+
+	def stats(self, pool: Any) -> PoolStats:
+		"""Return the current counters together with the state of `pool`."""
+		is_queue_pool = isinstance(pool, AsyncAdaptedQueuePool)
+		return PoolStats(
+			size=pool.size() if is_queue_pool else 0,
+			checked_out=pool.checkedout() if is_queue_pool else 0,
+			idle=pool.checkedin() if is_queue_pool else 0,
+			overflow=max(0, pool.overflow()) if is_queue_pool else 0,
+			connects=self.connects,
+			checkouts=self.checkouts,
+			invalidations=self.invalidations,
+			timeouts=self.timeouts,
+			average_wait_seconds=(
+				self.wait_total / self.checkouts if self.checkouts else 0.0
+			),
+			max_wait_seconds=self.wait_max,
+		)
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+	"""Async queue pool that records how long callers wait for a connection."""
+
+	def connect(self) -> PoolProxiedConnection:
+		start = time.perf_counter()
+		try:
+			return super().connect()
+		except PoolTimeoutError:
+			pool_metrics.timeouts += 1
+			raise
+		finally:
+			pool_metrics.record_wait(time.perf_counter() - start)
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+	"""Feed `pool_metrics` from the pool events of `engine`.
+
+	Listening on the engine rather than on its pool keeps the listeners
+	attached when the pool is recreated.
+	"""
+
+	@event.listens_for(engine.sync_engine, "connect")
+	def _on_connect(*_: Any) -> None:
+		pool_metrics.connects += 1
+
+	@event.listens_for(engine.sync_engine, "checkout")
+	def _on_checkout(*_: Any) -> None:
+		pool_metrics.checkouts += 1
+
+	@event.listens_for(engine.sync_engine, "invalidate")
+	def _on_invalidate(*_: Any) -> None:
+		pool_metrics.invalidations += 1
@@ -0,0 +1,246 @@
+import fcntl
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import tempfile
+import time
+from contextvars import ContextVar
+from functools import cache
+from pathlib import Path
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# The cookie pinning a client to the primary, holding the UNIX time until
+# which its reads must see its last write.
+PRIMARY_COOKIE = "read_primary_until"
+
+# Whether the current request committed a write, see `StickyPrimaryMiddleware`.
+_request_wrote: ContextVar[list[bool] | None] = ContextVar(
+	"request_wrote",
+	default=None,
+)
+
+
+class StickyUsers:
+	"""The times until which users read from the primary, shared by a host.
+
+	Like `SharedMemoryRateLimitBackend`, the file is a fixed-size open
+	addressing hash table of `max_users` slots, so memory is bounded however
+	many users write. A user probes `PROBES` consecutive slots; when all of
+	them belong to other users, the one whose window ends first is replaced.
+	Updates hold an exclusive `flock` on the file.
+	"""
+
+	# User hash and the UNIX time until which the user reads from the primary.
+	SLOT = struct.Struct("<Qd")
+	PROBES = 8
+
+	def __init__(self, path: Path, max_users: int):
+		"""Open or create the shared table.
+
+		Args:
+			path (Path): The file backing the table, ideally on a tmpfs such
+				as `/dev/shm`. Every worker must use the same path.
+			max_users (int): The number of slots of the table.
+		"""
+		self.path = path
+		self.max_users = max_users
+		size = max_users * self.SLOT.size
+
+		self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+		fcntl.flock(self._fd, fcntl.LOCK_EX)
+		try:
+			if os.fstat(self._fd).st_size != size:
+				os.ftruncate(self._fd, 0)
+				os.ftruncate(self._fd, size)
+		finally:
+			fcntl.flock(self._fd, fcntl.LOCK_UN)
+		self._map = mmap.mmap(self._fd, size)
+
+	@staticmethod
+	def _hash(user_id: str) -> int:
+		digest = hashlib.blake2b(user_id.encode(), digest_size=8).digest()
+		# Zero marks an empty slot.
+		return int.from_bytes(digest, "little") | 1
+
+	def pin(self, user_id: str, until: float) -> None:
+		"""Route the reads of `user_id` to the primary until `until`."""
+		user_hash = self._hash(user_id)
+		fcntl.flock(self._fd, fcntl.LOCK_EX)
+		try:
+			self.SLOT.pack_into(self._map, self._find_slot(user_hash), user_hash, until)
+		finally:
+			fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+	def pinned_until(self, user_id: str) -> float:
+		"""Return the UNIX time until which `user_id` reads from the primary."""
+		user_hash = self._hash(user_id)
+		fcntl.flock(self._fd, fcntl.LOCK_SH)
+		try:
+			slot_hash, until = self.SLOT.unpack_from(
+				self._map,
+				self._find_slot(user_hash),
+			)
+		finally:
+			fcntl.flock(self._fd, fcntl.LOCK_UN)
+		return until if slot_hash == user_hash else 0.0
+
+	def _find_slot(self, user_hash: int) -> int:
+		"""Return the slot of `user_hash`, or the one to replace with it."""
+		start = user_hash % self.max_users
+		victim, victim_until = -1, float("inf")
+		for probe in range(min(self.PROBES, self.max_users)):
+			offset = ((start + probe) % self.max_users) * self.SLOT.size
+			slot_hash, until = self.SLOT.unpack_from(self._map, offset)
+			if slot_hash in (user_hash, 0):
+				return offset
+			if until < victim_until:
+				victim, victim_until = offset, until
+		return victim
+
+
+@cache
+def get_sticky_users() -> StickyUsers | None:
+	"""Return the table of users pinned to the primary, opening it on first use.
+
+	Returns:
+		StickyUsers | None: The shared table, or None when it cannot be opened,
+			in which case clients are only pinned by `PRIMARY_COOKIE`.
+	"""
+	path = Path(
+		settings.DATABASE_REPLICA_STICKY_PATH
+		or Path(tempfile.gettempdir()) / "fast-api-template-sticky-primary",
+	)
+	try:
+		return StickyUsers(path, max_users=settings.DATABASE_REPLICA_STICKY_MAX_USERS)
+	except OSError as e:
+		logging.warning(
+			"Cannot open shared sticky primary table %s, using cookies only: %s",
+			path,
+			e,
+		)
+		return None
+
+
+class ReplicaRouter:
+	"""Decides whether a read may be served by the read replica.
+
+	Reads go to the replica unless the client committed a write within the
+	last `sticky_seconds` (so it always reads its own writes) or the replica
+	failed within the last `retry_seconds`. The time of the last write of an
+	authenticated user is kept in `StickyUsers`, so it holds whichever worker
+	of the host serves the next request, for clients without a cookie jar
+	too. It is also sent to the client in a cookie, which covers writes
+	before sign-in and deployments over several hosts.
+	"""
+
+	def __init__(self, sticky_seconds: float, retry_seconds: float):
+		"""Initialize the router.
+
+		Args:
+			sticky_seconds (float): How long a client reads from the primary
+				after committing a write.
+			retry_seconds (float): How long the replica is skipped after it
+				failed.
+		"""
+		self.sticky_seconds = sticky_seconds
+		self.retry_seconds = retry_seconds
+		self._unavailable_until = 0.0
+
+	def record_write(self, user_id: str | None) -> None:
+		"""Pin the client of the current request to the primary.
+
+		Args:
+			user_id (str | None): The authenticated user that wrote, if any.
+		"""
+		if user_id is not None and (sticky_users := get_sticky_users()):
+			sticky_users.pin(user_id, time.time() + self.sticky_seconds)
+		wrote = _request_wrote.get()
+		if wrote is not None:
+			wrote.append(True)
+
+	def should_use_replica(
+		self,
+		user_id: str | None,
+		primary_until: str | None,
+	) -> bool:
+		"""Whether reads may currently be served by the replica.
+
+		Args:
+			user_id (str | None): The authenticated user that reads, if any.
+			primary_until (str | None): The `PRIMARY_COOKIE` sent by the client.
+		"""
+		if time.monotonic() < self._unavailable_until:
+			return False
+		now = time.time()
+		if (
+			user_id is not None
+			and (sticky_users := get_sticky_users())
+			and now < sticky_users.pinned_until(user_id)
+		):
+			return False
+		if primary_until is None:
+			return True
+
+		try:
+			return now >= float(primary_until)
+		except ValueError:
+			return True
+
+	def mark_unavailable(self, error: Exception) -> None:
+		"""Route every read to the primary for the retry window."""
+		logging.warning(
+			"Read replica unavailable, using primary for %ss: %s",
+			self.retry_seconds,
+			error,
+		)
+		self._unavailable_until = time.monotonic() + self.retry_seconds
+
+	def primary_cookie(self) -> bytes:
+		"""Build the `Set-Cookie` value pinning a client for the sticky window."""
+		until = time.time() + self.sticky_seconds
+		return (
+			f"{PRIMARY_COOKIE}={until:.3f}; Max-Age={math.ceil(self.sticky_seconds)}; "
+			"Path=/; HttpOnly; SameSite=Lax"
+		).encode("latin-1")
+
+
+class StickyPrimaryMiddleware:
+	"""Set `PRIMARY_COOKIE` on the responses of requests that committed a write."""
+
+	def __init__(self, app: ASGIApp):
+		self.app = app
+
+	async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+		if scope["type"] != "http":
+			await self.app(scope, receive, send)
+			return
+
+		wrote: list[bool] = []
+		token = _request_wrote.set(wrote)
+
+		async def send_with_cookie(message: Message) -> None:
+			if message["type"] == "http.response.start" and wrote:
+				headers = list(message.get("headers", []))
+				headers.append((b"set-cookie", replica_router.primary_cookie()))
+				message = {**message, "headers": headers}
+			await send(message)
+
+		try:
+			await self.app(scope, receive, send_with_cookie)
+		finally:
+			_request_wrote.reset(token)
+
+
+if settings.DATABASE_REPLICA_URL and not settings.FAST_START:
+	get_sticky_users()
+
+replica_router = ReplicaRouter(
+	sticky_seconds=settings.DATABASE_REPLICA_STICKY_SECONDS,
+	retry_seconds=settings.DATABASE_REPLICA_RETRY_SECONDS,
+)
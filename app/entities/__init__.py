@@ -1,4 +1,18 @@
-from .todo import Priority, Todo
+from .audit_event import AuditEvent
+from .refresh_token import RefreshToken
+from .revoked_token import RevokedToken
+from .todo import SEARCH_CONFIG, Priority, Todo
+from .todo_stats import TodoStats, open_counter
 from .user import User
 
-__all__ = ["Todo", "Priority", "User"]
+__all__ = [
+	"SEARCH_CONFIG",
+	"AuditEvent",
+	"Priority",
+	"RefreshToken",
+	"RevokedToken",
+	"Todo",
+	"TodoStats",
+	"User",
+	"open_counter",
+]
@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.core import Base
+
+
+class AuditEvent(Base):
+	__tablename__ = "audit_events"
+	__table_args__ = (
+		# A user's history, newest first.
+		Index("ix_audit_events_user_id_occurred_at", "user_id", "occurred_at"),
+	)
+
+	# Chosen when the event is recorded, so that a retried write is a no-op.
+	id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+	user_id: Mapped[uuid.UUID] = mapped_column(
+		UUID(as_uuid=True),
+		ForeignKey("users.id"),
+		nullable=False,
+	)
+	# An `AuditEventType`.
+	event: Mapped[str] = mapped_column(String(32), nullable=False)
+	request_id: Mapped[str | None] = mapped_column(String, nullable=True)
+	# Events older than `AUTH_AUDIT_RETENTION_DAYS` are pruned by
+	# `app.auth.prune`.
+	occurred_at: Mapped[datetime] = mapped_column(
+		DateTime(timezone=True),
+		nullable=False,
+		index=True,
+	)
+
+	def __repr__(self):
+		return (
+			f"<AuditEvent(user_id='{self.user_id}', event='{self.event}', "
+			f"occurred_at='{self.occurred_at}')>"
+		)
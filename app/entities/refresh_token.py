@@ -0,0 +1,54 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.core import Base
+
+
+class RefreshToken(Base):
+	__tablename__ = "refresh_tokens"
+
+	# The `jti` claim of the refresh token; the token itself is never stored.
+	jti: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+	user_id: Mapped[uuid.UUID] = mapped_column(
+		UUID(as_uuid=True),
+		ForeignKey("users.id"),
+		nullable=False,
+		index=True,
+	)
+	# Shared by the tokens rotated from the same login, i.e. one session.
+	family_id: Mapped[uuid.UUID] = mapped_column(
+		UUID(as_uuid=True),
+		nullable=False,
+		index=True,
+	)
+	# Expired tokens are pruned by `app.auth.prune`.
+	expires_at: Mapped[datetime] = mapped_column(
+		DateTime(timezone=True),
+		nullable=False,
+		index=True,
+	)
+	used_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+	revoked_at: Mapped[datetime] = mapped_column(
+		DateTime(timezone=True),
+		nullable=True,
+	)
+	# The access token issued along with this refresh token, denylisted when
+	# the session is revoked.
+	access_jti: Mapped[uuid.UUID] = mapped_column(
+		UUID(as_uuid=True),
+		nullable=False,
+	)
+	access_expires_at: Mapped[datetime] = mapped_column(
+		DateTime(timezone=True),
+		nullable=False,
+	)
+
+	def __repr__(self):
+		return (
+			f"<RefreshToken(jti='{self.jti}', user_id='{self.user_id}', "
+			f"family_id='{self.family_id}')>"
+		)
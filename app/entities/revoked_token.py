@@ -0,0 +1,23 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.core import Base
+
+
+class RevokedToken(Base):
+	__tablename__ = "revoked_tokens"
+
+	# The `jti` claim of a revoked access token, kept until the token expires.
+	jti: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+	expires_at: Mapped[datetime] = mapped_column(
+		DateTime(timezone=True),
+		nullable=False,
+		index=True,
+	)
+
+	def __repr__(self):
+		return f"<RevokedToken(jti='{self.jti}', expires_at='{self.expires_at}')>"
@@ -2,12 +2,24 @@ import enum
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+	Boolean,
+	Computed,
+	DateTime,
+	Enum,
+	ForeignKey,
+	Index,
+	String,
+	text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database.core import Base
 
+# The text search configuration of `Todo.search_vector` and of search queries.
+SEARCH_CONFIG = "english"
+
 
 class Priority(enum.Enum):
 	Normal = 0
@@ -19,6 +31,53 @@ class Priority(enum.Enum):
 
 class Todo(Base):
 	__tablename__ = "todos"
+	__table_args__ = (
+		# Serve keyset pagination of a user's todos in each sort order; a
+		# priority filter is an equality prefix of the priority index.
+		Index("ix_todos_user_id_created_at_id", "user_id", "created_at", "id"),
+		Index("ix_todos_user_id_due_date_id", "user_id", "due_date", "id"),
+		Index(
+			"ix_todos_user_id_priority_created_at_id",
+			"user_id",
+			"priority",
+			"created_at",
+			"id",
+		),
+		# The same for open todos, which most lists ask for. Queries must
+		# filter with the literal `NOT is_completed` to match the predicate.
+		# Due date windows are a range of the due date indexes and filter
+		# rows of the others.
+		Index(
+			"ix_todos_open_user_id_created_at_id",
+			"user_id",
+			"created_at",
+			"id",
+			postgresql_where=text("NOT is_completed"),
+		),
+		Index(
+			"ix_todos_open_user_id_due_date_id",
+			"user_id",
+			"due_date",
+			"id",
+			postgresql_where=text("NOT is_completed"),
+		),
+		Index(
+			"ix_todos_open_user_id_priority_created_at_id",
+			"user_id",
+			"priority",
+			"created_at",
+			"id",
+			postgresql_where=text("NOT is_completed"),
+		),
+		# Search a single user's todos: `btree_gin` lets the GIN index carry
+		# `user_id`, so common words do not match every user's todos.
+		Index(
+			"ix_todos_user_id_search_vector",
+			"user_id",
+			"search_vector",
+			postgresql_using="gin",
+		),
+	)
 
 	id: Mapped[uuid.UUID] = mapped_column(
 		UUID(as_uuid=True),
@@ -47,6 +106,12 @@ class Todo(Base):
 		nullable=False,
 		default=Priority.Medium,
 	)
+	# Maintained by Postgres; deferred so that loading a todo never reads it.
+	search_vector: Mapped[str] = mapped_column(
+		TSVECTOR,
+		Computed(f"to_tsvector('{SEARCH_CONFIG}', description)", persisted=True),
+		deferred=True,
+	)
 
 	def __repr__(self):
 		return (
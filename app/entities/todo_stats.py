@@ -0,0 +1,43 @@
+import uuid
+
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.core import Base
+
+from .todo import Priority
+
+
+def open_counter(priority: Priority) -> str:
+	"""Return the name of the column counting the open todos of `priority`."""
+	return f"open_{priority.name.lower()}"
+
+
+def _counter() -> Mapped[int]:
+	return mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+
+class TodoStats(Base):
+	__tablename__ = "todo_stats"
+
+	# Kept up to date by every todo write of the user, in the same transaction.
+	user_id: Mapped[uuid.UUID] = mapped_column(
+		UUID(as_uuid=True),
+		ForeignKey("users.id"),
+		primary_key=True,
+	)
+	total: Mapped[int] = _counter()
+	completed: Mapped[int] = _counter()
+	# One column per `Priority`, named by `open_counter`.
+	open_normal: Mapped[int] = _counter()
+	open_low: Mapped[int] = _counter()
+	open_medium: Mapped[int] = _counter()
+	open_high: Mapped[int] = _counter()
+	open_top: Mapped[int] = _counter()
+
+	def __repr__(self):
+		return (
+			f"<TodoStats(user_id='{self.user_id}', total={self.total}, "
+			f"completed={self.completed})>"
+		)
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import String
+from sqlalchemy import BigInteger, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -20,6 +20,13 @@ class User(Base):
 	first_name: Mapped[str] = mapped_column(String, nullable=False)
 	last_name: Mapped[str] = mapped_column(String, nullable=False)
 	password_hash: Mapped[str] = mapped_column(String, nullable=False)
+	# Bumped by every write to the user's todos; backs their ETags.
+	todos_version: Mapped[int] = mapped_column(
+		BigInteger,
+		nullable=False,
+		default=0,
+		server_default="0",
+	)
 
 	def __repr__(self):
 		return (
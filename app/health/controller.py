@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Response, status
+
+from app.core.lifecycle import lifecycle
+
+router = APIRouter(
+	prefix="/health",
+	tags=["health"],
+)
+
+
+@router.get("/live")
+async def live():
+	return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready(response: Response):
+	if not lifecycle.accepting:
+		response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+		return {"status": "draining" if lifecycle.draining else "warming up"}
+	return {"status": "ok"}
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from datetime import UTC, datetime
+
+from fastapi import FastAPI
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.auth.denylist import token_denylist
+from app.auth.hashing import password_hasher
+from app.auth.models import RegisterUserRequest, Token, TokenData
+from app.core.config import settings
+from app.core.jobs import job_runner
+from app.core.lifecycle import lifecycle
+from app.core.metrics import metrics
+from app.database.core import async_session_maker, engine, replica_engine
+from app.entities import Todo, User
+from app.todos import models as todo_models
+from app.todos.pagination import encode_cursor
+from app.todos.service import TodoService
+from app.users.models import PasswordChangeRequest, UserResponse
+
+# Matches no rows; used to run the hot queries without touching real data.
+WARMUP_ID = uuid.UUID(int=0)
+
+WARMUP_MAX_BACKOFF_SECONDS = 30.0
+
+
+async def _warm_pool(database: AsyncEngine, connections: int) -> None:
+	"""Open `connections` pool connections at once, then return them idle."""
+	async with AsyncExitStack() as stack:
+		opened = await asyncio.gather(
+			*(
+				stack.enter_async_context(database.connect())
+				for _ in range(connections)
+			),
+		)
+		for connection in opened:
+			await connection.execute(text("SELECT 1"))
+
+
+async def _warm_statements() -> None:
+	"""Compile the hot queries into the engine's statement cache.
+
+	Executing them also prepares them on the connection when the driver
+	caches prepared statements, as asyncpg does.
+	"""
+	user = TokenData(user_id=str(WARMUP_ID))
+	async with async_session_maker() as db:
+		todos = TodoService(db, user)
+		await todos.get_todos(settings.TODOS_DEFAULT_PAGE_SIZE)
+		await todos.get_todos(
+			settings.TODOS_DEFAULT_PAGE_SIZE,
+			encode_cursor(datetime.now(UTC), WARMUP_ID),
+		)
+		# The open todos by due date, the list most clients ask for.
+		await todos.get_todos(
+			settings.TODOS_DEFAULT_PAGE_SIZE,
+			filters=todo_models.TodoFilters(
+				is_completed=False,
+				sort=todo_models.TodoSort.due_date,
+			),
+		)
+		# The ETag version and the lookups of a single todo, a profile and a
+		# login, which fail or log a warning for missing rows when run through
+		# the services.
+		await db.execute(
+			select(User.todos_version).where(User.id == WARMUP_ID),
+		)
+		await db.execute(
+			select(Todo).where(Todo.id == WARMUP_ID, Todo.user_id == WARMUP_ID),
+		)
+		await db.execute(select(User).where(User.id == WARMUP_ID))
+		await db.execute(select(User).where(User.email == ""))
+		await db.rollback()
+
+
+def _warm_validators() -> None:
+	"""Run the request and response models once through validation and JSON."""
+	now = datetime.now(UTC)
+	todo = todo_models.TodoResponse(
+		id=WARMUP_ID,
+		description="",
+		due_date=now,
+		is_completed=True,
+		completed_at=now,
+	)
+	todo_models.todo_page_adapter.dump_json(
+		todo_models.TodoPage(items=[todo], next_cursor=None),
+	)
+	todo_models.TodoCreate.model_validate_json('{"description": ""}')
+	todo_models.TodoBulkCreate.model_validate({"todos": [{"description": ""}]})
+	todo_models.TodoBulkIds.model_validate({"ids": [str(WARMUP_ID)]})
+	UserResponse(
+		id=WARMUP_ID,
+		email="warmup@example.com",
+		first_name="",
+		last_name="",
+	).model_dump_json()
+	RegisterUserRequest.model_validate(
+		{
+			"email": "warmup@example.com",
+			"first_name": "Warm",
+			"last_name": "Up",
+			"password": "warmup-password",
+		},
+	)
+	PasswordChangeRequest.model_validate(
+		{
+			"current_password": "warmup-password",
+			"new_password": "warmup-password",
+			"new_password_confirm": "warmup-password",
+		},
+	)
+	Token(access_token="", token_type="bearer", refresh_token="").model_dump_json()
+
+
+async def warm_up() -> None:
+	"""Warm the pools, statement cache and validators, then become ready.
+
+	Database failures are retried with exponential backoff, so a worker
+	started before its database becomes ready once the database is up.
+	"""
+	_warm_validators()
+	delay = 1.0
+	while True:
+		try:
+			await _warm_pool(engine, settings.DATABASE_POOL_WARMUP_CONNECTIONS)
+			if replica_engine is not None:
+				await _warm_pool(
+					replica_engine,
+					settings.DATABASE_POOL_WARMUP_CONNECTIONS,
+				)
+			await _warm_statements()
+			break
+		except Exception as e:
+			logging.warning("Warm-up failed, retrying in %ss: %s", delay, e)
+			await asyncio.sleep(delay)
+			delay = min(delay * 2, WARMUP_MAX_BACKOFF_SECONDS)
+
+	lifecycle.ready = True
+	logging.info("Warm-up complete, ready to serve")
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+	"""Warm up in the background on start-up and drain on shutdown.
+
+	The server accepts connections right away so that liveness checks pass,
+	while readiness is only reported once warm-up has finished. The revoked
+	token denylist is synced and background jobs are run while serving. On
+	SIGTERM the worker reports itself unready at once and keeps serving for
+	`SHUTDOWN_READINESS_DELAY_SECONDS` before the server stops accepting
+	connections and waits up to `SERVER_GRACEFUL_SHUTDOWN_SECONDS` for them.
+	The worker then waits up to `SHUTDOWN_DRAIN_SECONDS` for in-flight
+	database sessions and up to `JOBS_DRAIN_SECONDS` for the queued jobs
+	before closing every pooled connection.
+	"""
+	lifecycle.delay_shutdown(settings.SHUTDOWN_READINESS_DELAY_SECONDS)
+	job_runner.start()
+	denylist_task = asyncio.create_task(
+		token_denylist.run(settings.AUTH_DENYLIST_SYNC_SECONDS),
+	)
+	warm_up_task = None
+	if settings.FAST_START:
+		lifecycle.ready = True
+	else:
+		warm_up_task = asyncio.create_task(warm_up())
+
+	yield
+
+	for task in (warm_up_task, denylist_task):
+		if task is not None:
+			task.cancel()
+			with suppress(asyncio.CancelledError):
+				await task
+
+	if not await lifecycle.drain(settings.SHUTDOWN_DRAIN_SECONDS):
+		logging.warning(
+			"%s database sessions still in flight after %ss, closing anyway",
+			lifecycle.in_flight,
+			settings.SHUTDOWN_DRAIN_SECONDS,
+		)
+	# After the requests, which may still enqueue jobs, and before the
+	# connections the jobs use are closed.
+	if not await job_runner.drain(settings.JOBS_DRAIN_SECONDS):
+		logging.warning(
+			"%s background jobs still queued after %ss, cancelled",
+			job_runner.stats().queue_depth,
+			settings.JOBS_DRAIN_SECONDS,
+		)
+
+	await engine.dispose()
+	if replica_engine is not None:
+		await replica_engine.dispose()
+	await asyncio.to_thread(password_hasher.shutdown)
+	metrics.flush()
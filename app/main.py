@@ -3,9 +3,22 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.api import register_routes
 from app.core.config import settings
-from app.core.logger import LogLevels, configure_logging
+from app.core.jobs import JobMiddleware
+from app.core.logger import LogLevels, RequestIdMiddleware, configure_logging
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.profiler import SQLProfilerMiddleware
+from app.database.replica import StickyPrimaryMiddleware
+from app.lifespan import lifespan
+from app.metrics.service import collect_app_stats
 
-configure_logging(log_level=LogLevels.info)
+configure_logging(
+	log_level=LogLevels.info,
+	json_format=settings.LOG_FORMAT == "json",
+	background=settings.LOG_BACKGROUND,
+	queue_size=settings.LOG_QUEUE_SIZE,
+	rate_limit=settings.LOG_RATE_LIMIT,
+	rate_limit_window=settings.LOG_RATE_LIMIT_WINDOW_SECONDS,
+)
 
 app = FastAPI(
 	title="FastAPI Template",
@@ -13,6 +26,7 @@ app = FastAPI(
 	version="0.1.0",
 	docs_url="/docs",
 	redoc_url="/redoc",
+	lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -21,7 +35,17 @@ app.add_middleware(
 	allow_credentials=True,
 	allow_methods=["*"],
 	allow_headers=["*"],
+	expose_headers=["X-Request-ID"],
 )
+if settings.DATABASE_REPLICA_URL:
+	app.add_middleware(StickyPrimaryMiddleware)
+if settings.SQL_PROFILER_ENABLED:
+	app.add_middleware(SQLProfilerMiddleware)
+if settings.METRICS_ENABLED:
+	metrics.add_collector(collect_app_stats)
+	app.add_middleware(MetricsMiddleware)
+app.add_middleware(JobMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 register_routes(app)
 
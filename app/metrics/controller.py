@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import metrics
+
+router = APIRouter(
+	tags=["metrics"],
+)
+
+
+@router.get(
+	"/metrics",
+	response_class=PlainTextResponse,
+	include_in_schema=False,
+)
+async def get_metrics():
+	# Runs on the event loop, which also updates the counters being rendered.
+	return PlainTextResponse(
+		metrics.render(),
+		media_type="text/plain; version=0.0.4; charset=utf-8",
+	)
@@ -0,0 +1,76 @@
+from collections.abc import Iterable
+from dataclasses import asdict
+from typing import Any
+
+from app.auth.denylist import token_denylist
+from app.auth.hashing import password_hasher
+from app.auth.token_cache import token_cache
+from app.core.cache import cache
+from app.core.jobs import job_runner
+from app.core.metrics import Sample
+from app.database.core import get_pool_stats
+
+
+def _samples(
+	prefix: str,
+	description: str,
+	stats: Any,
+	counters: tuple[str, ...] = (),
+) -> Iterable[Sample]:
+	"""Turn the fields of a stats dataclass into gauges and counters.
+
+	The `counters` fields are totals that only go up, exported with a
+	`_total` suffix and kept after the worker exits. Averages and maxima
+	cannot be summed across workers, so the `*_seconds` fields are left out.
+	The pool wait and the password hashing time are exported as the
+	`db_pool_wait_seconds` and `password_hash_duration_seconds` histograms
+	instead.
+	"""
+	for field, value in asdict(stats).items():
+		if field.endswith("_seconds"):
+			continue
+		help_text = f"{field.replace('_', ' ').capitalize()} of the {description}."
+		if field in counters:
+			yield Sample(f"{prefix}_{field}_total", help_text, value, "counter")
+		else:
+			yield Sample(f"{prefix}_{field}", help_text, value)
+
+
+def collect_app_stats() -> Iterable[Sample]:
+	"""Report the pool, caches, token denylist, password hasher and job runner."""
+	yield from _samples(
+		"db_pool",
+		"database connection pool",
+		get_pool_stats(),
+		counters=("connects", "checkouts", "invalidations", "timeouts"),
+	)
+	yield from _samples(
+		"cache",
+		"response cache",
+		cache.stats(),
+		counters=("hits", "misses", "evictions"),
+	)
+	yield from _samples(
+		"token_cache",
+		"verified token cache",
+		token_cache.stats(),
+		counters=("hits", "misses"),
+	)
+	yield from _samples(
+		"token_denylist",
+		"revoked token denylist",
+		token_denylist.stats(),
+		counters=("syncs", "sync_errors"),
+	)
+	yield from _samples(
+		"password_hasher",
+		"password hasher",
+		password_hasher.stats(),
+		counters=("completed", "rejected"),
+	)
+	yield from _samples(
+		"jobs",
+		"background job runner",
+		job_runner.stats(),
+		counters=("completed", "failed", "retried", "rejected"),
+	)
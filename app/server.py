@@ -0,0 +1,133 @@
+"""Production server entry point.
+
+Run with `python -m app.server`. Unlike `python -m app.main`, which starts a
+single auto-reloading process for development, this starts one worker per
+available CPU with the fastest event loop and HTTP parser installed.
+"""
+
+import importlib.util
+import logging
+import math
+import os
+import shutil
+from pathlib import Path
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.metrics import metrics_directory
+
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_CPU_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_V1_CPU_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+
+def _cgroup_cpu_limit() -> float | None:
+	"""Return the CPU quota of the container, or None if it is unlimited."""
+	try:
+		quota, period = CGROUP_V2_CPU_MAX.read_text().split()
+		return None if quota == "max" else int(quota) / int(period)
+	except (OSError, ValueError):
+		pass
+
+	try:
+		quota = int(CGROUP_V1_CPU_QUOTA.read_text())
+		period = int(CGROUP_V1_CPU_PERIOD.read_text())
+	except (OSError, ValueError):
+		return None
+	return quota / period if quota > 0 and period > 0 else None
+
+
+def available_cpus() -> float:
+	"""The CPUs this process may use, honouring affinity and cgroup limits."""
+	try:
+		cpus: float = len(os.sched_getaffinity(0))
+	except AttributeError:
+		cpus = os.cpu_count() or 1
+
+	limit = _cgroup_cpu_limit()
+	return min(cpus, limit) if limit else cpus
+
+
+def worker_count() -> int:
+	"""Return `SERVER_WORKERS`, or one worker per available CPU if it is 0."""
+	if settings.SERVER_WORKERS > 0:
+		return settings.SERVER_WORKERS
+	return max(1, math.ceil(available_cpus() * settings.SERVER_WORKERS_PER_CPU))
+
+
+def _installed(module: str) -> bool:
+	return importlib.util.find_spec(module) is not None
+
+
+def _clear_metrics(directory: Path | None, *, remove: bool) -> None:
+	"""Delete the metrics snapshots left behind by a previous server."""
+	if directory is None or not directory.exists():
+		return
+	if remove:
+		shutil.rmtree(directory, ignore_errors=True)
+		return
+	for pattern in ("*.json", "*.tmp", "*.exited"):
+		for path in directory.glob(pattern):
+			path.unlink(missing_ok=True)
+
+
+def shutdown_seconds() -> float:
+	"""The longest a worker may take to shut down after SIGTERM."""
+	return (
+		settings.SHUTDOWN_READINESS_DELAY_SECONDS
+		+ settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS
+		+ settings.SHUTDOWN_DRAIN_SECONDS
+		+ settings.JOBS_DRAIN_SECONDS
+	)
+
+
+def main() -> None:
+	workers = worker_count()
+	loop = "uvloop" if _installed("uvloop") else "asyncio"
+	http = "httptools" if _installed("httptools") else "h11"
+	logging.basicConfig(level=logging.INFO)
+	logging.info(
+		"Starting %s workers on %s:%s (loop=%s, http=%s)",
+		workers,
+		settings.SERVER_HOST,
+		settings.SERVER_PORT,
+		loop,
+		http,
+	)
+	if shutdown_seconds() > settings.SHUTDOWN_GRACE_PERIOD_SECONDS:
+		logging.warning(
+			"Shutdown may take %ss, longer than the %ss grace period before "
+			"SIGKILL; lower the shutdown and drain timeouts",
+			shutdown_seconds(),
+			settings.SHUTDOWN_GRACE_PERIOD_SECONDS,
+		)
+
+	# The workers share their metrics snapshots through a directory passed
+	# down in the environment, whose counters start from zero with every
+	# server. A single worker reports its own process.
+	metrics = metrics_directory(os.getpid()) if workers > 1 else None
+	if metrics is not None:
+		os.environ["METRICS_DIR"] = str(metrics)
+		_clear_metrics(metrics, remove=False)
+	uvicorn.run(
+		"app.main:app",
+		host=settings.SERVER_HOST,
+		port=settings.SERVER_PORT,
+		workers=workers,
+		loop=loop,
+		http=http,
+		backlog=settings.SERVER_BACKLOG,
+		timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+		timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+		limit_concurrency=settings.SERVER_LIMIT_CONCURRENCY or None,
+		limit_max_requests=settings.SERVER_LIMIT_MAX_REQUESTS or None,
+		proxy_headers=settings.SERVER_PROXY_HEADERS,
+		forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+		access_log=settings.SERVER_ACCESS_LOG,
+	)
+	_clear_metrics(metrics, remove=not settings.METRICS_DIR)
+
+
+if __name__ == "__main__":
+	main()
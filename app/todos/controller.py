@@ -1,14 +1,20 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
 
+from app.auth.dependencies import current_user_key
+from app.core.conditional import etag_matches, not_modified
+from app.core.config import settings
+from app.core.rate_limiting import RateLimit
 from app.todos import models
-from app.todos.dependencies import get_todo_service
+from app.todos.dependencies import get_todo_filters, get_todo_service
 from app.todos.service import TodoService
 
 router = APIRouter(
 	prefix="/todos",
 	tags=["todos"],
+	dependencies=[Depends(RateLimit(settings.TODOS_RATE_LIMIT, current_user_key))],
 )
 
 
@@ -24,16 +30,146 @@ async def create_todo(
 	return await todo_service.create_todo(todo)
 
 
-@router.get("/", response_model=list[models.TodoResponse])
-async def get_todos(todo_service: TodoService = Depends(get_todo_service)):
-	return await todo_service.get_todos()
+@router.post(
+	"/bulk",
+	response_model=list[models.TodoResponse],
+	status_code=status.HTTP_201_CREATED,
+)
+async def create_todos(
+	bulk_create: models.TodoBulkCreate,
+	todo_service: TodoService = Depends(get_todo_service),
+):
+	return await todo_service.create_todos(bulk_create.todos)
+
+
+@router.patch("/bulk", response_model=models.TodoBulkUpdateResponse)
+async def update_todos(
+	bulk_update: models.TodoBulkUpdate,
+	todo_service: TodoService = Depends(get_todo_service),
+):
+	updated, not_found = await todo_service.update_todos(bulk_update.todos)
+	return {"updated": updated, "not_found": not_found}
+
+
+@router.patch("/bulk/complete", response_model=models.TodoBulkCompleteResponse)
+async def complete_todos(
+	bulk_ids: models.TodoBulkIds,
+	todo_service: TodoService = Depends(get_todo_service),
+):
+	completed, not_found = await todo_service.complete_todos(bulk_ids.ids)
+	return {"completed": completed, "not_found": not_found}
+
+
+@router.delete("/bulk", response_model=models.TodoBulkDeleteResponse)
+async def delete_todos(
+	bulk_ids: models.TodoBulkIds,
+	todo_service: TodoService = Depends(get_todo_service),
+):
+	deleted, not_found = await todo_service.delete_todos(bulk_ids.ids)
+	return {"deleted": deleted, "not_found": not_found}
+
+
+@router.get("/", response_model=models.TodoPage)
+async def get_todos(
+	limit: int = Query(
+		settings.TODOS_DEFAULT_PAGE_SIZE,
+		ge=1,
+		le=settings.TODOS_MAX_PAGE_SIZE,
+	),
+	cursor: str | None = None,
+	filters: models.TodoFilters = Depends(get_todo_filters),
+	if_none_match: str | None = Header(None),
+	todo_service: TodoService = Depends(get_todo_service),
+):
+	version = await todo_service.get_version()
+	etag = todo_service.etag(
+		version,
+		"page",
+		limit,
+		cursor,
+		filters,
+	)
+	if etag_matches(if_none_match, etag):
+		return not_modified(etag)
+
+	return Response(
+		content=await todo_service.get_todos_json(version, limit, cursor, filters),
+		media_type="application/json",
+		headers={"ETag": etag},
+	)
+
+
+@router.get("/search", response_model=models.TodoPage)
+async def search_todos(
+	q: str = Query(..., min_length=1, max_length=256),
+	limit: int = Query(
+		settings.TODOS_DEFAULT_PAGE_SIZE,
+		ge=1,
+		le=settings.TODOS_MAX_PAGE_SIZE,
+	),
+	cursor: str | None = None,
+	if_none_match: str | None = Header(None),
+	todo_service: TodoService = Depends(get_todo_service),
+):
+	version = await todo_service.get_version()
+	etag = todo_service.etag(
+		version,
+		"search",
+		q,
+		limit,
+		cursor,
+	)
+	if etag_matches(if_none_match, etag):
+		return not_modified(etag)
+
+	return Response(
+		content=await todo_service.search_todos_json(version, q, limit, cursor),
+		media_type="application/json",
+		headers={"ETag": etag},
+	)
+
+
+@router.get("/stats", response_model=models.TodoStatsResponse)
+async def get_todo_stats(
+	todo_service: TodoService = Depends(get_todo_service),
+):
+	return await todo_service.get_stats()
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_todos(
+	export_format: models.ExportFormat = Query(
+		models.ExportFormat.ndjson,
+		alias="format",
+	),
+	todo_service: TodoService = Depends(get_todo_service),
+):
+	media_type = (
+		"text/csv"
+		if export_format == models.ExportFormat.csv
+		else "application/x-ndjson"
+	)
+	return StreamingResponse(
+		todo_service.export_todos(export_format),
+		media_type=media_type,
+		headers={
+			"Content-Disposition": f'attachment; filename="todos.{export_format}"',
+		},
+	)
 
 
 @router.get("/{todo_id}", response_model=models.TodoResponse)
 async def get_todo(
+	response: Response,
 	todo_id: UUID,
+	if_none_match: str | None = Header(None),
 	todo_service: TodoService = Depends(get_todo_service),
 ):
+	etag = todo_service.etag(await todo_service.get_version(), todo_id)
+	if etag_matches(if_none_match, etag):
+		return not_modified(etag)
+
+	response.headers["ETag"] = etag
 	return await todo_service.get_todo_by_id(todo_id)
 
 
@@ -41,9 +177,13 @@ async def get_todo(
 async def update_todo(
 	todo_id: UUID,
 	todo_update: models.TodoCreate,
+	if_match: str | None = Header(None),
 	todo_service: TodoService = Depends(get_todo_service),
 ):
-	return await todo_service.update_todo(todo_id, todo_update)
+	expected_version = (
+		todo_service.resolve_if_match(if_match, todo_id) if if_match else None
+	)
+	return await todo_service.update_todo(todo_id, todo_update, expected_version)
 
 
 @router.put("/{todo_id}/complete", response_model=models.TodoResponse)
@@ -1,10 +1,40 @@
+from datetime import datetime
+
+from fastapi import Query
+
 from app.auth.service import CurrentUser
 from app.database.core import DBSession
+from app.database.dependencies import ReadDBSession
+from app.entities import Priority
+from app.todos import models
 from app.todos.service import TodoService
 
 
 def get_todo_service(
 	db: DBSession,
+	read_db: ReadDBSession,
 	current_user: CurrentUser,
 ) -> TodoService:
-	return TodoService(db, current_user)
+	return TodoService(db, current_user, read_db)
+
+
+def get_todo_filters(
+	*,
+	is_completed: bool | None = None,
+	priority: int | None = Query(
+		None,
+		ge=min(p.value for p in Priority),
+		le=max(p.value for p in Priority),
+	),
+	due_before: datetime | None = None,
+	due_after: datetime | None = None,
+	sort: models.TodoSort = models.TodoSort.created,
+) -> models.TodoFilters:
+	# Priorities are given by value, as in todo bodies.
+	return models.TodoFilters(
+		is_completed=is_completed,
+		priority=Priority(priority) if priority is not None else None,
+		due_before=due_before,
+		due_after=due_after,
+		sort=sort,
+	)
@@ -1,8 +1,10 @@
 from datetime import datetime
+from enum import StrEnum
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
+from app.core.config import settings
 from app.entities import Priority
 
 
@@ -22,3 +24,86 @@ class TodoResponse(TodoBase):
 	completed_at: datetime | None = None
 
 	model_config = ConfigDict(from_attributes=True)
+
+
+class TodoPage(BaseModel):
+	items: list[TodoResponse]
+	next_cursor: str | None = None
+
+
+todo_page_adapter = TypeAdapter(TodoPage)
+
+
+class TodoSort(StrEnum):
+	created = "created"
+	due_date = "due_date"
+	priority = "priority"
+
+
+class TodoFilters(BaseModel):
+	"""The filters and sort order of a list of todos.
+
+	`due_after` is inclusive and `due_before` exclusive. Todos are sorted by
+	creation time, by due date with undated todos last, or by priority with
+	the highest, then newest, first.
+	"""
+
+	is_completed: bool | None = None
+	priority: Priority | None = None
+	due_before: datetime | None = None
+	due_after: datetime | None = None
+	sort: TodoSort = TodoSort.created
+
+
+class ExportFormat(StrEnum):
+	ndjson = "ndjson"
+	csv = "csv"
+
+
+class TodoStatsResponse(BaseModel):
+	total: int = 0
+	completed: int = 0
+	open: int = 0
+	overdue: int = 0
+	open_by_priority: dict[Priority, int] = Field(
+		default_factory=lambda: dict.fromkeys(Priority, 0),
+	)
+
+
+class TodoBulkCreate(BaseModel):
+	todos: list[TodoCreate] = Field(
+		...,
+		min_length=1,
+		max_length=settings.TODOS_MAX_BULK_SIZE,
+	)
+
+
+class TodoBulkUpdateItem(TodoCreate):
+	id: UUID
+
+
+class TodoBulkUpdate(BaseModel):
+	todos: list[TodoBulkUpdateItem] = Field(
+		...,
+		min_length=1,
+		max_length=settings.TODOS_MAX_BULK_SIZE,
+	)
+
+
+class TodoBulkIds(BaseModel):
+	ids: list[UUID] = Field(..., min_length=1, max_length=settings.TODOS_MAX_BULK_SIZE)
+
+
+class TodoBulkCompleteResponse(BaseModel):
+	completed: list[TodoResponse]
+	not_found: list[UUID]
+
+
+class TodoBulkUpdateResponse(BaseModel):
+	updated: list[TodoResponse]
+	not_found: list[UUID]
+
+
+class TodoBulkDeleteResponse(BaseModel):
+	deleted: list[UUID]
+	not_found: list[UUID]
@@ -0,0 +1,68 @@
+import base64
+import binascii
+import json
+from collections.abc import Callable
+from datetime import datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from app.core.exceptions import InvalidCursorError
+
+CursorValue = datetime | UUID | Enum | float | int | str | None
+
+
+def _encode_value(value: CursorValue) -> Any:
+	if isinstance(value, datetime):
+		return value.isoformat()
+	if isinstance(value, UUID):
+		return str(value)
+	if isinstance(value, Enum):
+		return value.value
+	return value
+
+
+def encode_cursor(*values: CursorValue) -> str:
+	"""Encode the keyset position of a todo into an opaque cursor.
+
+	Args:
+		*values (CursorValue): The sort keys of the last todo of a page, in
+			sort order, ending with its ID.
+	"""
+	raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+	return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+	cursor: str,
+	*parsers: Callable[[Any], CursorValue],
+) -> tuple[CursorValue, ...]:
+	"""Decode an opaque cursor back into its keyset position.
+
+	Args:
+		cursor (str): The cursor returned with the previous page.
+		*parsers (Callable[[Any], CursorValue]): Parse each sort key, e.g.
+			`datetime.fromisoformat`, `UUID` or an enum. None values are kept
+			as-is.
+
+	Raises:
+		InvalidCursorError: If the cursor was not produced by `encode_cursor`
+			with the same number of sort keys.
+	"""
+	try:
+		padded = cursor + "=" * (-len(cursor) % 4)
+		values = json.loads(base64.urlsafe_b64decode(padded))
+		if not isinstance(values, list) or len(values) != len(parsers):
+			raise InvalidCursorError()
+		return tuple(
+			None if value is None else parse(value)
+			for parse, value in zip(parsers, values, strict=True)
+		)
+	except (
+		AttributeError,
+		binascii.Error,
+		TypeError,
+		UnicodeDecodeError,
+		ValueError,
+	) as e:
+		raise InvalidCursorError() from e
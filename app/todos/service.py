@@ -1,15 +1,155 @@
+import csv
+import io
 import logging
+from collections import Counter
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
-from typing import cast
+from typing import NoReturn, cast
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+	Boolean,
+	DateTime,
+	String,
+	Values,
+	and_,
+	any_,
+	bindparam,
+	case,
+	column,
+	delete,
+	func,
+	insert,
+	or_,
+	select,
+	tuple_,
+	union_all,
+	update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import TokenData
-from app.core.exceptions import TodoCreationError, UserNotFoundError
-from app.entities import Todo
+from app.core.cache import cache
+from app.core.conditional import etag_version, make_etag, parse_etags
+from app.core.config import settings
+from app.core.exceptions import (
+	InvalidCursorError,
+	PreconditionFailedError,
+	TodoCreationError,
+	UserNotFoundError,
+)
+from app.core.lifecycle import lifecycle
+from app.database.core import async_session_maker
+from app.entities import SEARCH_CONFIG, Priority, Todo, TodoStats, User, open_counter
 from app.todos import models
+from app.todos.pagination import decode_cursor, encode_cursor
+from app.todos.stats import COUNTERS, CountedTodo, apply_stats_delta, stats_delta
+
+# Reads select just the columns of `TodoResponse` as plain rows, which skips
+# building ORM objects and tracking them in the identity map.
+RESPONSE_FIELDS = list(models.TodoResponse.model_fields)
+RESPONSE_COLUMNS = [getattr(Todo, field) for field in RESPONSE_FIELDS]
+
+
+def _ids_param(ids: list[UUID]):
+	"""Bind a list of todo IDs as a single array parameter for `= ANY(:ids)`."""
+	return any_(bindparam("ids", ids, type_=ARRAY(PG_UUID(as_uuid=True))))
+
+
+def _filter_clauses(filters: models.TodoFilters) -> list:
+	"""Build the WHERE clauses of the todo filters.
+
+	Completion is matched with a literal rather than a bound parameter, so
+	that Postgres can use the partial indexes on open todos even for generic
+	plans of prepared statements.
+	"""
+	clauses = []
+	if filters.is_completed is not None:
+		completed = Todo.is_completed
+		clauses.append(completed if filters.is_completed else ~completed)
+	if filters.priority is not None:
+		clauses.append(Todo.priority == filters.priority)
+	if filters.due_after is not None:
+		clauses.append(Todo.due_date >= filters.due_after)
+	if filters.due_before is not None:
+		clauses.append(Todo.due_date < filters.due_before)
+	return clauses
+
+
+# Each order ends with the ID so that the keyset is unique. Priority is
+# sorted descending on every key, so that it is a backward scan of an index.
+_ORDER_BY = {
+	models.TodoSort.created: (Todo.created_at, Todo.id),
+	models.TodoSort.due_date: (Todo.due_date.asc().nulls_last(), Todo.id),
+	models.TodoSort.priority: (
+		Todo.priority.desc(),
+		Todo.created_at.desc(),
+		Todo.id.desc(),
+	),
+}
+
+
+def _cursor_of(sort: models.TodoSort, row) -> str:
+	"""Encode the position of the last row of a page in the `sort` order.
+
+	Creation order cursors keep their original `(created_at, id)` form; the
+	others are tagged with the sort, so that a cursor of one order cannot be
+	replayed against another.
+	"""
+	if sort == models.TodoSort.due_date:
+		return encode_cursor(sort, row.due_date, row.id)
+	if sort == models.TodoSort.priority:
+		return encode_cursor(sort, row.priority, row.created_at, row.id)
+	return encode_cursor(row.created_at, row.id)
+
+
+def _after_cursor(sort: models.TodoSort, cursor: str) -> list:
+	"""Build the keyset conditions selecting the rows after `cursor`.
+
+	Each condition is a range of the index serving `sort` and selects rows
+	that all come after those of the previous condition. A position among
+	the todos with a due date is followed by the rest of them and then by
+	the todos without one; a single `OR` of both would not bound the index
+	scan, which would then read every row before the cursor.
+	"""
+	if sort == models.TodoSort.due_date:
+		tag, due_date, todo_id = decode_cursor(
+			cursor,
+			str,
+			datetime.fromisoformat,
+			UUID,
+		)
+		if tag != sort:
+			raise InvalidCursorError()
+		without_due_date = and_(Todo.due_date.is_(None), Todo.id > todo_id)
+		if due_date is None:
+			return [without_due_date]
+		return [
+			tuple_(Todo.due_date, Todo.id) > (due_date, todo_id),
+			Todo.due_date.is_(None),
+		]
+
+	if sort == models.TodoSort.priority:
+		tag, priority, created_at, todo_id = decode_cursor(
+			cursor,
+			str,
+			Priority,
+			datetime.fromisoformat,
+			UUID,
+		)
+		if tag != sort:
+			raise InvalidCursorError()
+		return [
+			tuple_(Todo.priority, Todo.created_at, Todo.id)
+			< (priority, created_at, todo_id),
+		]
+
+	return [
+		tuple_(Todo.created_at, Todo.id)
+		> decode_cursor(cursor, datetime.fromisoformat, UUID),
+	]
 
 
 class TodoService:
@@ -17,17 +157,26 @@ class TodoService:
 
 	Attributes:
 		db (AsyncSession): The database session for performing CRUD operations.
+		read_db (AsyncSession): The database session for read-only queries.
 		current_user (TokenData): The current authenticated user.
 	"""
 
-	def __init__(self, db: AsyncSession, current_user: TokenData):
+	def __init__(
+		self,
+		db: AsyncSession,
+		current_user: TokenData,
+		read_db: AsyncSession | None = None,
+	):
 		"""Initialize the TodoService with a database session and current user.
 
 		Args:
 			db (AsyncSession): The database session.
 			current_user (TokenData): The current authenticated user.
+			read_db (AsyncSession | None): The session for read-only queries,
+				e.g. one bound to a read replica. Defaults to `db`.
 		"""
 		self.db = db
+		self.read_db = read_db or db
 
 		user_id = current_user.get_uuid()
 		if not user_id:
@@ -40,30 +189,452 @@ class TodoService:
 		self,
 		todo: models.TodoCreate,
 	) -> Todo:
-		"""Create a new todo item."""
+		"""Create a new todo item with a single INSERT ... RETURNING."""
 		try:
-			new_todo = Todo(**todo.model_dump())
-			new_todo.user_id = self.user_id
-
-			self.db.add(new_todo)
-			await self.db.commit()
-			await self.db.refresh(new_todo)
+			await self._bump_version()
+			new_todo = (
+				await self.db.scalars(
+					insert(Todo)
+					.values(**todo.model_dump(), user_id=self.user_id)
+					.returning(Todo),
+				)
+			).one()
+			await self._commit_write(stats_delta(added=[new_todo]))
 
 			return new_todo
 		except Exception as e:
-			logging.error(
-				f"Error creating todo for user {self.user_id}: {str(e)}",
-			)
+			logging.error("Error creating todo for user %s: %s", self.user_id, e)
 			raise TodoCreationError(error=str(e))
 
-	async def get_todos(self) -> list[Todo]:
-		"""Retrieve all todo items."""
-		return cast(
-			"list[Todo]",
-			(await self.db.execute(select(Todo).where(Todo.user_id == self.user_id)))
-			.scalars()
-			.all(),
+	async def create_todos(
+		self,
+		todos: list[models.TodoCreate],
+	) -> list[Todo]:
+		"""Create several todo items with a single multi-row INSERT ... RETURNING."""
+		try:
+			await self._bump_version()
+			new_todos = (
+				await self.db.scalars(
+					insert(Todo).returning(Todo, sort_by_parameter_order=True),
+					[{**todo.model_dump(), "user_id": self.user_id} for todo in todos],
+				)
+			).all()
+			await self._commit_write(stats_delta(added=new_todos))
+
+			return cast("list[Todo]", new_todos)
+		except Exception as e:
+			logging.error("Error bulk creating todos for user %s: %s", self.user_id, e)
+			raise TodoCreationError(error=str(e))
+
+	async def complete_todos(
+		self,
+		todo_ids: list[UUID],
+	) -> tuple[list[Todo], list[UUID]]:
+		"""Mark several todo items as completed in a single UPDATE ... RETURNING.
+
+		Only open todos are updated, so the counters know which todos changed.
+		Todos that are already completed are read back as they are, keeping
+		their original completion time.
+
+		Returns:
+			tuple[list[Todo], list[UUID]]: The completed todos and the IDs that do
+				not exist or do not belong to the current user.
+		"""
+		todo_ids = list(dict.fromkeys(todo_ids))
+		await self._bump_version()
+		completed = list(
+			(
+				await self.db.scalars(
+					update(Todo)
+					.where(
+						Todo.id == _ids_param(todo_ids),
+						Todo.user_id == self.user_id,
+						~Todo.is_completed,
+					)
+					.values(is_completed=True, completed_at=datetime.now(UTC))
+					.returning(Todo),
+				)
+			).all(),
+		)
+		if completed:
+			await self._commit_write(
+				stats_delta(
+					added=completed,
+					removed=[
+						CountedTodo(todo.priority, is_completed=False)
+						for todo in completed
+					],
+				),
+			)
+		else:
+			# Nothing changed: release the user's row lock.
+			await self.db.rollback()
+
+		found = {todo.id for todo in completed}
+		if len(found) < len(todo_ids):
+			completed += (
+				await self.db.scalars(
+					select(Todo).where(
+						Todo.id == _ids_param([i for i in todo_ids if i not in found]),
+						Todo.user_id == self.user_id,
+					),
+				)
+			).all()
+			found = {todo.id for todo in completed}
+
+		not_found = [todo_id for todo_id in todo_ids if todo_id not in found]
+		return cast("list[Todo]", completed), not_found
+
+	async def update_todos(
+		self,
+		todos: list[models.TodoBulkUpdateItem],
+	) -> tuple[list[Todo], list[UUID]]:
+		"""Update several todo items in a single UPDATE ... FROM (VALUES ...).
+
+		Each item is applied like `update_todo`: fields left out of an item
+		keep their current value. When an ID appears more than once, its last
+		item wins.
+
+		Returns:
+			tuple[list[Todo], list[UUID]]: The updated todos and the IDs that do
+				not exist or do not belong to the current user.
+		"""
+		items = {todo.id: todo for todo in todos}
+		# Parameters of VALUES are untyped to Postgres, so all but the typed
+		# ID and description are cast where they are used.
+		changes = Values(
+			column("id", PG_UUID(as_uuid=True)),
+			column("description", String()),
+			column("due_date", DateTime(timezone=True)),
+			column("priority", Todo.priority.type),
+			column("set_due_date", Boolean()),
+			column("set_priority", Boolean()),
+			name="changes",
+		).data(
+			[
+				(
+					todo.id,
+					todo.description,
+					todo.due_date,
+					todo.priority,
+					"due_date" in todo.model_fields_set,
+					"priority" in todo.model_fields_set,
+				)
+				for todo in items.values()
+			],
+		)
+
+		await self._bump_version()
+		# The priority before the update, read from the rows locked for it.
+		previous = (
+			select(Todo.id, Todo.priority.label("previous_priority"))
+			.where(Todo.id == _ids_param(list(items)), Todo.user_id == self.user_id)
+			.with_for_update()
+			.subquery()
+		)
+		rows = (
+			await self.db.execute(
+				update(Todo)
+				.where(Todo.id == previous.c.id, Todo.id == changes.c.id)
+				.values(
+					description=changes.c.description,
+					due_date=case(
+						(
+							changes.c.set_due_date.cast(Boolean),
+							changes.c.due_date.cast(DateTime(timezone=True)),
+						),
+						else_=Todo.due_date,
+					),
+					priority=case(
+						(
+							changes.c.set_priority.cast(Boolean),
+							changes.c.priority.cast(Todo.priority.type),
+						),
+						else_=Todo.priority,
+					),
+				)
+				.returning(Todo, previous.c.previous_priority),
+			)
+		).all()
+		if rows:
+			await self._commit_write(
+				stats_delta(
+					added=[todo for todo, _ in rows],
+					removed=[
+						CountedTodo(previous_priority, todo.is_completed)
+						for todo, previous_priority in rows
+					],
+				),
+			)
+		else:
+			# Nothing changed: release the user's row lock.
+			await self.db.rollback()
+
+		updated = {todo.id: todo for todo, _ in rows}
+		return (
+			[updated[todo_id] for todo_id in items if todo_id in updated],
+			[todo_id for todo_id in items if todo_id not in updated],
+		)
+
+	async def delete_todos(
+		self,
+		todo_ids: list[UUID],
+	) -> tuple[list[UUID], list[UUID]]:
+		"""Delete several todo items in a single DELETE ... RETURNING.
+
+		Returns:
+			tuple[list[UUID], list[UUID]]: The deleted IDs and the IDs that do not
+				exist or do not belong to the current user.
+		"""
+		todo_ids = list(dict.fromkeys(todo_ids))
+		await self._bump_version()
+		rows = (
+			await self.db.execute(
+				delete(Todo)
+				.where(
+					Todo.id == _ids_param(todo_ids),
+					Todo.user_id == self.user_id,
+				)
+				.returning(Todo.id, Todo.priority, Todo.is_completed),
+			)
+		).all()
+		if rows:
+			await self._commit_write(
+				stats_delta(
+					removed=[
+						CountedTodo(row.priority, row.is_completed) for row in rows
+					],
+				),
+			)
+		else:
+			# Nothing changed: release the user's row lock.
+			await self.db.rollback()
+
+		deleted = {row.id for row in rows}
+
+		return (
+			[todo_id for todo_id in todo_ids if todo_id in deleted],
+			[todo_id for todo_id in todo_ids if todo_id not in deleted],
+		)
+
+	async def get_todos(
+		self,
+		limit: int,
+		cursor: str | None = None,
+		filters: models.TodoFilters | None = None,
+	) -> models.TodoPage:
+		"""Retrieve a filtered page of todo items in the requested order.
+
+		Pages are addressed by keyset rather than offset so that every page is
+		served by an index on the sort keys at the same cost. See the indexes
+		of `Todo` for which one serves each filter and sort.
+
+		Args:
+			limit (int): The maximum number of todos to return.
+			cursor (str | None): The `next_cursor` of the previous page, if any.
+			filters (TodoFilters | None): The filters and sort order. Defaults
+				to all todos in creation order.
+
+		Returns:
+			TodoPage: The todos and the cursor of the next page, which is None
+				when this is the last page.
+
+		Raises:
+			InvalidCursorError: If the cursor was issued for another sort order.
+		"""
+		filters = filters or models.TodoFilters()
+		query = (
+			select(*RESPONSE_COLUMNS, Todo.created_at)
+			.where(Todo.user_id == self.user_id, *_filter_clauses(filters))
+			.order_by(*_ORDER_BY[filters.sort])
+			.limit(limit + 1)
+		)
+		if cursor:
+			ranges = _after_cursor(filters.sort, cursor)
+			if len(ranges) == 1:
+				query = query.where(ranges[0])
+			else:
+				# One bounded index scan per range, in order.
+				pages = union_all(*(query.where(r) for r in ranges)).subquery()
+				query = (
+					select(pages)
+					.order_by(pages.c.due_date.asc().nulls_last(), pages.c.id)
+					.limit(limit + 1)
+				)
+
+		rows = (await self.read_db.execute(query)).all()
+		next_cursor = None
+		if len(rows) > limit:
+			rows = rows[:limit]
+			next_cursor = _cursor_of(filters.sort, rows[-1])
+
+		return models.TodoPage.model_validate(
+			{"items": rows, "next_cursor": next_cursor},
+			from_attributes=True,
+		)
+
+	async def get_todos_json(
+		self,
+		version: int,
+		limit: int,
+		cursor: str | None = None,
+		filters: models.TodoFilters | None = None,
+	) -> bytes:
+		"""Retrieve a page of todo items as an encoded `TodoPage` JSON body.
+
+		The page is validated once and encoded by a precompiled adapter, so the
+		response can be sent as-is. Encoded pages are cached under the todo
+		version they were read at, so a cached page is only served along with
+		the ETag of that version, even by workers that did not see the write
+		which replaced it.
+
+		Args:
+			version (int): The todo version read for the ETag, see
+				`get_version`.
+			limit (int): The maximum number of todos to return.
+			cursor (str | None): The `next_cursor` of the previous page, if any.
+			filters (TodoFilters | None): The filters and sort order.
+		"""
+		filters = filters or models.TodoFilters()
+		cache_key = await cache.key(
+			self.cache_namespace,
+			version,
+			"page",
+			limit,
+			cursor,
+			filters,
+		)
+		body = await cache.get(cache_key)
+		if body is not None:
+			return body
+
+		body = models.todo_page_adapter.dump_json(
+			await self.get_todos(limit, cursor, filters),
+		)
+		await cache.set(cache_key, body)
+		return body
+
+	async def search_todos(
+		self,
+		search_query: str,
+		limit: int,
+		cursor: str | None = None,
+	) -> models.TodoPage:
+		"""Search the todo items by description, best matches first.
+
+		The query accepts web search syntax (quoted phrases, `or`, `-word`)
+		and is matched against the user's todos through the GIN index on
+		`(user_id, search_vector)`. Pages
+		are addressed by keyset on `(rank, id)`.
+
+		Args:
+			search_query (str): The words to search for.
+			limit (int): The maximum number of todos to return.
+			cursor (str | None): The `next_cursor` of the previous page, if any.
+
+		Returns:
+			TodoPage: The matching todos and the cursor of the next page, which
+				is None when this is the last page.
+		"""
+		ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, search_query)
+		rank = func.ts_rank_cd(Todo.search_vector, ts_query)
+		ranked = rank.label("rank")
+		query = (
+			select(*RESPONSE_COLUMNS, ranked)
+			.where(Todo.user_id == self.user_id, Todo.search_vector.op("@@")(ts_query))
+			.order_by(ranked.desc(), Todo.id)
+			.limit(limit + 1)
+		)
+		if cursor:
+			after_rank, after_id = decode_cursor(cursor, float, UUID)
+			query = query.where(
+				or_(rank < after_rank, and_(rank == after_rank, Todo.id > after_id)),
+			)
+
+		rows = (await self.read_db.execute(query)).all()
+		next_cursor = None
+		if len(rows) > limit:
+			rows = rows[:limit]
+			next_cursor = encode_cursor(rows[-1].rank, rows[-1].id)
+
+		return models.TodoPage.model_validate(
+			{"items": rows, "next_cursor": next_cursor},
+			from_attributes=True,
+		)
+
+	async def search_todos_json(
+		self,
+		version: int,
+		search_query: str,
+		limit: int,
+		cursor: str | None = None,
+	) -> bytes:
+		"""Search the todo items and return an encoded `TodoPage` JSON body.
+
+		Results are cached under the todo version read for the ETag, like
+		pages of `get_todos_json`.
+		"""
+		cache_key = await cache.key(
+			self.cache_namespace,
+			version,
+			"search",
+			limit,
+			cursor,
+			search_query,
+		)
+		body = await cache.get(cache_key)
+		if body is not None:
+			return body
+
+		body = models.todo_page_adapter.dump_json(
+			await self.search_todos(search_query, limit, cursor),
 		)
+		await cache.set(cache_key, body)
+		return body
+
+	async def export_todos(
+		self,
+		export_format: models.ExportFormat,
+	) -> AsyncIterator[str]:
+		"""Stream all todo items of the current user as NDJSON or CSV.
+
+		Rows are read through a server-side cursor in chunks of
+		`TODOS_EXPORT_CHUNK_SIZE` and encoded one chunk at a time, so memory
+		stays flat regardless of how many todos the user has. The stream opens
+		its own session since it outlives the request's dependencies.
+
+		Args:
+			export_format (ExportFormat): The format to encode rows in.
+
+		Yields:
+			str: Encoded chunks of the export.
+		"""
+		buffer = io.StringIO()
+		writer = csv.writer(buffer)
+		if export_format == models.ExportFormat.csv:
+			writer.writerow(RESPONSE_FIELDS)
+			yield buffer.getvalue()
+
+		query = (
+			select(*RESPONSE_COLUMNS)
+			.where(Todo.user_id == self.user_id)
+			.order_by(Todo.created_at, Todo.id)
+			.execution_options(yield_per=settings.TODOS_EXPORT_CHUNK_SIZE)
+		)
+
+		async with lifecycle.track(), async_session_maker() as db:
+			result = await db.stream(query)
+			async for rows in result.partitions():
+				buffer.seek(0)
+				buffer.truncate()
+				for row in rows:
+					todo = models.TodoResponse.model_validate(row, from_attributes=True)
+					if export_format == models.ExportFormat.csv:
+						writer.writerow(todo.model_dump(mode="json").values())
+					else:
+						buffer.write(todo.model_dump_json())
+						buffer.write("\n")
+				yield buffer.getvalue()
 
 	async def get_todo_by_id(
 		self,
@@ -71,14 +642,13 @@ class TodoService:
 	) -> Todo:
 		"""Retrieve a specific todo item by its ID."""
 		todo = (
-			await self.db.execute(
+			await self.read_db.execute(
 				select(Todo).where(Todo.id == todo_id, Todo.user_id == self.user_id),
 			)
 		).scalar_one_or_none()
 
 		if not todo:
-			logging.warning(f"Todo with id {todo_id} not found USER:{self.user_id}.")
-			raise UserNotFoundError(self.user_id)
+			self._raise_not_found(todo_id)
 
 		return todo
 
@@ -86,40 +656,236 @@ class TodoService:
 		self,
 		todo_id: UUID,
 		todo_update: models.TodoCreate,
+		expected_version: int | None = None,
 	) -> Todo:
-		"""Update an existing todo item for the current user."""
-		todo = await self.get_todo_by_id(todo_id)
-		todo_data = todo_update.model_dump(exclude_unset=True)
+		"""Update an existing todo item for the current user.
 
-		for key, value in todo_data.items():
-			if hasattr(todo, key):
-				setattr(todo, key, value)
+		The ownership check and the update happen in a single
+		UPDATE ... RETURNING round trip.
 
-		await self.db.commit()
-		await self.db.refresh(todo)
+		Args:
+			todo_id (UUID): The ID of the todo to update.
+			todo_update (TodoCreate): The new values of the todo.
+			expected_version (int | None): The todo version the client last saw,
+				for optimistic concurrency control (see `resolve_if_match`).
+		"""
+		await self._bump_version(expected_version)
+		# The priority before the update, read from the row locked for it.
+		previous = (
+			select(Todo.id, Todo.priority.label("previous_priority"))
+			.where(Todo.id == todo_id, Todo.user_id == self.user_id)
+			.with_for_update()
+			.subquery()
+		)
+		row = (
+			await self.db.execute(
+				update(Todo)
+				.where(Todo.id == previous.c.id)
+				.values(**todo_update.model_dump(exclude_unset=True))
+				.returning(Todo, previous.c.previous_priority),
+			)
+		).one_or_none()
+		if not row:
+			self._raise_not_found(todo_id)
+
+		todo, previous_priority = row
+		await self._commit_write(
+			stats_delta(
+				added=[todo],
+				removed=[CountedTodo(previous_priority, todo.is_completed)],
+			),
+		)
 		return todo
 
 	async def complete_todo(
 		self,
 		todo_id: UUID,
 	) -> Todo:
-		"""Mark a specific todo item as completed."""
-		todo = await self.get_todo_by_id(todo_id)
-		if todo.is_completed:
-			return todo
+		"""Mark a specific todo item as completed.
 
-		todo.is_completed = True
-		todo.completed_at = datetime.now(UTC)
+		A todo that is already completed is returned as it is, keeping its
+		original completion time.
+		"""
+		await self._bump_version()
+		todo = await self.db.scalar(
+			update(Todo)
+			.where(
+				Todo.id == todo_id,
+				Todo.user_id == self.user_id,
+				~Todo.is_completed,
+			)
+			.values(is_completed=True, completed_at=datetime.now(UTC))
+			.returning(Todo),
+		)
+		if todo:
+			await self._commit_write(
+				stats_delta(
+					added=[todo],
+					removed=[CountedTodo(todo.priority, is_completed=False)],
+				),
+			)
+			return todo
 
-		await self.db.commit()
-		await self.db.refresh(todo)
+		# Nothing changed: release the user's row lock.
+		await self.db.rollback()
+		todo = await self.db.scalar(
+			select(Todo).where(Todo.id == todo_id, Todo.user_id == self.user_id),
+		)
+		if not todo:
+			self._raise_not_found(todo_id)
 		return todo
 
 	async def delete_todo(
 		self,
 		todo_id: UUID,
 	) -> None:
-		"""Delete a specific todo item by its ID."""
-		todo = await self.get_todo_by_id(todo_id)
-		await self.db.delete(todo)
+		"""Delete a specific todo item by its ID with a single DELETE ... RETURNING."""
+		await self._bump_version()
+		deleted = (
+			await self.db.execute(
+				delete(Todo)
+				.where(Todo.id == todo_id, Todo.user_id == self.user_id)
+				.returning(Todo.priority, Todo.is_completed),
+			)
+		).one_or_none()
+		if not deleted:
+			self._raise_not_found(todo_id)
+
+		await self._commit_write(
+			stats_delta(removed=[CountedTodo(deleted.priority, deleted.is_completed)]),
+		)
+
+	@property
+	def cache_namespace(self) -> str:
+		"""The cache namespace holding the current user's todo reads."""
+		return f"todos:{self.user_id}"
+
+	async def get_version(self) -> int:
+		"""Return the current user's todo version, bumped by every write.
+
+		Read it before the todos it describes: a write in between then yields
+		an outdated version for fresh data, never the reverse.
+		"""
+		version = await self.read_db.scalar(
+			select(User.todos_version).where(User.id == self.user_id),
+		)
+		if version is None:
+			raise UserNotFoundError(self.user_id)
+		return version
+
+	async def get_stats(self) -> models.TodoStatsResponse:
+		"""Return the counts of the current user's todos.
+
+		The counters are read from the user's `TodoStats` row. Overdue todos
+		depend on the clock rather than on writes, so they are counted in the
+		same query from the partial index of open todos by due date, at a cost
+		bounded by the number of overdue todos.
+		"""
+		overdue = (
+			select(func.count())
+			.where(
+				Todo.user_id == self.user_id,
+				~Todo.is_completed,
+				Todo.due_date < func.now(),
+			)
+			.scalar_subquery()
+		)
+		row = (
+			await self.read_db.execute(
+				select(
+					*(getattr(TodoStats, counter) for counter in COUNTERS),
+					overdue.label("overdue"),
+				).where(TodoStats.user_id == self.user_id),
+			)
+		).one_or_none()
+		if row is None:
+			# No todo was ever written for the user.
+			return models.TodoStatsResponse()
+
+		return models.TodoStatsResponse(
+			total=row.total,
+			completed=row.completed,
+			open=row.total - row.completed,
+			overdue=row.overdue,
+			open_by_priority={
+				priority: getattr(row, open_counter(priority)) for priority in Priority
+			},
+		)
+
+	def etag(self, version: int, *parts: object) -> str:
+		"""Build the ETag of a todo representation at the given version."""
+		return make_etag(version, self.user_id, *parts)
+
+	def resolve_if_match(self, if_match: str, todo_id: UUID) -> int | None:
+		"""Return the version an `If-Match` header requires for a todo.
+
+		Returns:
+			int | None: The required version, or None for `If-Match: *`.
+
+		Raises:
+			PreconditionFailedError: If no tag in the header is a valid ETag of
+				the todo.
+		"""
+		tags = parse_etags(if_match)
+		if "*" in tags:
+			return None
+
+		for tag in tags:
+			version = etag_version(tag)
+			if version is not None and self.etag(version, todo_id) == tag:
+				return version
+
+		raise PreconditionFailedError()
+
+	async def _bump_version(self, expected_version: int | None = None) -> int:
+		"""Increment the current user's todo version within the transaction.
+
+		Every write calls this before touching any todo, so that the lock on
+		the user's row serializes the writes of a user and concurrent writes
+		lock the user, todo and counters rows in the same order. A write that
+		changes nothing is not committed, which discards the bump.
+
+		Args:
+			expected_version (int | None): When given, only bump if the version
+				still has this value; the row lock held until commit makes the
+				check and the write that follows atomic.
+
+		Raises:
+			PreconditionFailedError: If the version differs from the expected one.
+		"""
+		query = (
+			update(User)
+			.where(User.id == self.user_id)
+			.values(todos_version=User.todos_version + 1)
+			.returning(User.todos_version)
+		)
+		if expected_version is not None:
+			query = query.where(User.todos_version == expected_version)
+
+		version = await self.db.scalar(query)
+		if version is None:
+			if expected_version is not None:
+				raise PreconditionFailedError()
+			raise UserNotFoundError(self.user_id)
+		return version
+
+	async def _commit_write(self, delta: Counter[str]) -> None:
+		"""Update the counters and commit a write begun by `_bump_version`.
+
+		The cached reads of the user are dropped once committed.
+
+		Args:
+			delta (Counter[str]): The change of the counters, see `stats_delta`.
+		"""
+		await apply_stats_delta(self.db, self.user_id, delta)
 		await self.db.commit()
+		await self._invalidate_cache()
+
+	async def _invalidate_cache(self) -> None:
+		"""Drop the cached reads of the current user after a write."""
+		await cache.invalidate(self.cache_namespace)
+
+	def _raise_not_found(self, todo_id: UUID) -> NoReturn:
+		"""Log and raise the error for a todo the current user does not own."""
+		logging.warning("Todo with id %s not found USER:%s.", todo_id, self.user_id)
+		raise UserNotFoundError(self.user_id)
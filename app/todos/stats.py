@@ -0,0 +1,153 @@
+"""Per-user todo counters and their reconciliation.
+
+Usage:
+	python -m app.todos.stats --batch-size 1000
+
+Rebuilds the counters of every user from the todos, for instance after a
+bulk import that bypassed `TodoService` or to repair drift.
+"""
+
+import argparse
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import Iterable
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.core import async_session_maker
+from app.entities import Priority, Todo, TodoStats, User, open_counter
+
+COUNTERS = ["total", "completed", *(open_counter(p) for p in Priority)]
+
+
+class CountedTodo(NamedTuple):
+	"""The fields of a todo that decide which counters it adds to."""
+
+	priority: Priority
+	is_completed: bool
+
+
+def stats_delta(
+	added: Iterable[CountedTodo | Todo] = (),
+	removed: Iterable[CountedTodo | Todo] = (),
+) -> Counter[str]:
+	"""Count how a write changes the counters.
+
+	Args:
+		added (Iterable): The todos created, or the new state of updated todos.
+		removed (Iterable): The todos deleted, or the previous state of
+			updated todos.
+
+	Returns:
+		Counter[str]: The change of each counter column, which may be negative.
+	"""
+	delta: Counter[str] = Counter()
+	for sign, todos in ((1, added), (-1, removed)):
+		for todo in todos:
+			delta["total"] += sign
+			if todo.is_completed:
+				delta["completed"] += sign
+			else:
+				delta[open_counter(todo.priority)] += sign
+	return delta
+
+
+async def apply_stats_delta(
+	db: AsyncSession,
+	user_id: UUID,
+	delta: Counter[str],
+) -> None:
+	"""Add `delta` to the counters of a user within the current transaction.
+
+	The counters row is created on the first write of the user.
+	"""
+	delta = Counter({counter: n for counter, n in delta.items() if n})
+	if not delta:
+		return
+
+	query = insert(TodoStats).values(user_id=user_id, **delta)
+	await db.execute(
+		query.on_conflict_do_update(
+			index_elements=[TodoStats.user_id],
+			set_={
+				counter: getattr(TodoStats, counter) + query.excluded[counter]
+				for counter in delta
+			},
+		),
+	)
+
+
+def _reconcile_query(first: UUID | None, last: UUID):
+	"""Build the upsert of the counters of the users in `(first, last]`."""
+	counts = [
+		func.count(Todo.id),
+		func.count(Todo.id).filter(Todo.is_completed),
+		*(
+			func.count(Todo.id).filter(~Todo.is_completed, Todo.priority == priority)
+			for priority in Priority
+		),
+	]
+	users = select(User.id, *counts).outerjoin(Todo, Todo.user_id == User.id)
+	if first is not None:
+		users = users.where(User.id > first)
+
+	query = insert(TodoStats).from_select(
+		["user_id", *COUNTERS],
+		users.where(User.id <= last).group_by(User.id),
+	)
+	return query.on_conflict_do_update(
+		index_elements=[TodoStats.user_id],
+		set_={counter: query.excluded[counter] for counter in COUNTERS},
+	)
+
+
+async def reconcile_todo_stats(batch_size: int) -> int:
+	"""Rebuild the counters of every user with one `GROUP BY` per batch.
+
+	Each batch first locks its users' rows, which every todo write also
+	locks before it updates the counters. Writes committed before the lock
+	are then counted by the `GROUP BY`, and writes waiting on it apply their
+	change on top of the rebuilt counters, so no write is lost or counted
+	twice.
+
+	Args:
+		batch_size (int): The number of users rebuilt per transaction.
+
+	Returns:
+		int: The number of users whose counters were rebuilt.
+	"""
+	reconciled = 0
+	after = None
+	while True:
+		async with async_session_maker() as db:
+			users = select(User.id).order_by(User.id).limit(batch_size)
+			if after is not None:
+				users = users.where(User.id > after)
+			user_ids = (await db.scalars(users.with_for_update())).all()
+			if not user_ids:
+				return reconciled
+
+			await db.execute(_reconcile_query(after, user_ids[-1]))
+			await db.commit()
+
+		reconciled += len(user_ids)
+		after = user_ids[-1]
+		logging.info("Reconciled the todo stats of %s users", reconciled)
+
+
+def main(argv: list[str] | None = None) -> None:
+	parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+	parser.add_argument("--batch-size", type=int, default=1000)
+	args = parser.parse_args(argv)
+
+	logging.basicConfig(level=logging.INFO)
+	asyncio.run(reconcile_todo_stats(args.batch_size))
+
+
+if __name__ == "__main__":
+	main()
@@ -14,7 +14,7 @@ router = APIRouter(
 async def get_current_user(
 	user_service: UserService = Depends(get_user_service),
 ):
-	return await user_service.get_user_by_id()
+	return await user_service.get_profile()
 
 
 @router.put("/change-password", status_code=status.HTTP_200_OK)
@@ -1,7 +1,12 @@
 from app.auth.service import CurrentUser
 from app.database.core import DBSession
+from app.database.dependencies import ReadDBSession
 from app.users.service import UserService
 
 
-def get_user_service(db: DBSession, current_user: CurrentUser) -> UserService:
-	return UserService(db, current_user)
+def get_user_service(
+	db: DBSession,
+	read_db: ReadDBSession,
+	current_user: CurrentUser,
+) -> UserService:
+	return UserService(db, current_user, read_db)
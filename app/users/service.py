@@ -3,7 +3,9 @@ import logging
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.audit import AuditEventType, record_event
 from app.auth.service import AuthService, CurrentUser
+from app.core.cache import cache
 from app.core.exceptions import (
 	InvalidPasswordError,
 	PasswordMismatchError,
@@ -16,14 +18,22 @@ from app.users import models
 class UserService:
 	"""Service class for managing user operations."""
 
-	def __init__(self, db: AsyncSession, current_user: CurrentUser):
+	def __init__(
+		self,
+		db: AsyncSession,
+		current_user: CurrentUser,
+		read_db: AsyncSession | None = None,
+	):
 		"""Initialize the UserService with a database session.
 
 		Args:
 			db (AsyncSession): The database session.
 			current_user (TokenData): The current authenticated user.
+			read_db (AsyncSession | None): The session for read-only queries,
+				e.g. one bound to a read replica. Defaults to `db`.
 		"""
 		self.db = db
+		self.read_db = read_db or db
 
 		user_id = current_user.get_uuid()
 		if not user_id:
@@ -31,52 +41,82 @@ class UserService:
 			raise UserNotFoundError()
 		self.user_id = user_id
 
-	async def get_user_by_id(self) -> User:
-		"""Fetch a user by their ID."""
+	@property
+	def cache_namespace(self) -> str:
+		"""The cache namespace holding the current user's profile reads."""
+		return f"users:{self.user_id}"
+
+	async def get_user_by_id(self, db: AsyncSession | None = None) -> User:
+		"""Fetch a user by their ID.
+
+		Args:
+			db (AsyncSession | None): The session to load the user with. Defaults
+				to the read-only session; pass the primary one to modify the user.
+		"""
+		db = db or self.read_db
 		user = (
-			await self.db.execute(select(User).where(User.id == self.user_id))
+			await db.execute(select(User).where(User.id == self.user_id))
 		).scalar_one_or_none()
 
 		if not user:
-			logging.warning(f"User with id {self.user_id} not found.")
+			logging.warning("User with id %s not found.", self.user_id)
 			raise UserNotFoundError(self.user_id)
 
 		return user
 
+	async def get_profile(self) -> models.UserResponse:
+		"""Fetch the current user's profile, cached until their next change."""
+		cache_key = await cache.key(self.cache_namespace, "profile")
+		profile = await cache.get(cache_key)
+		if profile is not None:
+			return profile
+
+		profile = models.UserResponse.model_validate(
+			await self.get_user_by_id(),
+			from_attributes=True,
+		)
+		await cache.set(cache_key, profile)
+		return profile
+
 	async def change_password(
 		self,
 		password_change: models.PasswordChangeRequest,
 	) -> None:
 		"""Change the password for a user after verifying the current password."""
 		try:
-			user = await self.get_user_by_id()
+			user = await self.get_user_by_id(self.db)
 
 			# Verify current password.
-			if not AuthService.verify_password(
+			if not await AuthService.verify_password(
 				password_change.current_password,
 				user.password_hash,
 			):
 				logging.warning(
-					f"Operation failed for {self.user_id}: incorrect current password.",
+					"Operation failed for %s: incorrect current password.",
+					self.user_id,
 				)
 				raise InvalidPasswordError()
 
 			# Verify new password match.
 			if password_change.new_password != password_change.new_password_confirm:
-				logging.warning(
-					f"Password mismatch for user: {self.user_id}",
-				)
+				logging.warning("Password mismatch for user: %s", self.user_id)
 				raise PasswordMismatchError()
 
 			# Update password.
-			user.password_hash = AuthService.get_password_hash(
+			user.password_hash = await AuthService.get_password_hash(
 				password_change.new_password,
 			)
+			# Sign out every session, which may hold the old password.
+			await AuthService(self.db).revoke_user_sessions(self.user_id)
 			await self.db.commit()
-			logging.info(f"Successfully changed password for user ID: {self.user_id}")
+			await cache.invalidate(self.cache_namespace)
+			record_event(self.user_id, AuditEventType.password_changed)
+			logging.info("Successfully changed password for user ID: %s", self.user_id)
 
 		except Exception as e:
 			logging.error(
-				f"Error during password change for user {self.user_id}: {str(e)}",
+				"Error during password change for user %s: %s",
+				self.user_id,
+				e,
 			)
 			raise
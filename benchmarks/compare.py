@@ -0,0 +1,75 @@
+"""Compare two benchmark reports and fail on latency regressions.
+
+Usage:
+	python -m benchmarks.compare baseline.json current.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+
+def _key(result: dict[str, Any]) -> tuple[str, int | None]:
+	return result["scenario"], result.get("todos")
+
+
+def compare(
+	baseline: dict[str, Any],
+	current: dict[str, Any],
+	threshold: float,
+	metric: str = "p95",
+) -> list[str]:
+	"""List the scenarios whose `metric` latency grew by more than `threshold`.
+
+	Args:
+		baseline (dict[str, Any]): The report to compare against.
+		current (dict[str, Any]): The report of the change under test.
+		threshold (float): The tolerated relative slowdown, e.g. 0.1 for 10%.
+		metric (str): The latency percentile to compare.
+
+	Returns:
+		list[str]: A description of every regression.
+	"""
+	previous = {_key(result): result for result in baseline["results"]}
+	regressions = []
+	for result in current["results"]:
+		before = previous.get(_key(result))
+		if before is None:
+			continue
+
+		old = before["latency_ms"][metric]
+		new = result["latency_ms"][metric]
+		change = (new - old) / old if old else 0.0
+		scenario, todos = _key(result)
+		line = (
+			f"{scenario} ({todos or '-'} todos): {metric} {old} ms -> {new} ms "
+			f"({change:+.1%})"
+		)
+		print(line, file=sys.stderr)
+		if change > threshold:
+			regressions.append(line)
+	return regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+	parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+	parser.add_argument("baseline", type=Path)
+	parser.add_argument("current", type=Path)
+	parser.add_argument("--threshold", type=float, default=0.1)
+	parser.add_argument("--metric", choices=["p50", "p95", "p99"], default="p95")
+	args = parser.parse_args(argv)
+
+	regressions = compare(
+		json.loads(args.baseline.read_text()),
+		json.loads(args.current.read_text()),
+		args.threshold,
+		args.metric,
+	)
+	if regressions:
+		sys.exit("Regressions:\n" + "\n".join(regressions))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,103 @@
+"""Check that importing `app.main` stays within an import-time budget.
+
+Usage:
+	python -m benchmarks.import_time --budget-ms 1500 --runs 5 --fast-start
+
+Imports `app.main` in fresh interpreters under `python -X importtime`,
+prints the slowest modules of the median run and exits non-zero when the
+median total exceeds the budget.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# "import time: self [us] | cumulative | imported package"
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure_once(module: str, env: dict[str, str]) -> list[tuple[str, int, int]]:
+	"""Import `module` in a fresh interpreter.
+
+	Returns:
+		list[tuple[str, int, int]]: The name, self and cumulative microseconds
+			of every module imported.
+	"""
+	completed = subprocess.run(
+		[sys.executable, "-X", "importtime", "-c", f"import {module}"],
+		capture_output=True,
+		check=True,
+		env=env,
+		text=True,
+	)
+	modules = []
+	for line in completed.stderr.splitlines():
+		if match := _LINE.match(line):
+			modules.append((match.group(4), int(match.group(1)), int(match.group(2))))
+	return modules
+
+
+def main(argv: list[str] | None = None) -> None:
+	parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+	parser.add_argument("--module", default="app.main")
+	parser.add_argument("--budget-ms", type=float, default=1500.0)
+	parser.add_argument("--runs", type=int, default=5)
+	parser.add_argument("--top", type=int, default=15)
+	parser.add_argument(
+		"--fast-start",
+		action="store_true",
+		help="Measure with FAST_START=true.",
+	)
+	parser.add_argument("--output", type=Path, help="Write the report as JSON.")
+	args = parser.parse_args(argv)
+
+	env = dict(os.environ)
+	if args.fast_start:
+		env["FAST_START"] = "true"
+
+	runs = [measure_once(args.module, env) for _ in range(args.runs)]
+	totals = [
+		next(cumulative for name, _, cumulative in run if name == args.module)
+		for run in runs
+	]
+	median_ms = statistics.median(totals) / 1000
+	median_run = runs[totals.index(sorted(totals)[len(totals) // 2])]
+
+	slowest = sorted(median_run, key=lambda module: module[1], reverse=True)
+	print(f"{'module':<48} {'self ms':>9} {'cumul. ms':>10}")
+	for name, self_us, cumulative_us in slowest[: args.top]:
+		print(f"{name:<48} {self_us / 1000:>9.1f} {cumulative_us / 1000:>10.1f}")
+	print(
+		f"\n{args.module}: median {median_ms:.1f} ms over {args.runs} runs, "
+		f"budget {args.budget_ms:.0f} ms",
+	)
+
+	if args.output:
+		args.output.write_text(
+			json.dumps(
+				{
+					"module": args.module,
+					"fast_start": args.fast_start,
+					"runs_ms": [total / 1000 for total in totals],
+					"median_ms": median_ms,
+					"budget_ms": args.budget_ms,
+					"slowest": [
+						{"module": name, "self_ms": s / 1000, "cumulative_ms": c / 1000}
+						for name, s, c in slowest[: args.top]
+					],
+				},
+				indent=2,
+			),
+		)
+
+	if median_ms > args.budget_ms:
+		sys.exit(f"Import time {median_ms:.1f} ms exceeds {args.budget_ms:.0f} ms.")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,120 @@
+"""Calibrate the bcrypt cost to a password hashing latency budget.
+
+Usage:
+	python -m benchmarks.password_hash --budget-ms 250 --concurrency 8
+
+Hashes on this machine at increasing costs, with as many concurrent hashes
+as the hashing threads of all server workers together, and recommends the
+highest `PASSWORD_HASH_ROUNDS` whose median hash time fits the budget. Run
+it on the deployment hardware with the server's settings: every extra
+round doubles the time. Stored hashes move to the new cost as their users
+log in.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# The lowest cost bcrypt accepts.
+MIN_ROUNDS = 4
+# The lowest cost OWASP recommends, the default lower end of the search.
+RECOMMENDED_MIN_ROUNDS = 10
+
+
+def measure(rounds: int, samples: int, concurrency: int) -> float:
+	"""Return the median milliseconds of one hash at `rounds`.
+
+	`samples` hashes run on each of `concurrency` threads at once, as the
+	password hasher's workers do under load.
+	"""
+	from app.auth.hashing import create_bcrypt_context
+
+	context = create_bcrypt_context(rounds)
+	# The first hash also loads and self-tests the bcrypt backend.
+	context.hash("calibration-password")
+
+	def timed_hash(_: int) -> float:
+		start = time.perf_counter()
+		context.hash("calibration-password")
+		return (time.perf_counter() - start) * 1000
+
+	with ThreadPoolExecutor(max_workers=concurrency) as executor:
+		durations = list(executor.map(timed_hash, range(samples * concurrency)))
+	return statistics.median(durations)
+
+
+def main(argv: list[str] | None = None) -> None:
+	from app.core.config import settings
+	from app.server import worker_count
+
+	# Every server worker runs its own pool of hashing threads.
+	concurrency = worker_count() * settings.PASSWORD_HASH_WORKERS
+
+	parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+	parser.add_argument(
+		"--budget-ms",
+		type=float,
+		default=settings.PASSWORD_HASH_BUDGET_MS,
+		help="Defaults to PASSWORD_HASH_BUDGET_MS.",
+	)
+	parser.add_argument(
+		"--concurrency",
+		type=int,
+		default=concurrency,
+		help=(
+			"Defaults to PASSWORD_HASH_WORKERS times the server workers "
+			f"(SERVER_WORKERS, or one per CPU), i.e. {concurrency}."
+		),
+	)
+	parser.add_argument("--samples", type=int, default=5)
+	parser.add_argument("--min-rounds", type=int, default=RECOMMENDED_MIN_ROUNDS)
+	parser.add_argument("--max-rounds", type=int, default=16)
+	parser.add_argument("--output", type=Path, help="Write the report as JSON.")
+	args = parser.parse_args(argv)
+
+	measured = {}
+	chosen = None
+	print(f"{'rounds':>6} {'median ms':>10}")
+	for rounds in range(max(args.min_rounds, MIN_ROUNDS), args.max_rounds + 1):
+		median_ms = measured[rounds] = measure(
+			rounds,
+			args.samples,
+			args.concurrency,
+		)
+		print(f"{rounds:>6} {median_ms:>10.1f}")
+		if median_ms > args.budget_ms:
+			break
+		chosen = rounds
+
+	print(
+		f"\nCurrent PASSWORD_HASH_ROUNDS={settings.PASSWORD_HASH_ROUNDS}, "
+		f"budget {args.budget_ms:.0f} ms at concurrency {args.concurrency}",
+	)
+	if args.output:
+		args.output.write_text(
+			json.dumps(
+				{
+					"budget_ms": args.budget_ms,
+					"concurrency": args.concurrency,
+					"median_ms": measured,
+					"recommended_rounds": chosen,
+					"current_rounds": settings.PASSWORD_HASH_ROUNDS,
+				},
+				indent=2,
+			),
+		)
+
+	if chosen is None:
+		sys.exit(
+			f"Even {args.min_rounds} rounds exceed {args.budget_ms:.0f} ms; "
+			"raise the budget or add hashing capacity.",
+		)
+	print(f"PASSWORD_HASH_ROUNDS={chosen}")
+
+
+if __name__ == "__main__":
+	main()
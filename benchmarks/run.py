@@ -0,0 +1,460 @@
+"""Load benchmark of every endpoint, driving `app.main:app` in-process.
+
+Usage:
+	python -m benchmarks.run --database-url postgresql+asyncpg://... \\
+		--sizes 1000,100000,1000000 --output results.json
+
+Every run registers fresh users in the given database, so point it at a
+scratch database rather than a shared one. Tables are created if missing.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+SEED_CHUNK_SIZE = 50_000
+PASSWORD = "benchmark-password"
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+	from app.core.config import settings
+
+	parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+	parser.add_argument(
+		"--database-url",
+		default=settings.DATABASE_URL,
+		help="The database to benchmark against (default: DATABASE_URL, also "
+		"read from .env).",
+	)
+	parser.add_argument(
+		"--sizes",
+		default="1000,10000",
+		help="Comma separated todos per user to seed, e.g. 1000,100000,1000000.",
+	)
+	parser.add_argument("--requests", type=int, default=500)
+	parser.add_argument("--concurrency", type=int, default=16)
+	parser.add_argument(
+		"--auth-requests",
+		type=int,
+		default=50,
+		help="Requests for register and token, which are bound by bcrypt.",
+	)
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--output", type=Path, default=Path("benchmark.json"))
+	return parser.parse_args(argv)
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+	"""Nearest-rank percentile of already sorted values."""
+	if not sorted_values:
+		return 0.0
+	rank = max(
+		0,
+		min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1),
+	)
+	return sorted_values[rank]
+
+
+async def measure(
+	client: httpx.AsyncClient,
+	scenario: str,
+	request: Request,
+	requests: int,
+	concurrency: int,
+	**labels: Any,
+) -> dict[str, Any]:
+	"""Send `requests` requests from `concurrency` concurrent callers.
+
+	Returns:
+		dict[str, Any]: The throughput, latency percentiles and status counts.
+	"""
+	durations: list[float] = []
+	statuses: Counter[int] = Counter()
+	counter = iter(range(requests))
+
+	async def worker() -> None:
+		for index in counter:
+			start = time.perf_counter()
+			response = await request(client, index)
+			durations.append(time.perf_counter() - start)
+			statuses[response.status_code] += 1
+
+	start = time.perf_counter()
+	await asyncio.gather(*(worker() for _ in range(concurrency)))
+	elapsed = time.perf_counter() - start
+
+	durations.sort()
+	result = {
+		"scenario": scenario,
+		**labels,
+		"requests": requests,
+		"concurrency": concurrency,
+		"errors": sum(count for status, count in statuses.items() if status >= 400),
+		"status_counts": {str(status): count for status, count in statuses.items()},
+		"throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+		"latency_ms": {
+			name: round(value * 1000, 3)
+			for name, value in (
+				("p50", percentile(durations, 50)),
+				("p95", percentile(durations, 95)),
+				("p99", percentile(durations, 99)),
+				("mean", sum(durations) / len(durations) if durations else 0.0),
+				("max", durations[-1] if durations else 0.0),
+			)
+		},
+	}
+	print(
+		f"{scenario:<24} {labels.get('todos', '-')!s:>8} todos "
+		f"{result['throughput_rps']:>9} req/s  "
+		f"p50 {result['latency_ms']['p50']:>8} ms  "
+		f"p99 {result['latency_ms']['p99']:>8} ms  "
+		f"errors {result['errors']}",
+		file=sys.stderr,
+	)
+	return result
+
+
+async def register(client: httpx.AsyncClient, email: str) -> dict[str, str]:
+	"""Register `email` and return the authorization headers of its token."""
+	response = await client.post(
+		"/auth/",
+		json={
+			"email": email,
+			"first_name": "Bench",
+			"last_name": "Mark",
+			"password": PASSWORD,
+		},
+	)
+	response.raise_for_status()
+	response = await client.post(
+		"/auth/token",
+		data={"username": email, "password": PASSWORD},
+	)
+	response.raise_for_status()
+	return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def generate_todos(
+	user_id: uuid.UUID,
+	count: int,
+	rng: random.Random,
+) -> Iterator[list[tuple[Any, ...]]]:
+	"""Yield chunks of realistic todo rows, newest first."""
+	from app.entities.todo import Priority
+
+	priorities = list(Priority)
+	now = datetime.now(UTC)
+	for chunk_start in range(0, count, SEED_CHUNK_SIZE):
+		rows = []
+		for index in range(chunk_start, min(count, chunk_start + SEED_CHUNK_SIZE)):
+			created_at = now - timedelta(seconds=index * 37)
+			completed = rng.random() < 0.3
+			rows.append(
+				(
+					uuid.uuid4(),
+					user_id,
+					f"Benchmark todo {index} " + "x" * rng.randint(0, 120),
+					created_at + timedelta(days=rng.randint(1, 30))
+					if rng.random() < 0.5
+					else None,
+					completed,
+					created_at,
+					created_at + timedelta(hours=rng.randint(1, 48))
+					if completed
+					else None,
+					rng.choice(priorities).name,
+				),
+			)
+		yield rows
+
+
+async def seed_todos(user_id: uuid.UUID, count: int, rng: random.Random) -> None:
+	"""Bulk load `count` todos for `user_id`.
+
+	Uses `COPY` on asyncpg and chunked multi-row inserts on other drivers.
+	"""
+	from sqlalchemy import insert
+
+	from app.database.core import engine
+	from app.entities.todo import Priority, Todo
+
+	columns = [
+		"id",
+		"user_id",
+		"description",
+		"due_date",
+		"is_completed",
+		"created_at",
+		"completed_at",
+		"priority",
+	]
+	async with engine.connect() as connection:
+		raw = await connection.get_raw_connection()
+		driver_connection = raw.driver_connection
+		for rows in generate_todos(user_id, count, rng):
+			if engine.dialect.driver == "asyncpg" and driver_connection is not None:
+				await driver_connection.copy_records_to_table(
+					"todos",
+					records=rows,
+					columns=columns,
+				)
+			else:
+				await connection.execute(
+					insert(Todo),
+					[
+						{
+							**dict(zip(columns, row, strict=True)),
+							"priority": Priority[row[-1]],
+						}
+						for row in rows
+					],
+				)
+		await connection.commit()
+
+
+async def user_id_of(client: httpx.AsyncClient, headers: dict[str, str]) -> uuid.UUID:
+	response = await client.get("/users/me", headers=headers)
+	response.raise_for_status()
+	return uuid.UUID(response.json()["id"])
+
+
+async def benchmark_auth(
+	client: httpx.AsyncClient,
+	args: argparse.Namespace,
+	run_id: str,
+) -> list[dict[str, Any]]:
+	email = f"bench-{run_id}@example.com"
+	headers = await register(client, email)
+
+	def register_request(c: httpx.AsyncClient, i: int) -> Awaitable[httpx.Response]:
+		return c.post(
+			"/auth/",
+			json={
+				"email": f"bench-{run_id}-{i}@example.com",
+				"first_name": "Bench",
+				"last_name": "Mark",
+				"password": PASSWORD,
+			},
+		)
+
+	def token_request(c: httpx.AsyncClient, _: int) -> Awaitable[httpx.Response]:
+		return c.post("/auth/token", data={"username": email, "password": PASSWORD})
+
+	def me_request(c: httpx.AsyncClient, _: int) -> Awaitable[httpx.Response]:
+		return c.get("/users/me", headers=headers)
+
+	return [
+		await measure(
+			client,
+			"register",
+			register_request,
+			args.auth_requests,
+			args.concurrency,
+		),
+		await measure(
+			client,
+			"token",
+			token_request,
+			args.auth_requests,
+			args.concurrency,
+		),
+		await measure(client, "users_me", me_request, args.requests, args.concurrency),
+	]
+
+
+async def benchmark_todos(
+	client: httpx.AsyncClient,
+	args: argparse.Namespace,
+	run_id: str,
+	size: int,
+	rng: random.Random,
+) -> list[dict[str, Any]]:
+	headers = await register(client, f"bench-{run_id}-todos-{size}@example.com")
+	user_id = await user_id_of(client, headers)
+
+	start = time.perf_counter()
+	await seed_todos(user_id, size, rng)
+	print(
+		f"seeded {size} todos in {time.perf_counter() - start:.1f}s",
+		file=sys.stderr,
+	)
+
+	page = (await client.get("/todos/", headers=headers)).json()
+	ids = [todo["id"] for todo in page["items"]]
+	cursor = page["next_cursor"]
+	created: list[str] = []
+
+	async def create(c: httpx.AsyncClient, i: int) -> httpx.Response:
+		response = await c.post(
+			"/todos/",
+			headers=headers,
+			json={"description": f"Created by benchmark {i}", "priority": 3},
+		)
+		if response.status_code == 201:
+			created.append(response.json()["id"])
+		return response
+
+	def first_page(c: httpx.AsyncClient, _: int) -> Awaitable[httpx.Response]:
+		return c.get("/todos/", headers=headers)
+
+	def next_page(c: httpx.AsyncClient, _: int) -> Awaitable[httpx.Response]:
+		return c.get("/todos/", headers=headers, params={"cursor": cursor})
+
+	def open_by_due_date(c: httpx.AsyncClient, _: int) -> Awaitable[httpx.Response]:
+		return c.get(
+			"/todos/",
+			headers=headers,
+			params={"is_completed": "false", "sort": "due_date"},
+		)
+
+	def get_one(c: httpx.AsyncClient, i: int) -> Awaitable[httpx.Response]:
+		return c.get(f"/todos/{ids[i % len(ids)]}", headers=headers)
+
+	def update(c: httpx.AsyncClient, i: int) -> Awaitable[httpx.Response]:
+		return c.put(
+			f"/todos/{ids[i % len(ids)]}",
+			headers=headers,
+			json={"description": f"Updated by benchmark {i}"},
+		)
+
+	def complete(c: httpx.AsyncClient, i: int) -> Awaitable[httpx.Response]:
+		return c.put(f"/todos/{ids[i % len(ids)]}/complete", headers=headers)
+
+	def delete(c: httpx.AsyncClient, i: int) -> Awaitable[httpx.Response]:
+		return c.delete(f"/todos/{created[i]}", headers=headers)
+
+	results = []
+	for scenario, request in (
+		("todos_create", create),
+		("todos_list", first_page),
+		("todos_list_next_page", next_page),
+		("todos_list_open_by_due", open_by_due_date),
+		("todos_get", get_one),
+		("todos_update", update),
+		("todos_complete", complete),
+	):
+		results.append(
+			await measure(
+				client,
+				scenario,
+				request,
+				args.requests,
+				args.concurrency,
+				todos=size,
+			),
+		)
+	results.append(
+		await measure(
+			client,
+			"todos_delete",
+			delete,
+			len(created),
+			args.concurrency,
+			todos=size,
+		),
+	)
+	return results
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+	"""Wait for the start-up warm-up, so that it is not measured."""
+	deadline = time.monotonic() + timeout
+	while (await client.get("/health/ready")).status_code != 200:
+		if time.monotonic() > deadline:
+			sys.exit("The app did not become ready.")
+		await asyncio.sleep(0.1)
+
+
+def git_commit() -> str | None:
+	try:
+		return subprocess.run(
+			["git", "rev-parse", "HEAD"],
+			capture_output=True,
+			check=True,
+			text=True,
+		).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+	from sqlalchemy import text
+
+	from app.database.core import Base, engine
+	from app.main import app
+
+	async with engine.begin() as connection:
+		if engine.dialect.name == "postgresql":
+			# The search index of `Todo` needs it, as `alembic upgrade` creates.
+			await connection.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gin"))
+		await connection.run_sync(Base.metadata.create_all)
+
+	rng = random.Random(args.seed)
+	run_id = uuid.uuid4().hex[:12]
+	sizes = [int(size) for size in args.sizes.split(",") if size]
+
+	# ASGITransport does not run the lifespan, so enter it explicitly.
+	async with (
+		app.router.lifespan_context(app),
+		httpx.AsyncClient(
+			transport=httpx.ASGITransport(app=app),
+			base_url="http://bench",
+		) as client,
+	):
+		await wait_until_ready(client)
+		results = await benchmark_auth(client, args, run_id)
+		for size in sizes:
+			results += await benchmark_todos(client, args, run_id, size, rng)
+
+	return {
+		"commit": git_commit(),
+		"timestamp": datetime.now(UTC).isoformat(),
+		"python": platform.python_version(),
+		"database": engine.dialect.name,
+		"config": {
+			"sizes": sizes,
+			"requests": args.requests,
+			"auth_requests": args.auth_requests,
+			"concurrency": args.concurrency,
+			"seed": args.seed,
+		},
+		"results": results,
+	}
+
+
+def main(argv: list[str] | None = None) -> None:
+	# Settings are read once, on first import, so configure them first.
+	os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+	os.environ.setdefault("SQLALCHEMY_ECHO", "false")
+	args = parse_args(argv)
+	if not args.database_url:
+		sys.exit("Set --database-url or DATABASE_URL.")
+
+	from app.core.config import settings
+
+	# Before the engines are created from it on importing the app.
+	settings.DATABASE_URL = args.database_url
+
+	report = asyncio.run(run(args))
+	args.output.write_text(json.dumps(report, indent=2))
+	print(f"wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+	main()
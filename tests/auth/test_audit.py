@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import audit
+from app.auth.service import AuthService
+from app.core.exceptions import AuthenticationError
+from app.core.jobs import JobRunner
+from app.entities import AuditEvent
+from app.users.models import PasswordChangeRequest
+from app.users.service import UserService
+from tests.auth.test_service import PASSWORD, login, refresh_token
+
+
+@pytest.fixture
+def job_runner(monkeypatch: pytest.MonkeyPatch) -> JobRunner:
+	"""A job runner of its own, drained by the test."""
+	runner = JobRunner(workers=1, queue_size=10, max_attempts=3, retry_backoff=0)
+	monkeypatch.setattr(audit, "job_runner", runner)
+	return runner
+
+
+async def events(db: AsyncSession) -> list[str]:
+	return list(
+		(
+			await db.scalars(select(AuditEvent.event).order_by(AuditEvent.occurred_at))
+		).all(),
+	)
+
+
+async def test_sign_in_and_out_are_audited(db: AsyncSession, job_runner: JobRunner):
+	token = await login(db)
+	await AuthService(db).revoke_refresh_token(refresh_token(token))
+	assert await job_runner.drain(5)
+
+	assert await events(db) == ["registered", "login", "logout"]
+
+
+async def test_refresh_token_reuse_is_audited(db: AsyncSession, job_runner: JobRunner):
+	auth = AuthService(db)
+	token = await login(db)
+	await auth.refresh_access_token(refresh_token(token))
+	with pytest.raises(AuthenticationError):
+		await auth.refresh_access_token(refresh_token(token))
+	assert await job_runner.drain(5)
+
+	assert (await events(db))[-1] == "refresh_token_reused"
+
+
+async def test_password_change_is_audited(db: AsyncSession, job_runner: JobRunner):
+	token = await login(db)
+	user = AuthService.verify_token(token.access_token)
+	await UserService(db, user).change_password(
+		PasswordChangeRequest(
+			current_password=PASSWORD,
+			new_password="a-new-password",
+			new_password_confirm="a-new-password",
+		),
+	)
+	assert await job_runner.drain(5)
+
+	assert (await events(db))[-1] == "password_changed"
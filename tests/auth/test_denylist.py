@@ -0,0 +1,42 @@
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.denylist import TokenDenylist
+from app.entities import RevokedToken
+
+
+def test_added_tokens_are_revoked():
+	denylist = TokenDenylist()
+
+	denylist.add("revoked", time.time() + 60)
+
+	assert denylist.is_revoked("revoked")
+	assert not denylist.is_revoked("other")
+	assert not denylist.is_revoked(None)
+
+
+async def test_sync_loads_live_revocations_and_forgets_expired_ones(
+	db: AsyncSession,
+):
+	now = datetime.now(UTC)
+	live, expired = uuid.uuid4(), uuid.uuid4()
+	db.add_all(
+		[
+			RevokedToken(jti=live, expires_at=now + timedelta(minutes=5)),
+			RevokedToken(jti=expired, expires_at=now - timedelta(minutes=5)),
+		],
+	)
+	await db.commit()
+	denylist = TokenDenylist()
+	denylist.add("lapsed", time.time() - 1)
+
+	await denylist.sync()
+
+	assert denylist.is_revoked(str(live))
+	assert not denylist.is_revoked(str(expired))
+	assert not denylist.is_revoked("lapsed")
+	assert denylist.stats().size == 1
+	assert denylist.stats().syncs == 1
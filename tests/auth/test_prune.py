@@ -0,0 +1,65 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.prune import prune_audit_events, prune_expired_tokens
+from app.entities import AuditEvent, RefreshToken, RevokedToken, User
+
+
+def make_user() -> User:
+	return User(
+		id=uuid.uuid4(),
+		email="ada@example.com",
+		first_name="Ada",
+		last_name="Lovelace",
+		password_hash="",
+	)
+
+
+async def test_prune_deletes_only_expired_tokens(db: AsyncSession):
+	now = datetime.now(UTC)
+	user = make_user()
+	db.add(user)
+	await db.flush()
+	for days in (-3, -2, -1, 1):
+		db.add(
+			RefreshToken(
+				jti=uuid.uuid4(),
+				user_id=user.id,
+				family_id=uuid.uuid4(),
+				expires_at=now + timedelta(days=days),
+				access_jti=uuid.uuid4(),
+				access_expires_at=now,
+			),
+		)
+		db.add(RevokedToken(jti=uuid.uuid4(), expires_at=now + timedelta(days=days)))
+	await db.commit()
+
+	# Batches smaller than the expired rows, to delete them over several.
+	assert await prune_expired_tokens(batch_size=2) == (3, 3)
+
+	assert await db.scalar(select(func.count()).select_from(RefreshToken)) == 1
+	assert await db.scalar(select(func.count()).select_from(RevokedToken)) == 1
+
+
+async def test_prune_deletes_only_audit_events_past_retention(db: AsyncSession):
+	now = datetime.now(UTC)
+	user = make_user()
+	db.add(user)
+	await db.flush()
+	for days in (400, 366, 364, 1):
+		db.add(
+			AuditEvent(
+				id=uuid.uuid4(),
+				user_id=user.id,
+				event="login",
+				occurred_at=now - timedelta(days=days),
+			),
+		)
+	await db.commit()
+
+	assert await prune_audit_events(batch_size=1, retention_days=365) == 2
+
+	assert await db.scalar(select(func.count()).select_from(AuditEvent)) == 2
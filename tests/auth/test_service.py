@@ -0,0 +1,92 @@
+import pytest
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.models import RegisterUserRequest, Token
+from app.auth.service import AuthService
+from app.core.exceptions import AuthenticationError
+
+EMAIL = "ada@example.com"
+PASSWORD = "correct-horse-battery"
+
+
+async def login(db: AsyncSession) -> Token:
+	auth = AuthService(db)
+	await auth.register_user(
+		RegisterUserRequest(
+			email=EMAIL,
+			first_name="Ada",
+			last_name="Lovelace",
+			password=PASSWORD,
+		),
+	)
+	return await auth.login_for_access_token(
+		OAuth2PasswordRequestForm(username=EMAIL, password=PASSWORD),
+	)
+
+
+def refresh_token(token: Token) -> str:
+	assert token.refresh_token is not None
+	return token.refresh_token
+
+
+async def test_refresh_rotates_the_tokens(db: AsyncSession):
+	auth = AuthService(db)
+	first = await login(db)
+
+	second = await auth.refresh_access_token(refresh_token(first))
+
+	assert second.refresh_token != first.refresh_token
+	assert second.access_token != first.access_token
+	assert AuthService.verify_token(second.access_token).user_id
+	third = await auth.refresh_access_token(refresh_token(second))
+	assert third.refresh_token not in (first.refresh_token, second.refresh_token)
+
+
+async def test_reused_refresh_token_revokes_its_session(db: AsyncSession):
+	auth = AuthService(db)
+	first = await login(db)
+	second = await auth.refresh_access_token(refresh_token(first))
+
+	with pytest.raises(AuthenticationError, match="revoked"):
+		await auth.refresh_access_token(refresh_token(first))
+
+	# The token rotated from the leaked one and its access token go too.
+	with pytest.raises(AuthenticationError, match="revoked"):
+		await auth.refresh_access_token(refresh_token(second))
+	with pytest.raises(AuthenticationError, match="revoked"):
+		AuthService.verify_token(second.access_token)
+
+
+async def test_reuse_leaves_other_sessions_alone(db: AsyncSession):
+	auth = AuthService(db)
+	leaked = await login(db)
+	other = await auth.login_for_access_token(
+		OAuth2PasswordRequestForm(username=EMAIL, password=PASSWORD),
+	)
+	await auth.refresh_access_token(refresh_token(leaked))
+
+	with pytest.raises(AuthenticationError):
+		await auth.refresh_access_token(refresh_token(leaked))
+
+	assert AuthService.verify_token(other.access_token).user_id
+	assert await auth.refresh_access_token(refresh_token(other))
+
+
+async def test_logout_revokes_the_session(db: AsyncSession):
+	auth = AuthService(db)
+	token = await login(db)
+
+	await auth.revoke_refresh_token(refresh_token(token))
+
+	with pytest.raises(AuthenticationError, match="revoked"):
+		AuthService.verify_token(token.access_token)
+	with pytest.raises(AuthenticationError, match="revoked"):
+		await auth.refresh_access_token(refresh_token(token))
+
+
+async def test_access_token_is_not_a_refresh_token(db: AsyncSession):
+	token = await login(db)
+
+	with pytest.raises(AuthenticationError):
+		await AuthService(db).refresh_access_token(token.access_token)
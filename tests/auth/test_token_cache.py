@@ -0,0 +1,108 @@
+import time
+import uuid
+
+import pytest
+from jwt import encode as jwt_encode
+
+from app.auth import service
+from app.auth.denylist import TokenDenylist
+from app.auth.models import TokenData
+from app.auth.service import ACCESS_TOKEN, AuthService
+from app.auth.token_cache import TokenCache
+from app.core.config import settings
+from app.core.exceptions import AuthenticationError
+
+
+def token_data() -> TokenData:
+	return TokenData(user_id=str(uuid.uuid4()), jti=str(uuid.uuid4()))
+
+
+def test_cached_tokens_are_served_until_they_expire():
+	cache = TokenCache(max_size=10)
+	data = token_data()
+	cache.put("live", data, time.time() + 60)
+	cache.put("expired", token_data(), time.time() - 1)
+
+	assert cache.get("live") == data
+	assert cache.get("expired") is None
+	assert cache.get("unknown") is None
+
+	stats = cache.stats()
+	# The expired entry is dropped on the miss.
+	assert (stats.size, stats.hits, stats.misses) == (1, 1, 2)
+
+
+def test_the_least_recently_used_token_is_evicted():
+	cache = TokenCache(max_size=2)
+	expires_at = time.time() + 60
+	cache.put("a", token_data(), expires_at)
+	cache.put("b", token_data(), expires_at)
+	cache.get("a")
+
+	cache.put("c", token_data(), expires_at)
+
+	assert cache.get("b") is None
+	assert cache.get("a") is not None
+	assert cache.get("c") is not None
+
+
+def test_a_cache_without_room_keeps_nothing():
+	cache = TokenCache(max_size=0)
+
+	cache.put("a", token_data(), time.time() + 60)
+
+	assert cache.stats().size == 0
+	assert cache.get("a") is None
+
+
+def test_tokens_are_kept_by_digest_only():
+	cache = TokenCache(max_size=10)
+
+	cache.put("secret-token", token_data(), time.time() + 60)
+
+	assert b"secret-token" not in b"".join(cache._entries)
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> TokenCache:
+	"""Fresh token cache and denylist behind `AuthService.verify_token`."""
+	cache = TokenCache(max_size=10)
+	monkeypatch.setattr(service, "token_cache", cache)
+	monkeypatch.setattr(service, "token_denylist", TokenDenylist())
+	return cache
+
+
+def access_token(jti: str) -> str:
+	return jwt_encode(
+		{
+			"sub": "ada@example.com",
+			"id": str(uuid.uuid4()),
+			"typ": ACCESS_TOKEN,
+			"jti": jti,
+			"exp": int(time.time()) + 60,
+		},
+		settings.AUTH_SECRET_KEY,
+		algorithm=settings.AUTH_ALGORITHM,
+	)
+
+
+def test_verify_token_checks_the_signature_once(cache: TokenCache):
+	token = access_token(str(uuid.uuid4()))
+
+	first = AuthService.verify_token(token)
+	second = AuthService.verify_token(token)
+
+	assert first == second
+	assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+
+def test_revoked_tokens_are_rejected_even_when_cached(cache: TokenCache):
+	jti = str(uuid.uuid4())
+	token = access_token(jti)
+	AuthService.verify_token(token)
+
+	service.token_denylist.add(jti, time.time() + 60)
+
+	with pytest.raises(AuthenticationError, match="revoked"):
+		AuthService.verify_token(token)
+	assert cache.stats().hits == 1
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import Cache, MemoryCacheBackend
+
+
+async def test_entries_expire_after_their_ttl(monkeypatch: pytest.MonkeyPatch):
+	now = 1000.0
+	# A clock of its own, leaving the event loop's alone.
+	monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now))
+	backend = MemoryCacheBackend(max_size=10)
+	await backend.set("key", "value", ttl=5)
+
+	assert await backend.get("key") == "value"
+	now += 5
+	assert await backend.get("key") is None
+
+	stats = backend.stats()
+	assert (stats.size, stats.hits, stats.misses) == (0, 1, 1)
+
+
+async def test_the_least_recently_used_entry_is_evicted():
+	backend = MemoryCacheBackend(max_size=2)
+	await backend.set("a", 1, ttl=60)
+	await backend.set("b", 2, ttl=60)
+	await backend.get("a")
+
+	await backend.set("c", 3, ttl=60)
+
+	assert await backend.get("b") is None
+	assert await backend.get("a") == 1
+	assert await backend.get("c") == 3
+	assert backend.stats().evictions == 1
+
+
+async def test_invalidating_a_namespace_hides_all_of_its_entries():
+	cache = Cache(MemoryCacheBackend(max_size=100), ttl=60)
+	ada = await cache.key("todos:ada", "page", 1)
+	grace = await cache.key("todos:grace", "page", 1)
+	await cache.set(ada, "ada's todos")
+	await cache.set(grace, "grace's todos")
+
+	await cache.invalidate("todos:ada")
+
+	assert await cache.get(await cache.key("todos:ada", "page", 1)) is None
+	assert await cache.get(await cache.key("todos:grace", "page", 1)) == (
+		"grace's todos"
+	)
+
+
+async def test_an_evicted_version_never_revives_stale_entries():
+	backend = MemoryCacheBackend(max_size=100)
+	cache = Cache(backend, ttl=60)
+	stale = await cache.key("todos:ada", "page", 1)
+	await cache.set(stale, "stale todos")
+
+	await backend.delete(cache._version_key("todos:ada"))
+
+	fresh = await cache.key("todos:ada", "page", 1)
+	assert fresh != stale
+	assert await cache.get(fresh) is None
+
+
+async def test_a_disabled_cache_stores_nothing():
+	cache = Cache(MemoryCacheBackend(max_size=100), ttl=60, enabled=False)
+	key = await cache.key("todos:ada", "page", 1)
+
+	await cache.set(key, "todos")
+
+	assert await cache.get(key) is None
+	assert cache.stats().size == 1  # The namespace version only.
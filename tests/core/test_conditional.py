@@ -0,0 +1,48 @@
+from fastapi import status
+
+from app.core.conditional import (
+	etag_matches,
+	etag_version,
+	make_etag,
+	not_modified,
+	parse_etags,
+)
+
+
+def test_etag_carries_its_version_and_binds_its_parts():
+	etag = make_etag(7, "user", "query")
+
+	assert etag.startswith('"7-') and etag.endswith('"')
+	assert etag_version(etag) == 7
+	assert make_etag(7, "user", "query") == etag
+	assert make_etag(7, "user", "other query") != etag
+	assert make_etag(8, "user", "query") != etag
+
+
+def test_etag_version_of_a_foreign_etag_is_none():
+	assert etag_version('"abc-123"') is None
+	assert etag_version('""') is None
+
+
+def test_parse_etags_splits_the_list_and_drops_weak_prefixes():
+	assert parse_etags(' "1-a", W/"2-b" ,, *') == ['"1-a"', '"2-b"', "*"]
+
+
+def test_etag_matches_any_listed_tag_or_a_wildcard():
+	etag = make_etag(3, "user")
+
+	assert etag_matches(f'"0-x", {etag}', etag)
+	assert etag_matches(f"W/{etag}", etag)
+	assert etag_matches("*", etag)
+	assert not etag_matches('"0-x"', etag)
+	assert not etag_matches(None, etag)
+	assert not etag_matches("", etag)
+
+
+def test_not_modified_repeats_the_etag_without_a_body():
+	etag = make_etag(1)
+	response = not_modified(etag)
+
+	assert response.status_code == status.HTTP_304_NOT_MODIFIED
+	assert response.headers["ETag"] == etag
+	assert response.body == b""
@@ -0,0 +1,177 @@
+import asyncio
+
+import pytest
+from starlette.types import Message, Receive, Scope, Send
+
+from app.core import jobs
+from app.core.jobs import JobMiddleware, JobRunner
+
+
+def runner(
+	workers: int = 1,
+	queue_size: int = 10,
+	max_attempts: int = 3,
+	retry_backoff: float = 0.5,
+) -> JobRunner:
+	return JobRunner(workers, queue_size, max_attempts, retry_backoff)
+
+
+@pytest.fixture
+def backoffs(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+	"""Record the retry backoffs instead of waiting for them."""
+	delays: list[float] = []
+	sleep = asyncio.sleep
+
+	async def record(delay: float) -> None:
+		delays.append(delay)
+		await sleep(0)
+
+	monkeypatch.setattr(jobs.asyncio, "sleep", record)
+	return delays
+
+
+async def test_failing_job_is_retried_with_exponential_backoff(
+	backoffs: list[float],
+):
+	job_runner = runner()
+	attempts: list[int] = []
+
+	async def flaky() -> None:
+		attempts.append(len(attempts) + 1)
+		if len(attempts) < 3:
+			raise RuntimeError("unavailable")
+
+	job_runner.enqueue(flaky)
+	assert await job_runner.drain(1)
+
+	assert attempts == [1, 2, 3]
+	assert backoffs == [0.5, 1.0]
+	stats = job_runner.stats()
+	assert (stats.completed, stats.retried, stats.failed) == (1, 2, 0)
+
+
+async def test_job_fails_after_max_attempts(backoffs: list[float]):
+	job_runner = runner(max_attempts=2)
+	attempts: list[int] = []
+
+	async def broken() -> None:
+		attempts.append(1)
+		raise RuntimeError("broken")
+
+	job_runner.enqueue(broken)
+	assert await job_runner.drain(1)
+
+	assert len(attempts) == 2
+	stats = job_runner.stats()
+	assert (stats.completed, stats.retried, stats.failed) == (0, 1, 1)
+
+
+async def test_jobs_are_rejected_when_the_queue_is_full():
+	job_runner = runner(workers=1, queue_size=1)
+	release = asyncio.Event()
+
+	async def blocked() -> None:
+		await release.wait()
+
+	job_runner.enqueue(blocked)
+	# The worker takes the first job, the second one waits in the queue.
+	await asyncio.sleep(0)
+	job_runner.enqueue(blocked)
+	job_runner.enqueue(blocked)
+
+	assert job_runner.stats().rejected == 1
+	assert job_runner.stats().queue_depth == 1
+	release.set()
+	assert await job_runner.drain(1)
+	assert job_runner.stats().completed == 2
+
+
+async def test_drain_runs_the_queued_jobs_and_then_rejects_new_ones():
+	job_runner = runner(workers=2)
+	done: list[int] = []
+
+	async def work(n: int) -> None:
+		await asyncio.sleep(0.01)
+		done.append(n)
+
+	for n in range(5):
+		job_runner.enqueue(work, n)
+	assert await job_runner.drain(1)
+
+	assert sorted(done) == [0, 1, 2, 3, 4]
+	assert job_runner.stats().workers == 0
+	job_runner.enqueue(work, 5)
+	assert job_runner.stats().rejected == 1
+
+
+async def test_drain_cancels_the_jobs_left_after_the_timeout():
+	job_runner = runner()
+	cancelled = asyncio.Event()
+
+	async def stuck() -> None:
+		try:
+			await asyncio.sleep(10)
+		except asyncio.CancelledError:
+			cancelled.set()
+			raise
+
+	job_runner.enqueue(stuck)
+	await asyncio.sleep(0)
+
+	assert not await job_runner.drain(0.05)
+	assert cancelled.is_set()
+
+
+async def call(app: JobMiddleware) -> list[Message]:
+	sent: list[Message] = []
+
+	async def receive() -> Message:
+		return {"type": "http.request", "body": b"", "more_body": False}
+
+	async def send(message: Message) -> None:
+		sent.append(message)
+
+	await app({"type": "http", "method": "POST", "path": "/"}, receive, send)
+	return sent
+
+
+async def test_jobs_of_a_request_run_after_its_response(
+	monkeypatch: pytest.MonkeyPatch,
+):
+	job_runner = runner()
+	monkeypatch.setattr(jobs, "job_runner", job_runner)
+	events: list[str] = []
+
+	async def job() -> None:
+		events.append("job")
+
+	async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+		job_runner.enqueue(job)
+		await asyncio.sleep(0.01)
+		events.append("response")
+		await send({"type": "http.response.start", "status": 204, "headers": []})
+		await send({"type": "http.response.body", "body": b""})
+
+	await call(JobMiddleware(endpoint))
+	assert await job_runner.drain(1)
+
+	assert events == ["response", "job"]
+
+
+async def test_jobs_of_a_failed_request_are_dropped(monkeypatch: pytest.MonkeyPatch):
+	job_runner = runner()
+	monkeypatch.setattr(jobs, "job_runner", job_runner)
+	events: list[str] = []
+
+	async def job() -> None:
+		events.append("job")
+
+	async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+		job_runner.enqueue(job)
+		raise RuntimeError("failed")
+
+	with pytest.raises(RuntimeError):
+		await call(JobMiddleware(endpoint))
+	assert await job_runner.drain(1)
+
+	assert events == []
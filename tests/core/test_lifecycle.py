@@ -0,0 +1,70 @@
+import asyncio
+import os
+import signal
+from collections.abc import Iterator
+from types import FrameType
+
+import pytest
+
+from app.core.lifecycle import Lifecycle
+
+
+@pytest.fixture
+def server_signals() -> Iterator[list[int]]:
+	"""Stand in for the server's SIGTERM handler, recording the signals."""
+	received: list[int] = []
+
+	def handle_exit(sig: int, frame: FrameType | None) -> None:
+		received.append(sig)
+
+	previous = signal.signal(signal.SIGTERM, handle_exit)
+	try:
+		yield received
+	finally:
+		signal.signal(signal.SIGTERM, previous)
+
+
+async def test_sigterm_turns_unready_before_the_server_stops(
+	server_signals: list[int],
+):
+	lifecycle = Lifecycle()
+	lifecycle.ready = True
+	lifecycle.delay_shutdown(0.2)
+
+	os.kill(os.getpid(), signal.SIGTERM)
+	await asyncio.sleep(0.05)
+	assert not lifecycle.accepting
+	assert server_signals == []
+
+	await asyncio.sleep(0.3)
+	assert server_signals == [signal.SIGTERM]
+
+
+async def test_second_sigterm_stops_the_server_at_once(server_signals: list[int]):
+	lifecycle = Lifecycle()
+	lifecycle.delay_shutdown(10)
+
+	os.kill(os.getpid(), signal.SIGTERM)
+	await asyncio.sleep(0.05)
+	os.kill(os.getpid(), signal.SIGTERM)
+	await asyncio.sleep(0.05)
+
+	assert server_signals == [signal.SIGTERM]
+
+
+async def test_drain_waits_for_in_flight_work():
+	lifecycle = Lifecycle()
+	finished = asyncio.Event()
+
+	async def work() -> None:
+		async with lifecycle.track():
+			await finished.wait()
+
+	task = asyncio.create_task(work())
+	await asyncio.sleep(0)
+	assert not await lifecycle.drain(0.05)
+	assert lifecycle.draining
+
+	finished.set()
+	assert await lifecycle.drain(1)
+	await task
@@ -0,0 +1,125 @@
+import json
+import logging
+import queue
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import logger
+from app.core.logger import (
+	BackgroundQueueHandler,
+	JSONFormatter,
+	RateLimitFilter,
+	RequestIdFilter,
+	request_id_var,
+)
+
+
+def record(
+	msg: str = "Bad token: %s",
+	*args: object,
+	name: str = "app",
+	level: int = logging.WARNING,
+) -> logging.LogRecord:
+	return logging.LogRecord(name, level, __file__, 1, msg, args, None, "handle")
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+	"""A clock of the rate limit filter, advanced by the test."""
+	clock = SimpleNamespace(now=0.0)
+	monkeypatch.setattr(
+		logger,
+		"time",
+		SimpleNamespace(monotonic=lambda: clock.now),
+	)
+	return clock
+
+
+def test_rate_limit_lets_through_limit_records_per_window(clock: SimpleNamespace):
+	rate_limit = RateLimitFilter(limit=2, window=60)
+
+	passed = [rate_limit.filter(record("Bad token: %s", n)) for n in range(5)]
+
+	assert passed == [True, True, False, False, False]
+
+
+def test_rate_limit_reports_the_suppressed_records(clock: SimpleNamespace):
+	rate_limit = RateLimitFilter(limit=1, window=60)
+	for n in range(4):
+		rate_limit.filter(record("Bad token: %s", n))
+
+	clock.now = 60
+	next_window = record("Bad token: %s", "next")
+
+	assert rate_limit.filter(next_window)
+	assert getattr(next_window, "suppressed", None) == 3
+
+
+def test_rate_limit_counts_loggers_and_messages_apart(clock: SimpleNamespace):
+	rate_limit = RateLimitFilter(limit=1, window=60)
+
+	assert rate_limit.filter(record("Bad token: %s", 1))
+	assert rate_limit.filter(record("Slow query: %s", 1))
+	assert rate_limit.filter(record("Bad token: %s", 1, name="other"))
+	assert not rate_limit.filter(record("Bad token: %s", 2))
+
+
+def test_rate_limit_forgets_the_oldest_messages(clock: SimpleNamespace):
+	rate_limit = RateLimitFilter(limit=1, window=60, max_keys=2)
+	for msg in ("a", "b", "c"):
+		rate_limit.filter(record(msg))
+
+	# "a" was forgotten, so it starts a new window.
+	assert rate_limit.filter(record("a"))
+	assert not rate_limit.filter(record("c"))
+
+
+def test_json_formatter_writes_one_json_object_per_record():
+	entry = record("Bad token: %s", "expired")
+	token = request_id_var.set("request-1")
+	try:
+		RequestIdFilter().filter(entry)
+	finally:
+		request_id_var.reset(token)
+	entry.suppressed = 2
+
+	line = JSONFormatter().format(entry)
+
+	assert "\n" not in line
+	assert json.loads(line) | {"time": None} == {
+		"time": None,
+		"level": "WARNING",
+		"logger": "app",
+		"message": "Bad token: expired",
+		"request_id": "request-1",
+		"location": "test_logger:handle:1",
+		"suppressed": 2,
+	}
+
+
+def test_json_formatter_includes_the_exception():
+	try:
+		raise ValueError("boom")
+	except ValueError:
+		entry = record("Failed")
+		entry.exc_info = sys.exc_info()
+
+	parsed = json.loads(JSONFormatter().format(entry))
+
+	assert "ValueError: boom" in parsed["exception"]
+	assert parsed["request_id"] is None
+	assert "suppressed" not in parsed
+
+
+def test_background_handler_drops_records_when_the_queue_is_full():
+	log_queue: queue.Queue[logging.LogRecord] = queue.Queue(1)
+	handler = BackgroundQueueHandler(log_queue)
+	first = record("a")
+
+	handler.emit(first)
+	handler.emit(record("b"))
+
+	assert log_queue.get_nowait() is first
+	assert handler.dropped == 1
@@ -0,0 +1,59 @@
+import json
+from pathlib import Path
+
+from app.core.metrics import Metrics, RequestMetrics, Sample
+
+
+def hits(value: float):
+	def collect() -> list[Sample]:
+		return [
+			Sample("cache_hits_total", "Hits of the cache.", value, "counter"),
+			Sample("cache_size", "Size of the cache.", 10),
+		]
+
+	return collect
+
+
+def exited_worker(directory: Path, hits_total: float) -> None:
+	"""Leave the snapshot of a worker that has exited in `directory`."""
+	worker = Metrics(None, flush_interval=0)
+	worker.add_collector(hits(hits_total))
+	worker.observe_request("GET", "/todos", 200, 0.01, RequestMetrics())
+	# No process has the ID 0.
+	(directory / "0-exited.json").write_text(json.dumps(worker.snapshot()))
+
+
+def test_collector_counters_are_exported_as_counters():
+	metrics = Metrics(None, flush_interval=0)
+	metrics.add_collector(hits(3))
+
+	rendered = metrics.render()
+
+	assert "# TYPE cache_hits_total counter\ncache_hits_total 3" in rendered
+	assert "# TYPE cache_size gauge\ncache_size 10" in rendered
+
+
+def test_counters_of_exited_workers_are_kept(tmp_path: Path):
+	metrics = Metrics(tmp_path, flush_interval=0)
+	metrics.add_collector(hits(3))
+	exited_worker(tmp_path, hits_total=5)
+
+	first = metrics.render()
+	second = metrics.render()
+
+	for rendered in (first, second):
+		assert "cache_hits_total 8" in rendered
+		assert "cache_size 10" in rendered
+		assert 'http_requests_total{method="GET",route="/todos",status="200"} 1' in (
+			rendered
+		)
+	assert not (tmp_path / "0-exited.json").exists()
+
+
+def test_without_a_directory_only_this_process_is_reported(tmp_path: Path):
+	exited_worker(tmp_path, hits_total=5)
+	metrics = Metrics(None, flush_interval=0)
+	metrics.add_collector(hits(3))
+
+	assert "cache_hits_total 3" in metrics.render()
+	assert (tmp_path / "0-exited.json").exists()
@@ -0,0 +1,115 @@
+import json
+import logging
+
+import pytest
+from starlette.types import Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.profiler import (
+	ProfiledQuery,
+	SQLProfile,
+	SQLProfilerMiddleware,
+	profile_query,
+)
+
+TOKEN = "profiler-token"
+
+
+@pytest.fixture(autouse=True)
+def profiler(monkeypatch: pytest.MonkeyPatch) -> None:
+	"""Profile requests carrying `TOKEN`, with a budget of two queries."""
+	monkeypatch.setattr(settings, "SQL_PROFILER_ENABLED", True)
+	monkeypatch.setattr(settings, "SQL_PROFILER_TOKEN", TOKEN)
+	monkeypatch.setattr(settings, "SQL_PROFILER_QUERY_BUDGET", 2)
+
+
+def endpoint(*queries: tuple[str, object]):
+	"""An app running `queries` before responding."""
+
+	async def app(scope: Scope, receive: Receive, send: Send) -> None:
+		for statement, parameters in queries:
+			profile_query(statement, parameters, 0.001)
+		await send({"type": "http.response.start", "status": 200, "headers": []})
+		await send({"type": "http.response.body", "body": b""})
+
+	return app
+
+
+async def call(app: SQLProfilerMiddleware, token: str | None) -> dict[str, str]:
+	"""Send a GET request to `app` and return its response headers."""
+	headers = [(b"x-profile-sql", token.encode())] if token else []
+	sent: list[Message] = []
+
+	async def receive() -> Message:
+		return {"type": "http.request", "body": b"", "more_body": False}
+
+	async def send(message: Message) -> None:
+		sent.append(message)
+
+	scope = {"type": "http", "method": "GET", "path": "/todos", "headers": headers}
+	await app(scope, receive, send)
+	return {name.decode(): value.decode() for name, value in sent[0].get("headers", [])}
+
+
+def test_profile_flags_repeated_statements_and_the_budget():
+	profile = SQLProfile(method="GET", path="/todos", budget=2)
+	for statement in ("SELECT todos", "SELECT user", "SELECT user"):
+		profile.queries.append(
+			ProfiledQuery(
+				statement=statement,
+				parameters="",
+				duration_ms=1.5,
+			),
+		)
+
+	assert profile.repeated() == {"SELECT user": 2}
+	assert profile.over_budget
+	assert profile.server_timing(10) == (
+		'db;dur=4.50;desc="3 queries", total;dur=10.00, '
+		'db-repeated;desc="1 repeated statements", '
+		'db-budget;desc="3 round trips, budget 2"'
+	)
+
+
+async def test_profiled_requests_get_a_server_timing_header(
+	caplog: pytest.LogCaptureFixture,
+):
+	app = SQLProfilerMiddleware(
+		endpoint(("SELECT todos WHERE id = $1", {"id": 1, "tags": ["a", "b"]})),
+	)
+
+	with caplog.at_level(logging.INFO):
+		headers = await call(app, TOKEN)
+
+	assert headers["server-timing"].startswith('db;dur=1.00;desc="1 queries"')
+	profile = json.loads(caplog.records[-1].getMessage().removeprefix("SQL profile: "))
+	assert caplog.records[-1].levelno == logging.INFO
+	assert profile["query_count"] == 1
+	# Parameters are logged by shape, never by value.
+	assert profile["queries"][0]["parameters"] == "{id: int, tags: 2 x str}"
+
+
+async def test_requests_over_budget_are_logged_as_warnings(
+	caplog: pytest.LogCaptureFixture,
+):
+	app = SQLProfilerMiddleware(endpoint(*[(f"SELECT {n}", ()) for n in range(3)]))
+
+	with caplog.at_level(logging.INFO):
+		headers = await call(app, TOKEN)
+
+	assert "db-budget" in headers["server-timing"]
+	assert caplog.records[-1].levelno == logging.WARNING
+
+
+@pytest.mark.parametrize("token", [None, "wrong-token"])
+async def test_requests_without_the_token_are_not_profiled(
+	token: str | None,
+	caplog: pytest.LogCaptureFixture,
+):
+	app = SQLProfilerMiddleware(endpoint(("SELECT todos", ())))
+
+	with caplog.at_level(logging.INFO):
+		headers = await call(app, token)
+
+	assert "server-timing" not in headers
+	assert not caplog.records
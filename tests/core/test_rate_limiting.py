@@ -0,0 +1,124 @@
+from pathlib import Path
+
+import pytest
+
+from app.core import rate_limiting
+from app.core.rate_limiting import Rate, SharedMemoryRateLimitBackend
+
+HOURLY = Rate(capacity=1, period=3600)
+
+
+class FakeClock:
+	"""Stands in for the `time` module of the rate limiter."""
+
+	def __init__(self):
+		self.now = 1_000_000.0
+
+	def time(self) -> float:
+		return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+	fake = FakeClock()
+	monkeypatch.setattr(rate_limiting, "time", fake)
+	return fake
+
+
+def backend(
+	path: Path,
+	max_keys: int,
+	monkeypatch: pytest.MonkeyPatch,
+	hashes: dict[str, int],
+) -> SharedMemoryRateLimitBackend:
+	"""Open a table whose keys hash to `hashes`, to force collisions."""
+	monkeypatch.setattr(SharedMemoryRateLimitBackend, "_hash", staticmethod(hashes.get))
+	return SharedMemoryRateLimitBackend(path, max_keys=max_keys)
+
+
+@pytest.mark.parametrize(
+	("value", "expected"),
+	[
+		("5/hour", Rate(5, 3600)),
+		("100 per minute", Rate(100, 60)),
+		(" 10 / Seconds ", Rate(10, 1)),
+		("1/DAY", Rate(1, 86400)),
+	],
+)
+def test_rate_parse(value: str, expected: Rate):
+	assert Rate.parse(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "5", "five/hour", "5/week", "-5/hour"])
+def test_rate_parse_rejects_invalid_rates(value: str):
+	with pytest.raises(ValueError, match="Invalid rate limit"):
+		Rate.parse(value)
+
+
+async def test_bucket_refills_over_time(tmp_path: Path, clock: FakeClock):
+	limiter = SharedMemoryRateLimitBackend(tmp_path / "table", max_keys=16)
+	rate = Rate(capacity=2, period=60)
+
+	assert (await limiter.hit("a", rate)).allowed
+	assert (await limiter.hit("a", rate)).allowed
+	denied = await limiter.hit("a", rate)
+	assert not denied.allowed
+	assert denied.retry_after == pytest.approx(30)
+
+	clock.now += 30
+	assert (await limiter.hit("a", rate)).allowed
+	assert not (await limiter.hit("a", rate)).allowed
+
+
+async def test_buckets_are_shared_through_the_file(tmp_path: Path, clock: FakeClock):
+	first = SharedMemoryRateLimitBackend(tmp_path / "table", max_keys=16)
+	second = SharedMemoryRateLimitBackend(tmp_path / "table", max_keys=16)
+
+	assert (await first.hit("a", HOURLY)).allowed
+	assert not (await second.hit("a", HOURLY)).allowed
+
+
+async def test_colliding_keys_probe_separate_slots(
+	tmp_path: Path,
+	clock: FakeClock,
+	monkeypatch: pytest.MonkeyPatch,
+):
+	# Both keys start probing at slot 1 of 4.
+	limiter = backend(tmp_path / "table", 4, monkeypatch, {"a": 1, "b": 5})
+
+	assert (await limiter.hit("a", HOURLY)).allowed
+	assert (await limiter.hit("b", HOURLY)).allowed
+	assert not (await limiter.hit("a", HOURLY)).allowed
+	assert not (await limiter.hit("b", HOURLY)).allowed
+
+
+async def test_full_probe_sequence_evicts_least_recently_updated(
+	tmp_path: Path,
+	clock: FakeClock,
+	monkeypatch: pytest.MonkeyPatch,
+):
+	# Every key starts probing at slot 1 of 2, so only two buckets fit.
+	limiter = backend(tmp_path / "table", 2, monkeypatch, {"a": 1, "b": 3, "c": 5})
+
+	assert (await limiter.hit("a", HOURLY)).allowed
+	clock.now += 1
+	assert (await limiter.hit("b", HOURLY)).allowed
+	clock.now += 1
+	# Evicts `a`, updated least recently.
+	assert (await limiter.hit("c", HOURLY)).allowed
+	clock.now += 1
+	assert not (await limiter.hit("b", HOURLY)).allowed
+	clock.now += 1
+	# `a` starts over with a full bucket, evicting `c`.
+	assert (await limiter.hit("a", HOURLY)).allowed
+	clock.now += 1
+	assert (await limiter.hit("c", HOURLY)).allowed
+	assert not (await limiter.hit("c", HOURLY)).allowed
+
+
+def test_table_is_resized_when_the_slot_count_changes(tmp_path: Path):
+	path = tmp_path / "table"
+	SharedMemoryRateLimitBackend(path, max_keys=4)
+	SharedMemoryRateLimitBackend(path, max_keys=8)
+
+	assert path.stat().st_size == 8 * SharedMemoryRateLimitBackend.SLOT.size
@@ -0,0 +1,67 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from app.database import replica
+from app.database.replica import PRIMARY_COOKIE, ReplicaRouter, StickyUsers
+
+
+@pytest.fixture
+def sticky_users(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> StickyUsers:
+	table = StickyUsers(tmp_path / "sticky", max_users=64)
+	monkeypatch.setattr(replica, "get_sticky_users", lambda: table)
+	return table
+
+
+def test_pins_are_shared_by_every_worker_of_the_host(tmp_path: Path):
+	writer = StickyUsers(tmp_path / "sticky", max_users=64)
+	reader = StickyUsers(tmp_path / "sticky", max_users=64)
+
+	writer.pin("ada", 100.0)
+
+	assert reader.pinned_until("ada") == 100.0
+	assert reader.pinned_until("grace") == 0.0
+
+
+def test_a_full_table_replaces_the_pin_that_ends_first(tmp_path: Path):
+	table = StickyUsers(tmp_path / "sticky", max_users=StickyUsers.PROBES)
+	users = [f"user-{n}" for n in range(StickyUsers.PROBES)]
+	for n, user_id in enumerate(users):
+		table.pin(user_id, 100.0 + n)
+
+	table.pin("ada", 200.0)
+
+	assert table.pinned_until("ada") == 200.0
+	assert table.pinned_until(users[0]) == 0.0
+	assert all(table.pinned_until(user_id) for user_id in users[1:])
+
+
+def test_a_write_pins_its_user_without_a_cookie(sticky_users: StickyUsers):
+	router = ReplicaRouter(sticky_seconds=5, retry_seconds=30)
+	assert router.should_use_replica("ada", None)
+
+	router.record_write("ada")
+
+	assert not router.should_use_replica("ada", None)
+	assert router.should_use_replica("grace", None)
+	assert sticky_users.pinned_until("ada") > time.time()
+
+
+def test_the_cookie_pins_clients_the_table_does_not(sticky_users: StickyUsers):
+	router = ReplicaRouter(sticky_seconds=5, retry_seconds=30)
+	until = router.primary_cookie().decode().split(";")[0]
+
+	assert until.startswith(f"{PRIMARY_COOKIE}=")
+	assert not router.should_use_replica(None, until.partition("=")[2])
+	assert not router.should_use_replica("ada", until.partition("=")[2])
+	assert router.should_use_replica(None, str(time.time() - 1))
+	assert router.should_use_replica(None, "garbage")
+
+
+def test_an_unavailable_replica_serves_nobody(sticky_users: StickyUsers):
+	router = ReplicaRouter(sticky_seconds=5, retry_seconds=30)
+
+	router.mark_unavailable(OSError("connection refused"))
+
+	assert not router.should_use_replica("ada", None)
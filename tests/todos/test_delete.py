@@ -0,0 +1,34 @@
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.service import AuthService
+from app.todos.models import TodoCreate
+from app.todos.service import TodoService
+from tests.auth.test_service import login
+
+
+async def todo_service(db: AsyncSession) -> TodoService:
+	token = await login(db)
+	return TodoService(db, AuthService.verify_token(token.access_token))
+
+
+async def test_delete_bumps_the_version(db: AsyncSession):
+	todos = await todo_service(db)
+	todo = await todos.create_todo(TodoCreate(description="Write tests"))
+	version = await todos.get_version()
+
+	assert await todos.delete_todos([todo.id]) == ([todo.id], [])
+
+	assert await todos.get_version() == version + 1
+
+
+async def test_delete_of_missing_todos_keeps_the_version(db: AsyncSession):
+	todos = await todo_service(db)
+	await todos.create_todo(TodoCreate(description="Write tests"))
+	version = await todos.get_version()
+	missing = uuid4()
+
+	assert await todos.delete_todos([missing]) == ([], [missing])
+
+	assert await todos.get_version() == version
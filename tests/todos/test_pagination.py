@@ -0,0 +1,93 @@
+import base64
+import json
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.core.exceptions import InvalidCursorError
+from app.entities import Priority
+from app.todos.pagination import decode_cursor, encode_cursor
+
+
+def raw_cursor(payload: str) -> str:
+	return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trips_a_timestamp_and_id():
+	created_at, todo_id = datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=UTC), uuid4()
+
+	cursor = encode_cursor(created_at, todo_id)
+
+	assert decode_cursor(cursor, datetime.fromisoformat, UUID) == (created_at, todo_id)
+
+
+def test_cursor_round_trips_a_rank_and_id():
+	todo_id = uuid4()
+
+	cursor = encode_cursor(0.0607927, todo_id)
+
+	assert decode_cursor(cursor, float, UUID) == (0.0607927, todo_id)
+
+
+def test_cursor_keeps_missing_sort_keys():
+	todo_id = uuid4()
+
+	cursor = encode_cursor(None, todo_id)
+
+	assert decode_cursor(cursor, datetime.fromisoformat, UUID) == (None, todo_id)
+
+
+def test_cursor_round_trips_an_enum():
+	created_at, todo_id = datetime.now(UTC), uuid4()
+
+	cursor = encode_cursor(Priority.High, created_at, todo_id)
+
+	assert decode_cursor(cursor, Priority, datetime.fromisoformat, UUID) == (
+		Priority.High,
+		created_at,
+		todo_id,
+	)
+
+
+def test_cursor_with_an_unknown_enum_value_is_rejected():
+	cursor = encode_cursor(42, datetime.now(UTC), uuid4())
+
+	with pytest.raises(InvalidCursorError):
+		decode_cursor(cursor, Priority, datetime.fromisoformat, UUID)
+
+
+def test_cursor_is_url_safe():
+	cursor = encode_cursor(datetime.now(UTC), uuid4())
+
+	assert set(cursor) <= set(
+		"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_",
+	)
+
+
+@pytest.mark.parametrize(
+	"cursor",
+	[
+		"",
+		"not a cursor!",
+		encode_cursor(datetime.now(UTC), uuid4())[:-6],
+		raw_cursor("not json"),
+		raw_cursor('{"id": 1}'),
+		raw_cursor("[]"),
+		raw_cursor(json.dumps([str(uuid4())])),
+		raw_cursor(json.dumps([datetime.now(UTC).isoformat(), str(uuid4()), 1])),
+		raw_cursor(json.dumps(["yesterday", str(uuid4())])),
+		raw_cursor(json.dumps([datetime.now(UTC).isoformat(), "not-a-uuid"])),
+		raw_cursor(json.dumps([datetime.now(UTC).isoformat(), 42])),
+	],
+)
+def test_tampered_cursors_are_rejected(cursor: str):
+	with pytest.raises(InvalidCursorError):
+		decode_cursor(cursor, datetime.fromisoformat, UUID)
+
+
+def test_cursor_of_another_sort_is_rejected():
+	cursor = encode_cursor(datetime.now(UTC), uuid4())
+
+	with pytest.raises(InvalidCursorError):
+		decode_cursor(cursor, float, UUID)
@@ -0,0 +1,85 @@
+from collections import Counter
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.entities import Priority, Todo
+from app.todos.stats import CountedTodo, _reconcile_query, stats_delta
+
+
+def changes(delta: Counter[str]) -> dict[str, int]:
+	"""The counters a write changes, without the ones it leaves as they are."""
+	return {counter: n for counter, n in delta.items() if n}
+
+
+def test_create_counts_new_open_todos():
+	delta = stats_delta(
+		added=[
+			Todo(priority=Priority.High, is_completed=False),
+			Todo(priority=Priority.High, is_completed=False),
+			Todo(priority=Priority.Low, is_completed=False),
+		],
+	)
+
+	assert changes(delta) == {"total": 3, "open_high": 2, "open_low": 1}
+
+
+def test_complete_moves_todos_from_open_to_completed():
+	completed = [
+		Todo(priority=Priority.Top, is_completed=True),
+		Todo(priority=Priority.Normal, is_completed=True),
+	]
+
+	delta = stats_delta(
+		added=completed,
+		removed=[CountedTodo(todo.priority, is_completed=False) for todo in completed],
+	)
+
+	assert changes(delta) == {"completed": 2, "open_top": -1, "open_normal": -1}
+
+
+def test_update_moves_an_open_todo_between_priorities():
+	delta = stats_delta(
+		added=[Todo(priority=Priority.Top, is_completed=False)],
+		removed=[CountedTodo(Priority.Low, is_completed=False)],
+	)
+
+	assert changes(delta) == {"open_top": 1, "open_low": -1}
+
+
+def test_update_of_a_completed_todo_changes_nothing():
+	delta = stats_delta(
+		added=[Todo(priority=Priority.Top, is_completed=True)],
+		removed=[CountedTodo(Priority.Low, is_completed=True)],
+	)
+
+	assert changes(delta) == {}
+
+
+def test_delete_uncounts_open_and_completed_todos():
+	delta = stats_delta(
+		removed=[
+			CountedTodo(Priority.Medium, is_completed=False),
+			CountedTodo(Priority.Medium, is_completed=True),
+		],
+	)
+
+	assert changes(delta) == {"total": -2, "completed": -1, "open_medium": -1}
+
+
+def test_reconcile_query_rebuilds_a_range_of_users():
+	first, last = uuid4(), uuid4()
+
+	query = _reconcile_query(first, last).compile(dialect=postgresql.dialect())
+
+	sql = str(query)
+	assert "users.id > %(id_1)s" in sql
+	assert "users.id <= %(id_2)s" in sql
+	assert "ON CONFLICT (user_id) DO UPDATE" in sql
+	assert (query.params["id_1"], query.params["id_2"]) == (first, last)
+
+
+def test_reconcile_query_starts_at_the_first_user():
+	query = _reconcile_query(None, uuid4()).compile(dialect=postgresql.dialect())
+
+	assert "users.id >" not in str(query)